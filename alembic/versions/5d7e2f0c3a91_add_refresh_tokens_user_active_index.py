@@ -0,0 +1,34 @@
+"""add refresh_tokens (user_id, is_revoked, expires_at) index
+
+Revision ID: 5d7e2f0c3a91
+Revises: 8c4e1b2a9d05
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e2f0c3a91'
+down_revision: Union[str, Sequence[str], None] = '8c4e1b2a9d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 사용자별 활성 세션 목록 / 전체 로그아웃 UPDATE 용
+    op.create_index(
+        'ix_refresh_tokens_user_active',
+        'refresh_tokens',
+        ['user_id', 'is_revoked', 'expires_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_tokens_user_active', table_name='refresh_tokens')
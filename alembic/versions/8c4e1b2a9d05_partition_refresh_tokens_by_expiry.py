@@ -0,0 +1,101 @@
+"""partition refresh_tokens by expiry month (optional)
+
+Revision ID: 8c4e1b2a9d05
+Revises: 3f2a9c1d7b64
+Create Date: 2026-10-19
+
+REFRESH_TOKEN_PARTITIONING=true 일 때만 적용(기본은 no-op), 앱 설정과 같은 값(env/.env)을 읽음
+MySQL 파티션 테이블 제약:
+- FK 사용 불가 → refresh_tokens.user_id FK 제거
+- 모든 unique 키에 파티션 컬럼 포함 → PK(id, expires_at), jti 는 일반 인덱스
+같은 설정으로 purge 작업이 월 파티션을 DROP/추가함 → 마이그레이션과 파티션 관리가 항상 함께 켜짐
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from app.core.config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e1b2a9d05'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def _enabled() -> bool:
+    return get_settings().refresh_token_partitioning
+
+
+def _is_partitioned() -> bool:
+    conn = op.get_bind()
+    row = conn.execute(
+        text(
+            "SELECT COUNT(*) FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'refresh_tokens' "
+            "AND PARTITION_NAME IS NOT NULL"
+        )
+    ).scalar()
+    return bool(row)
+
+
+def _user_fk_names() -> list[str]:
+    conn = op.get_bind()
+    rows = conn.execute(
+        text(
+            "SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'refresh_tokens' "
+            "AND REFERENCED_TABLE_NAME = 'users'"
+        )
+    ).all()
+    return [r[0] for r in rows]
+
+
+def _month_start(year: int, month: int) -> datetime:
+    return datetime(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _enabled() or _is_partitioned():
+        return
+
+    for name in _user_fk_names():
+        op.drop_constraint(name, 'refresh_tokens', type_='foreignkey')
+
+    op.drop_index('ix_refresh_tokens_jti', table_name='refresh_tokens')
+    op.create_index('ix_refresh_tokens_jti', 'refresh_tokens', ['jti'], unique=False)
+    op.execute("ALTER TABLE refresh_tokens DROP PRIMARY KEY, ADD PRIMARY KEY (id, expires_at)")
+
+    now = datetime.now(timezone.utc)
+    parts = []
+    for i in range(MONTHS_AHEAD + 1):
+        start = _month_start(now.year, now.month + i)
+        upper = _month_start(start.year, start.month + 1).strftime("%Y-%m-%d")
+        parts.append(f"PARTITION {start.strftime('p%Y%m')} VALUES LESS THAN ('{upper}')")
+    parts.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+
+    # 이번 달 이전에 만료된 행은 첫 파티션(pYYYYMM)에 함께 들어감
+    op.execute(
+        "ALTER TABLE refresh_tokens PARTITION BY RANGE COLUMNS(expires_at) ("
+        + ", ".join(parts)
+        + ")"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_partitioned():
+        return
+
+    op.execute("ALTER TABLE refresh_tokens REMOVE PARTITIONING")
+    op.execute("ALTER TABLE refresh_tokens DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+    op.drop_index('ix_refresh_tokens_jti', table_name='refresh_tokens')
+    op.create_index('ix_refresh_tokens_jti', 'refresh_tokens', ['jti'], unique=True)
+    op.create_foreign_key(None, 'refresh_tokens', 'users', ['user_id'], ['id'])
@@ -0,0 +1,34 @@
+"""add orders (user_id, created_at, id) index
+
+Revision ID: a4f9e0b7c612
+Revises: e2a6c8f41b03
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f9e0b7c612'
+down_revision: Union[str, Sequence[str], None] = 'e2a6c8f41b03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 내 주문 목록: WHERE user_id = ? ORDER BY created_at DESC, id DESC (keyset)
+    op.create_index(
+        'ix_orders_user_created',
+        'orders',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_user_created', table_name='orders')
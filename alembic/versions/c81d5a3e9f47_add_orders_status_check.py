@@ -0,0 +1,66 @@
+"""add orders.status CHECK constraint
+
+CHECK 추가 전에 기존 값 정리(예전 상태 변경 API 는 아무 문자열이나 저장했음)
+- UPPER(TRIM(status)) 로 대소문자/공백 통일
+- 알려진 예전 표기: CANCELED/CANCEL → CANCELLED, SHIPPING/DELIVERING → SHIPPED
+- 그 밖의 값: CANCELLED(종료 상태, 재고 복구/전이 없음)로 격리, 주문 id 와 원래 값은 alembic 로그에 남김
+downgrade 는 CHECK 만 제거(정리한 값은 되돌리지 않음)
+
+Revision ID: c81d5a3e9f47
+Revises: a4f9e0b7c612
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d5a3e9f47'
+down_revision: Union[str, Sequence[str], None] = 'a4f9e0b7c612'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ALLOWED = ('CREATED', 'PAID', 'SHIPPED', 'DELIVERED', 'CANCELLED')
+LEGACY = {
+    'CANCELED': 'CANCELLED',
+    'CANCEL': 'CANCELLED',
+    'SHIPPING': 'SHIPPED',
+    'DELIVERING': 'SHIPPED',
+}
+QUARANTINE = 'CANCELLED'
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 값 정리 후 허용 상태만 저장되도록(MySQL 8.0.16+ 에서 CHECK 적용)
+    bind = op.get_bind()
+    allowed = ', '.join(f"'{s}'" for s in ALLOWED)
+    # 기본 collation 은 대소문자/뒤 공백을 무시하고 비교 → BINARY 로 실제로 다른 행만
+    op.execute("UPDATE orders SET status = UPPER(TRIM(status)) WHERE BINARY status <> BINARY UPPER(TRIM(status))")
+    for legacy, status in LEGACY.items():
+        op.execute(f"UPDATE orders SET status = '{status}' WHERE status = '{legacy}'")
+
+    unknown = bind.execute(sa.text(f"SELECT id, status FROM orders WHERE status NOT IN ({allowed})")).all()
+    if unknown:
+        logger.warning(
+            "orders.status: 알 수 없는 값 %d건 → %s (id, 원래 값): %s",
+            len(unknown), QUARANTINE, [tuple(row) for row in unknown],
+        )
+        op.execute(f"UPDATE orders SET status = '{QUARANTINE}' WHERE status NOT IN ({allowed})")
+    op.create_check_constraint(
+        'ck_orders_status',
+        'orders',
+        f"status IN ({allowed})",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_orders_status', 'orders', type_='check')
@@ -0,0 +1,60 @@
+"""add archived_orders / order_archives tables
+
+Revision ID: d3a7b1e5c824
+Revises: f5b2c7d8e130
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7b1e5c824'
+down_revision: Union[str, Sequence[str], None] = 'f5b2c7d8e130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 아카이브된 주문 헤더(내 주문 목록/상세 fallback)
+    op.create_table(
+        'archived_orders',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=30), nullable=False),
+        sa.Column('total_price', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=7), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_archived_orders_user_created', 'archived_orders', ['user_id', 'created_at', 'id'], unique=False
+    )
+
+    # 사용자-월 단위 주문+아이템(zlib 압축 JSON)
+    op.create_table(
+        'order_archives',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=7), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.LargeBinary().with_variant(mysql.MEDIUMBLOB(), 'mysql'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'period', name='uq_order_archives_user_period'),
+    )
+    op.create_index(op.f('ix_order_archives_id'), 'order_archives', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_order_archives_id'), table_name='order_archives')
+    op.drop_table('order_archives')
+    op.drop_index('ix_archived_orders_user_created', table_name='archived_orders')
+    op.drop_table('archived_orders')
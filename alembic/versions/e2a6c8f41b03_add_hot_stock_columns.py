@@ -0,0 +1,34 @@
+"""add books.hot_stock / orders.stock_reservation_id
+
+Revision ID: e2a6c8f41b03
+Revises: b7e3d91c4f28
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c8f41b03'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d91c4f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # hot stock 모드 도서(재고는 Redis 카운터)
+    op.add_column('books', sa.Column('hot_stock', sa.Boolean(), nullable=False, server_default=sa.false()))
+    # hot stock 예약 토큰(reconciler 가 커밋된 주문인지 확인)
+    op.add_column('orders', sa.Column('stock_reservation_id', sa.String(length=32), nullable=True))
+    op.create_unique_constraint('uq_orders_stock_reservation_id', 'orders', ['stock_reservation_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_orders_stock_reservation_id', 'orders', type_='unique')
+    op.drop_column('orders', 'stock_reservation_id')
+    op.drop_column('books', 'hot_stock')
@@ -0,0 +1,41 @@
+"""add outbox_events table
+
+Revision ID: f5b2c7d8e130
+Revises: c81d5a3e9f47
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b2c7d8e130'
+down_revision: Union[str, Sequence[str], None] = 'c81d5a3e9f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 주문/도서 변경 이벤트(같은 트랜잭션에서 insert, relay 가 Redis Streams 로 발행)
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('aggregate_type', sa.String(length=30), nullable=False),
+        sa.Column('aggregate_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_outbox_events_unpublished', 'outbox_events', ['published_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_unpublished', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -1,6 +1,7 @@
 """
 의존성
 get_current_user access token 검증 → User 반환
+get_current_user_async async 핸들러용(같은 검증, AsyncSession/async Redis)
 require_roles RBAC 권한 체크
 """
 
@@ -13,9 +14,10 @@ from fastapi.params import Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import DbSession, get_db, get_db_async, run_db
 from app.models.user import User
 from app.core.security import decode_token
+from app.core.session_generation import is_current_generation, is_current_generation_async
 from app.core.errors import raise_unauthorized, raise_forbidden
 
 # Swagger 자물쇠: Bearer 토큰 입력칸 제공
@@ -34,11 +36,10 @@ def _extract_access_token(  # 헤더/쿠키에서 access token 추출
     return request.cookies.get("accessToken") or request.cookies.get("access_token")
 
 
-def get_current_user(  # access token 검증 후 user 반환
+def _decode_access_payload(  # 토큰 추출 + access 토큰 검증 → payload
     request: Request,
-    db: Session = Depends(get_db),
-    creds: Optional[HTTPAuthorizationCredentials] = Security(bearer_scheme),
-) -> User:
+    creds: Optional[HTTPAuthorizationCredentials],
+) -> dict:
     token = _extract_access_token(request, creds)
     if not token:
         raise_unauthorized("인증 토큰이 필요합니다.", "UNAUTHORIZED")
@@ -49,11 +50,13 @@ def get_current_user(  # access token 검증 후 user 반환
     if payload.get("type") != "access":
         raise_unauthorized("유효하지 않은 토큰입니다.", "UNAUTHORIZED")
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise_unauthorized("유효하지 않은 토큰입니다.", "UNAUTHORIZED")
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    return payload
+
+
+def _check_user(user: Optional[User]) -> User:
     if not user:
         raise_unauthorized("유효하지 않은 토큰입니다.", "UNAUTHORIZED")
 
@@ -63,6 +66,36 @@ def get_current_user(  # access token 검증 후 user 반환
     return user
 
 
+def get_current_user(  # access token 검증 후 user 반환
+    request: Request,
+    db: Session = Depends(get_db),
+    creds: Optional[HTTPAuthorizationCredentials] = Security(bearer_scheme),
+) -> User:
+    payload = _decode_access_payload(request, creds)
+    user_id = payload["sub"]
+
+    if not is_current_generation(payload, user_id):  # 전체 로그아웃 이전에 발급된 토큰
+        raise_unauthorized("유효하지 않은 토큰입니다.", "UNAUTHORIZED")
+
+    user = db.query(User).filter(User.id == int(user_id)).first()
+    return _check_user(user)
+
+
+async def get_current_user_async(  # async 핸들러용(threadpool 안 씀)
+    request: Request,
+    db: DbSession = Depends(get_db_async),
+    creds: Optional[HTTPAuthorizationCredentials] = Security(bearer_scheme),
+) -> User:
+    payload = _decode_access_payload(request, creds)
+    user_id = payload["sub"]
+
+    if not await is_current_generation_async(payload, user_id):
+        raise_unauthorized("유효하지 않은 토큰입니다.", "UNAUTHORIZED")
+
+    user = await run_db(db, lambda s: s.query(User).filter(User.id == int(user_id)).first())
+    return _check_user(user)
+
+
 def require_roles(*roles: str) -> Callable[[User], User]:  # 특정 role만 허용하는 의존성 생성기
     def _dep(  # 인증 + 권한 체크
         current_user: User = Depends(get_current_user),
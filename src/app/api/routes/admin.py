@@ -17,7 +17,11 @@ from app.core.query_utils import (
     apply_sort,                                 # 정렬 파라미터 처리
     apply_exact_filter                          # 정확 일치 필터(role)
 )
+from app.core import hot_stock, jobs, metrics   # hot stock 재고 / 작업 큐 / 프로세스 내부 지표
+from app.core.config import get_settings
 from app.core.errors import raise_not_found     # 404 공통 예외
+from app.core.token_purge import run_refresh_token_purge
+from app.db import slow_query                   # 슬로우 쿼리 집계
 from app.db.session import get_db               # DB 세션 주입
 from app.models.user import User
 from app.models.book import Book
@@ -126,4 +130,121 @@ def 관리자_통계(
             "books": books,
             "orders": orders,
         }
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    "/metrics",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) 내부 지표 조회",
+)
+def 관리자_지표(
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    return ApiSuccess(message="지표 조회 성공", payload=metrics.snapshot())
+
+
+@router.post(
+    "/maintenance/refresh-tokens/purge",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) 만료 refresh token 정리",
+)
+def 관리자_refresh_token_정리(
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    purged = run_refresh_token_purge()            # 스케줄러와 같은 배치 삭제 로직
+    return ApiSuccess(message="refresh token 정리 성공", payload={"purged": purged})
+
+
+@router.get(
+    "/slow-queries",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) 슬로우 쿼리 상위 목록",
+)
+def 관리자_슬로우_쿼리(
+    limit: int = Query(20, ge=1, le=100),           # 상위 N개
+    sort: str = Query("total", pattern="^(total|count|max|p95|rows)$"),  # 정렬 기준
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    settings = get_settings()
+    return ApiSuccess(
+        message="슬로우 쿼리 조회 성공",
+        payload={
+            "thresholdMs": settings.slow_query_threshold_ms,
+            "sampleRate": settings.slow_query_sample_rate,
+            "content": slow_query.top(limit=limit, sort=sort),
+        },
+    )
+
+
+@router.delete(
+    "/slow-queries",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) 슬로우 쿼리 집계 초기화",
+)
+def 관리자_슬로우_쿼리_초기화(
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    slow_query.reset()
+    return ApiSuccess(message="슬로우 쿼리 집계 초기화 성공", payload={})
+
+
+@router.get(
+    "/jobs",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) 백그라운드 작업 큐 현황",
+)
+def 관리자_작업_큐_현황(
+    queues: str = Query("default"),                 # 쉼표로 구분한 큐 이름
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    names = [q.strip() for q in queues.split(",") if q.strip()]
+    return ApiSuccess(message="작업 큐 조회 성공", payload=jobs.queue_stats(names))
+
+
+@router.get(
+    "/jobs/{jobId}",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) 백그라운드 작업 상태/결과 조회",
+)
+def 관리자_작업_상태(
+    jobId: str,
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    status = jobs.get_status(jobId)
+    if status is None:
+        raise_not_found("작업을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+    return ApiSuccess(message="작업 상태 조회 성공", payload=status)
+
+
+@router.post(
+    "/books/{bookId}/hot-stock",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) hot stock 모드 켜기(재고를 Redis 카운터로)",
+)
+def 관리자_hot_stock_켜기(
+    bookId: int,
+    shards: int | None = Query(None, ge=1, le=64),  # Redis 키 분할 수(기본: 설정값)
+    db: Session = Depends(get_db),
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    stock = hot_stock.enable(db, bookId, shards or get_settings().hot_stock_default_shards)
+    if stock < 0:
+        raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+    return ApiSuccess(message="hot stock 모드 설정 성공", payload={"bookId": bookId, "hotStock": True, "stock": stock})
+
+
+@router.delete(
+    "/books/{bookId}/hot-stock",
+    response_model=ApiSuccess[dict],
+    summary="(ADMIN) hot stock 모드 끄기(Redis 재고를 DB로)",
+)
+def 관리자_hot_stock_끄기(
+    bookId: int,
+    db: Session = Depends(get_db),
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),  # 관리자 전용
+):
+    stock = hot_stock.disable(db, bookId)
+    if stock < 0:
+        raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+    return ApiSuccess(message="hot stock 모드 해제 성공", payload={"bookId": bookId, "hotStock": False, "stock": stock})
@@ -4,26 +4,31 @@ Auth API
 로그인: access / refresh 발급
 재발급: refresh로 access / refresh 재발급
 로그아웃: refresh 폐기
+세션: 내 로그인 세션 목록 / 전체 기기 로그아웃
 """
 
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 import uuid
-import os
 import secrets
-import requests
 
 from fastapi.responses import RedirectResponse
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from fastapi import Response
-from app.core.redis_client import get_redis
+from fastapi.concurrency import run_in_threadpool
+from slowapi.util import get_remote_address
+from app.core.oauth_client import OAuthError, OAuthProfile, get_provider  # 소셜 로그인 provider
+from app.core.redis_client import get_async_redis, get_redis
 from sqlalchemy.orm import Session
 
+from app.api.deps import get_current_user         # 로그인 사용자 주입
 from app.db.session import get_db                 # DB 세션
 from app.models.user import User
-from app.models.refresh_token import RefreshToken # refresh token 저장 테이블
-from app.schemas.auth import LoginRequest, TokenResponse
+from app.core.token_store import get_refresh_token_store  # refresh token 저장소(db/redis)
+from app.core.revocation_filter import get_revocation_filter  # 폐기 jti Bloom filter
+from app.core.session_generation import bump_generation, get_generation  # 사용자 토큰 세대
+from app.schemas.auth import LoginRequest, SessionResponse, TokenResponse
 from app.schemas.response import ApiSuccess
 from app.schemas.openapi_examples import COMMON_ERROR_RESPONSES
 from app.core.security import (
@@ -36,18 +41,16 @@ from app.core.errors import (
     raise_not_found,
     raise_unauthorized,
     raise_bad_request,
+    raise_too_many_requests,
+)
+from app.core.login_throttle import (              # 계정/IP 로그인 시도 제한
+    check_login_allowed,
+    record_login_failure,
+    reset_login_failures,
 )
 
 router = APIRouter(prefix="/auth", tags=["Auth"], responses=COMMON_ERROR_RESPONSES)
 
-NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID", "")
-NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET", "")
-NAVER_REDIRECT_URI = os.getenv("NAVER_REDIRECT_URI", "")  # 예: http://113.198.66.68:10099/api/auth/naver/callback
-
-NAVER_AUTH_URL = "https://nid.naver.com/oauth2.0/authorize"
-NAVER_TOKEN_URL = "https://nid.naver.com/oauth2.0/token"
-NAVER_PROFILE_URL = "https://openapi.naver.com/v1/nid/me"
-
 
 def _make_dummy_email(provider: str, provider_id: str) -> str:
     # 이메일 제공 안 되는 케이스 대비 (DB에서 email UNIQUE/NOT NULL이면 특히 필요)
@@ -55,7 +58,8 @@ def _make_dummy_email(provider: str, provider_id: str) -> str:
 
 @router.get("/naver", summary="네이버 로그인 시작")
 def naver_login(request: Request):
-    if not NAVER_CLIENT_ID or not NAVER_REDIRECT_URI:
+    provider = get_provider("NAVER")
+    if not provider.is_configured():
         raise_bad_request("NAVER env 가 설정되지 않았습니다.", "BAD_REQUEST")
 
     state = secrets.token_urlsafe(16)
@@ -64,93 +68,39 @@ def naver_login(request: Request):
     r = get_redis()
     r.setex(f"oauth:naver:state:{state}", 300, "1")
 
-    url = (
-        f"{NAVER_AUTH_URL}"
-        f"?response_type=code"
-        f"&client_id={NAVER_CLIENT_ID}"
-        f"&redirect_uri={NAVER_REDIRECT_URI}"
-        f"&state={state}"
-    )
-    return RedirectResponse(url)
+    return RedirectResponse(provider.authorize_url(state))
 
-@router.get("/naver/callback", response_model=ApiSuccess[TokenResponse], summary="네이버 로그인 콜백")
-def naver_callback(
-    request: Request,
-    response: Response,
-    code: str,
-    state: str,
-    db: Session = Depends(get_db),
-):
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET or not NAVER_REDIRECT_URI:
-        raise_bad_request("NAVER env 가 설정되지 않았습니다.", "BAD_REQUEST")
 
-    # state 검증
-    r = get_redis()
-    if r.get(f"oauth:naver:state:{state}") != "1":
-        raise_unauthorized("state 가 유효하지 않습니다.", "UNAUTHORIZED")
-    r.delete(f"oauth:naver:state:{state}")
-
-    #  code  네이버 access_token 교환
-    token_res = requests.get(
-        NAVER_TOKEN_URL,
-        params={
-            "grant_type": "authorization_code",
-            "client_id": NAVER_CLIENT_ID,
-            "client_secret": NAVER_CLIENT_SECRET,
-            "code": code,
-            "state": state,
-        },
-        timeout=5,
-    )
-    if token_res.status_code != 200:
-        raise_unauthorized("네이버 토큰 발급 실패", "UNAUTHORIZED")
-
-    token_json = token_res.json()
-    naver_access = token_json.get("access_token")
-    if not naver_access:
-        raise_unauthorized("네이버 토큰 발급 실패", "UNAUTHORIZED")
-
-    # 프로필 조회
-    prof_res = requests.get(
-        NAVER_PROFILE_URL,
-        headers={"Authorization": f"Bearer {naver_access}"},
-        timeout=5,
-    )
-    if prof_res.status_code != 200:
-        raise_unauthorized("네이버 프로필 조회 실패", "UNAUTHORIZED")
-
-    prof = prof_res.json() or {}
-    info = prof.get("response") or {}
-    provider_id = info.get("id")  # 네이버 고유 ID (핵심)
-    email = info.get("email")     # 없을 수 있음
-    name = info.get("name") or info.get("nickname") or "NAVER_USER"
-
-    if not provider_id:
-        raise_unauthorized("네이버 프로필 id가 없습니다.", "UNAUTHORIZED")
-
-    # 유저 찾기/생성
+def _social_login(
+    db: Session,
+    profile: OAuthProfile,
+    response: Response,
+    background: BackgroundTasks,
+) -> TokenResponse:
+    # 유저 찾기/생성 + 우리 서비스 토큰 발급(DB 작업이라 threadpool 에서 실행)
     # User 모델에 provider/provider_id 컬럼이 있으면 그걸로 찾기
     # 없으면 email로만 처리(이메일 없으면 더미 생성)
+    email = profile.email
     user = None
 
     if hasattr(User, "provider") and hasattr(User, "provider_id"):
         user = (
             db.query(User)
-            .filter(User.provider == "NAVER", User.provider_id == provider_id)
+            .filter(User.provider == profile.provider, User.provider_id == profile.provider_id)
             .first()
         )
         if not user:
             if not email:
-                email = _make_dummy_email("NAVER", provider_id)
+                email = _make_dummy_email(profile.provider, profile.provider_id)
 
             user = User(
                 email=email,
                 password_hash="SOCIAL_LOGIN",  # 소셜은 패스워드 사용 안 함(모델 NOT NULL 방어용)
-                name=name,
+                name=profile.name,
                 role="ROLE_USER",
                 is_active=True,
-                provider="NAVER",
-                provider_id=provider_id,
+                provider=profile.provider,
+                provider_id=profile.provider_id,
             )
             db.add(user)
             db.commit()
@@ -158,14 +108,14 @@ def naver_callback(
     else:
         # provider 컬럼이 없으면 email 기반으로만 처리
         if not email:
-            email = _make_dummy_email("NAVER", provider_id)
+            email = _make_dummy_email(profile.provider, profile.provider_id)
 
         user = db.query(User).filter(User.email == email).first()
         if not user:
             user = User(
                 email=email,
                 password_hash="SOCIAL_LOGIN",
-                name=name,
+                name=profile.name,
                 role="ROLE_USER",
                 is_active=True,
             )
@@ -173,11 +123,12 @@ def naver_callback(
             db.commit()
             db.refresh(user)
 
-    # 5) 우리 서비스 JWT 발급 + refresh 저장(기존 로그인과 동일 정책)
-    access_token = create_access_token(subject=str(user.id), role=user.role)
+    # 우리 서비스 JWT 발급 + refresh 저장(기존 로그인과 동일 정책)
+    gen = get_generation(user.id)
+    access_token = create_access_token(subject=str(user.id), role=user.role, gen=gen)
 
     jti = uuid.uuid4().hex
-    refresh_token = create_refresh_token(subject=str(user.id), jti=jti)
+    refresh_token = create_refresh_token(subject=str(user.id), jti=jti, gen=gen, role=user.role)
 
     response.set_cookie(
         key="refreshToken",
@@ -189,47 +140,97 @@ def naver_callback(
     )
 
     expires_at = datetime.now(timezone.utc) + timedelta(days=14)
-    db.add(
-        RefreshToken(
-            user_id=user.id,
-            jti=jti,
-            expires_at=expires_at,
-            is_revoked=False,
-        )
-    )
+    get_refresh_token_store().issue(db, user.id, jti, expires_at, background)
     db.commit()
 
-    return ApiSuccess(
-        message="네이버 로그인 성공",
-        payload=TokenResponse(accessToken=access_token, refreshToken=refresh_token),
-    )
+    return TokenResponse(accessToken=access_token, refreshToken=refresh_token)
+
+
+@router.get("/naver/callback", response_model=ApiSuccess[TokenResponse], summary="네이버 로그인 콜백")
+async def naver_callback(
+    request: Request,
+    response: Response,
+    code: str,
+    state: str,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    provider = get_provider("NAVER")
+    if not provider.is_configured():
+        raise_bad_request("NAVER env 가 설정되지 않았습니다.", "BAD_REQUEST")
+
+    # state 검증(GETDEL 한 번으로 확인 + 삭제)
+    r = get_async_redis()
+    if await r.getdel(f"oauth:naver:state:{state}") != "1":
+        raise_unauthorized("state 가 유효하지 않습니다.", "UNAUTHORIZED")
+
+    # 외부 호출은 이벤트 루프에서 비동기로(느린 provider 가 threadpool 을 잡지 않게)
+    try:
+        naver_access = await provider.exchange_code(code, state)
+        profile = await provider.fetch_profile(naver_access)
+    except OAuthError as e:
+        raise_unauthorized(str(e), "UNAUTHORIZED")
+
+    payload = await run_in_threadpool(_social_login, db, profile, response, background)
+    return ApiSuccess(message="네이버 로그인 성공", payload=payload)
 
 def _get_refresh_from_request(request: Request) -> str | None:
     # 과제 구현: refresh token은 쿠키로만 받음
     return request.cookies.get("refreshToken") or request.cookies.get("refresh_token")
 
 
+def _raise_login_locked(wait_seconds: int) -> None:
+    raise_too_many_requests(
+        "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+        "TOO_MANY_REQUESTS",
+        details={"retryAfterSeconds": wait_seconds},
+    )
+
+
 @router.post("/login", response_model=ApiSuccess[TokenResponse], summary="로그인")
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)):
+def login(
+    request: Request,
+    payload: LoginRequest,
+    response: Response,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    ip = get_remote_address(request)
+    wait = check_login_allowed(payload.email, ip)   # 유저 조회/bcrypt 전에 잠금 확인
+    if wait:
+        _raise_login_locked(wait)
+
     user = db.query(User).filter(User.email == payload.email).first()
     if not user:
+        locked = record_login_failure(payload.email, ip)  # 없는 계정 시도도 카운트(크리덴셜 스터핑)
+        if locked:
+            _raise_login_locked(locked)
         raise_not_found("유저를 찾을 수 없습니다.", "USER_NOT_FOUND")
 
     if not verify_password(payload.password, user.password_hash):
+        locked = record_login_failure(payload.email, ip)
+        if locked:
+            _raise_login_locked(locked)
         raise_unauthorized("이메일 또는 비밀번호가 올바르지 않습니다.", "INVALID_CREDENTIALS")
 
+    reset_login_failures(payload.email)
+
     if hasattr(user, "is_active") and not user.is_active:
         raise_unauthorized("비활성화된 계정입니다.", "USER_INACTIVE")
 
+    gen = get_generation(user.id)                  # 현재 토큰 세대
     access_token = create_access_token(            # access token 발급
         subject=str(user.id),
-        role=user.role
+        role=user.role,
+        gen=gen,
     )
 
     jti = uuid.uuid4().hex                         # refresh token 식별자
     refresh_token = create_refresh_token(
         subject=str(user.id),
-        jti=jti
+        jti=jti,
+        gen=gen,
+        role=user.role,
     )
 
     response.set_cookie(
@@ -242,13 +243,8 @@ def login(payload: LoginRequest, response: Response, db: Session = Depends(get_d
     )
 
     expires_at = datetime.now(timezone.utc) + timedelta(days=14)
-    db.add(
-        RefreshToken(                              # refresh token 서버 저장
-            user_id=user.id,
-            jti=jti,
-            expires_at=expires_at,
-            is_revoked=False
-        )
+    get_refresh_token_store().issue(               # refresh token 서버 저장
+        db, user.id, jti, expires_at, background
     )
     db.commit()
 
@@ -262,7 +258,12 @@ def login(payload: LoginRequest, response: Response, db: Session = Depends(get_d
 
 
 @router.post("/reissue", response_model=ApiSuccess[TokenResponse], summary="토큰 재발급")
-def reissue(request: Request, response: Response, db: Session = Depends(get_db)):
+def reissue(
+    request: Request,
+    response: Response,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     refresh = _get_refresh_from_request(request)
     if not refresh:
         raise_unauthorized("refresh token 이 필요합니다.", "UNAUTHORIZED")
@@ -274,30 +275,33 @@ def reissue(request: Request, response: Response, db: Session = Depends(get_db))
     if not jti or not user_id:
         raise_unauthorized("refresh token 이 유효하지 않습니다.", "UNAUTHORIZED")
 
-    r = get_redis()
-    if r.get(f"bl:rt:{jti}") == "1":               # 로그아웃 블랙리스트 체크
-        raise_unauthorized("refresh token 이 유효하지 않습니다.", "UNAUTHORIZED")
-
-    token_row = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
-    if not token_row or token_row.is_revoked:
+    gen = int(payload.get("gen") or 0)
+    new_jti = uuid.uuid4().hex                      # 새 refresh 식별자
+    expires_at = datetime.now(timezone.utc) + timedelta(days=14)
+    # 토큰 세대 / 로그아웃 블랙리스트 확인 + 기존 refresh 폐기 + 새 refresh 저장(redis: Lua 한 번, DB 안 감)
+    rotated = get_refresh_token_store().rotate(
+        db, int(user_id), jti, new_jti, expires_at, gen, background
+    )
+    if not rotated:
         raise_unauthorized("refresh token 이 유효하지 않습니다.", "UNAUTHORIZED")
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise_not_found("유저를 찾을 수 없습니다.", "USER_NOT_FOUND")
-    role = user.role
-
-    token_row.is_revoked = True                     # 기존 refresh 재사용 방지
-    token_row.revoked_at = datetime.now(timezone.utc)
+    role = payload.get("role")
+    if role is None:                                # role 없는 예전 refresh 만 users 조회
+        user = db.query(User).filter(User.id == int(user_id)).first()
+        if not user:
+            raise_not_found("유저를 찾을 수 없습니다.", "USER_NOT_FOUND")
+        role = user.role
 
-    new_jti = uuid.uuid4().hex                      # 새 refresh 식별자
     access_token = create_access_token(
         subject=str(user_id),
-        role=role
+        role=role,
+        gen=gen,
     )
     refresh_token = create_refresh_token(
         subject=str(user_id),
-        jti=new_jti
+        jti=new_jti,
+        gen=gen,
+        role=role,
     )
 
     response.set_cookie(
@@ -309,17 +313,8 @@ def reissue(request: Request, response: Response, db: Session = Depends(get_db))
         max_age=14 * 24 * 3600,
     )
 
-    expires_at = datetime.now(timezone.utc) + timedelta(days=14)
-    db.add(
-        RefreshToken(                              # 새 refresh token 저장
-            user_id=int(user_id),
-            jti=new_jti,
-            expires_at=expires_at,
-            is_revoked=False
-        )
-    )
-
-    db.commit()
+    if db.in_transaction():                         # redis 모드는 보통 DB 를 안 씀(전환 전 토큰만 UPDATE)
+        db.commit()
 
     return ApiSuccess(
         message="토큰 재발급 성공",
@@ -331,7 +326,12 @@ def reissue(request: Request, response: Response, db: Session = Depends(get_db))
 
 
 @router.post("/logout", response_model=ApiSuccess[dict], summary="로그아웃")
-def logout(request: Request, response: Response, db: Session = Depends(get_db)):
+def logout(
+    request: Request,
+    response: Response,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     refresh = _get_refresh_from_request(request)
     if not refresh:
         raise_bad_request("refresh token 이 필요합니다.", "BAD_REQUEST")
@@ -348,12 +348,53 @@ def logout(request: Request, response: Response, db: Session = Depends(get_db)):
         if ttl > 0:
             r = get_redis()
             r.setex(f"bl:rt:{jti}", ttl, "1")       # logout한 refresh는 재사용 차단
+            bloom = get_revocation_filter()
+            if bloom is not None:
+                bloom.add(jti)
 
-    token_row = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
-    if token_row:
-        token_row.is_revoked = True                 # refresh 즉시 폐기
-        token_row.revoked_at = datetime.now(timezone.utc)
-        db.commit()
+    get_refresh_token_store().revoke(db, jti, background)  # refresh 즉시 폐기
+    db.commit()
+
+    response.delete_cookie("refreshToken")
+    return ApiSuccess(message="로그아웃 성공", payload={"revoked": True})
+
+
+@router.get("/sessions", response_model=ApiSuccess[list[SessionResponse]], summary="내 로그인 세션 목록")
+def sessions(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    current_jti = None
+    refresh = _get_refresh_from_request(request)
+    if refresh:
+        try:
+            current_jti = decode_token(refresh).get("jti")
+        except Exception:
+            current_jti = None                      # 쿠키가 만료/위조여도 목록 조회는 가능
+
+    rows = get_refresh_token_store().sessions(db, current_user.id)   # db: refresh_tokens / redis: rt:user:{id}
+    payload = [
+        SessionResponse(
+            id=row.id,
+            createdAt=row.created_at,
+            expiresAt=row.expires_at,
+            current=row.jti == current_jti,
+        )
+        for row in rows
+    ]
+    return ApiSuccess(message="세션 목록 조회 성공", payload=payload)
+
+
+@router.post("/logout-all", response_model=ApiSuccess[dict], summary="전체 기기 로그아웃")
+def logout_all(
+    response: Response,
+    background: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    gen = bump_generation(current_user.id)          # 이전 세대 access/refresh 즉시 무효(O(1))
+    get_refresh_token_store().revoke_all(db, current_user.id, background)  # 세션 목록 정리, DB 행은 요청 밖에서
 
     response.delete_cookie("refreshToken")
-    return ApiSuccess(message="로그아웃 성공", payload={"revoked": True})
\ No newline at end of file
+    return ApiSuccess(message="전체 로그아웃 성공", payload={"revoked": True, "generation": gen})
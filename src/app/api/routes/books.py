@@ -11,14 +11,16 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles                 # ADMIN 권한 체크
-from app.core.errors import raise_not_found            # 404 공통 예외
+from app.core import book_cache                        # 도서 스냅샷 캐시 무효화
+from app.core.errors import raise_conflict, raise_not_found  # 404/409 공통 예외
+from app.core.outbox import add_event                  # 도서 변경 이벤트(outbox)
 from app.core.pagenation import paginate               # 공통 페이지네이션 유틸
 from app.core.query_utils import (
     apply_keyword_filter,                              # title/author 검색
     apply_sort,                                        # sort 파라미터 화이트리스트
     apply_exact_filter,                                # category 같은 exact 필터
 )
-from app.db.session import get_db                      # DB 세션 주입
+from app.db.session import DbSession, get_db, get_read_db_async, run_db  # DB 세션 주입(읽기는 replica)
 from app.models.book import Book
 from app.models.user import User
 from app.schemas.book import BookCreate, BookUpdate, BookResponse
@@ -56,21 +58,27 @@ def _list_books(
     return page_dict
 
 
+def _get_book(db: Session, book_id: int) -> BookResponse | None:
+    book = db.query(Book).filter(Book.id == book_id).first()
+    return BookResponse.model_validate(book) if book else None
+
+
 @router.get(
     "/public/books",
     response_model=ApiSuccess[dict],
     summary="공개 도서 목록 조회",
 )
-def 공개_도서_목록(
+async def 공개_도서_목록(
     page: int = Query(0, ge=0, description="0부터 시작"),
     size: int = Query(20, ge=1, le=100, description="기본 20, 최대 100"),
     sort: str = Query("created_at,DESC", description="예: created_at,DESC / price,ASC / title,ASC"),
     keyword: str | None = Query(None, description="title/author 부분일치 검색"),
     category: str | None = Query(None, description="카테고리 필터"),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_read_db_async),
 ):
     # 공개 엔드포인트(로그인 없이 목록 확인)
-    return ApiSuccess(message="도서 목록 조회 성공", payload=_list_books(db, page, size, sort, keyword, category))
+    page_dict = await run_db(db, _list_books, page, size, sort, keyword, category)
+    return ApiSuccess(message="도서 목록 조회 성공", payload=page_dict)
 
 
 @router.get(
@@ -78,16 +86,17 @@ def 공개_도서_목록(
     response_model=ApiSuccess[dict],
     summary="도서 목록 조회",
 )
-def 도서_목록(
+async def 도서_목록(
     page: int = Query(0, ge=0),
     size: int = Query(20, ge=1, le=100),
     sort: str = Query("created_at,DESC"),
     keyword: str | None = Query(None),
     category: str | None = Query(None),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_read_db_async),
 ):
     # 과제 요구: /books도 공개와 동일 규격(인증 없이 가능)
-    return ApiSuccess(message="도서 목록 조회 성공", payload=_list_books(db, page, size, sort, keyword, category))
+    page_dict = await run_db(db, _list_books, page, size, sort, keyword, category)
+    return ApiSuccess(message="도서 목록 조회 성공", payload=page_dict)
 
 
 @router.get(
@@ -95,11 +104,11 @@ def 도서_목록(
     response_model=ApiSuccess[BookResponse],
     summary="도서 상세 조회",
 )
-def 도서_상세(bookId: int, db: Session = Depends(get_db)):
-    book = db.query(Book).filter(Book.id == bookId).first()  # 상세 조회
+async def 도서_상세(bookId: int, db: DbSession = Depends(get_read_db_async)):
+    book = await run_db(db, _get_book, bookId)             # 상세 조회
     if not book:
         raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
-    return ApiSuccess(message="도서 상세 조회 성공", payload=book)  # response_model이 BookResponse라 그대로 가능
+    return ApiSuccess(message="도서 상세 조회 성공", payload=book)
 
 
 @router.post(
@@ -121,6 +130,8 @@ def 도서_등록(
         stock=body.stock,
     )
     db.add(book)
+    db.flush()                                             # id 확보(이벤트용)
+    add_event(db, "book", book.id, "book.created", {"bookId": book.id})
     db.commit()
     db.refresh(book)                                       # 생성된 id 등 반영
     return ApiSuccess(message="도서 등록 성공", payload=book)
@@ -141,10 +152,17 @@ def 도서_수정(
     if not book:
         raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
 
-    for k, v in body.model_dump(exclude_unset=True).items():
+    data = body.model_dump(exclude_unset=True)
+    if book.hot_stock and "stock" in data:
+        # hot 모드 재고는 Redis 가 기준(reconciler 가 덮어씀) → 해제 후 수정
+        raise_conflict("hot stock 모드 도서는 재고를 직접 수정할 수 없습니다.", "STATE_CONFLICT")
+
+    for k, v in data.items():
         setattr(book, k, v)                                # PATCH: 들어온 필드만 업데이트
 
+    add_event(db, "book", book.id, "book.updated", {"bookId": book.id, "fields": sorted(data)})
     db.commit()
+    book_cache.invalidate(book.id)                         # 장바구니 상세용 스냅샷 캐시
     db.refresh(book)
     return ApiSuccess(message="도서 수정 성공", payload=book)
 
@@ -164,5 +182,7 @@ def 도서_삭제(
         raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
 
     db.delete(book)                                        # 하드 삭제
+    add_event(db, "book", bookId, "book.deleted", {"bookId": bookId})
     db.commit()
+    book_cache.invalidate(bookId)
     return ApiSuccess(message="도서 삭제 성공", payload={"deleted": True})
\ No newline at end of file
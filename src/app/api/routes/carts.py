@@ -2,21 +2,21 @@
 카드
 Cart API
 로그인 사용자 기준 장바구니 CRUD
-DB 연동 버전
+저장소는 CART_STORE(db: cart_items / redis: cart:{user_id} 해시), 저장소 메서드가 async(db: run_db / redis: async 클라이언트)
 """
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
 
-from app.api.deps import get_current_user          # 로그인 사용자 주입
+from app.api.deps import get_current_user_async    # 로그인 사용자 주입(async)
+from app.core.cart_store import get_cart_store, merge_batch  # 장바구니 저장소(db/redis)
 from app.core.errors import raise_not_found, raise_bad_request
-from app.db.session import get_db                  # DB 세션
-from app.models.book import Book
-from app.models.cart_item import CartItem          # 장바구니 아이템 모델
+from app.db.session import DbSession, get_db_async  # DB 세션(sync/async 공용, redis 모드는 도서 확인에만 사용)
 from app.models.user import User
 from app.schemas.cart import (
+    CartBatchUpdate,
+    CartDetailResponse,
     CartItemCreate,
     CartItemUpdate,
     CartItemResponse,
@@ -32,19 +32,19 @@ router = APIRouter(
 
 @router.get(
     "/items",
-    response_model=ApiSuccess[list[CartItemResponse]],
+    response_model=ApiSuccess[CartDetailResponse | list[CartItemResponse]],
     summary="장바구니 아이템 조회",
 )
-def 장바구니_아이템_조회(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user), # 본인 장바구니만 조회
+async def 장바구니_아이템_조회(
+    includeBook: bool = Query(False, description="true면 도서 제목/가격/재고 + 소계/합계 포함"),
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async), # 본인 장바구니만 조회
 ):
-    items = (
-        db.query(CartItem)
-        .filter(CartItem.user_id == current_user.id) # 사용자 기준 필터
-        .order_by(CartItem.id.desc())
-        .all()
-    )
+    store = get_cart_store()
+    if includeBook:
+        detail = await store.detail(db, current_user.id)   # JOIN 한 번(redis: 도서 스냅샷 캐시)
+        return ApiSuccess(message="장바구니 조회 성공", payload=detail)
+    items = await store.list(db, current_user.id)
     return ApiSuccess(message="장바구니 조회 성공", payload=items)
 
 
@@ -53,15 +53,11 @@ def 장바구니_아이템_조회(
     response_model=ApiSuccess[CartItemResponse],
     summary="장바구니 담기",
 )
-def 장바구니_담기(
+async def 장바구니_담기(
     body: CartItemCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user), # 로그인 필수
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async), # 로그인 필수
 ):
-    book = db.query(Book).filter(Book.id == body.book_id).first()
-    if not book:
-        raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
-
     if body.quantity <= 0:
         raise_bad_request(                          # 수량 최소값 검증
             "수량은 1 이상이어야 합니다.",
@@ -69,53 +65,38 @@ def 장바구니_담기(
             details={"quantity": "must be >= 1"},
         )
 
-    # 이미 담긴 도서면 수량 누적, 없으면 새로 생성
-    item = (
-        db.query(CartItem)
-        .filter(
-            CartItem.user_id == current_user.id,
-            CartItem.book_id == body.book_id,
-        )
-        .first()
-    )
-
-    if item:
-        item.quantity += body.quantity               # 기존 수량 증가
-    else:
-        item = CartItem(
-            user_id=current_user.id,
-            book_id=body.book_id,
-            quantity=body.quantity,
-        )
-        db.add(item)
-
-    db.commit()
-    db.refresh(item)
+    item = await get_cart_store().add(db, current_user.id, body.bookId, body.quantity)
+    if item is None:
+        raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
     return ApiSuccess(message="장바구니 담기 성공", payload=item)
 
 
+@router.put(
+    "/items:batch",
+    response_model=ApiSuccess[list[CartItemResponse]],
+    summary="장바구니 일괄 변경(set / increment / remove)",
+)
+async def 장바구니_일괄_변경(
+    body: CartBatchUpdate,
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    # 도서 확인 한 번 + 한 트랜잭션(redis: MULTI 한 번)으로 적용, 변경 후 장바구니 전체 반환
+    items = await get_cart_store().apply_batch(db, current_user.id, merge_batch(body.items))
+    return ApiSuccess(message="장바구니 일괄 변경 성공", payload=items)
+
+
 @router.patch(
     "/items/{itemId}",
     response_model=ApiSuccess[CartItemResponse],
     summary="장바구니 수량 변경",
 )
-def 장바구니_수량_변경(
+async def 장바구니_수량_변경(
     itemId: int,
     body: CartItemUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async),
 ):
-    item = (
-        db.query(CartItem)
-        .filter(
-            CartItem.id == itemId,
-            CartItem.user_id == current_user.id,    # 본인 아이템만 수정 가능
-        )
-        .first()
-    )
-    if not item:
-        raise_not_found("장바구니 아이템을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
-
     if body.quantity <= 0:
         raise_bad_request(
             "수량은 1 이상이어야 합니다.",
@@ -123,9 +104,9 @@ def 장바구니_수량_변경(
             details={"quantity": "must be >= 1"},
         )
 
-    item.quantity = body.quantity                    # 수량 직접 변경
-    db.commit()
-    db.refresh(item)
+    item = await get_cart_store().update(db, current_user.id, itemId, body.quantity)
+    if item is None:
+        raise_not_found("장바구니 아이템을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
     return ApiSuccess(message="장바구니 수량 변경 성공", payload=item)
 
 
@@ -134,24 +115,13 @@ def 장바구니_수량_변경(
     response_model=ApiSuccess[dict],
     summary="장바구니 아이템 삭제",
 )
-def 장바구니_아이템_삭제(
+async def 장바구니_아이템_삭제(
     itemId: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async),
 ):
-    item = (
-        db.query(CartItem)
-        .filter(
-            CartItem.id == itemId,
-            CartItem.user_id == current_user.id,    # 본인 아이템만 삭제
-        )
-        .first()
-    )
-    if not item:
+    if not await get_cart_store().delete(db, current_user.id, itemId):
         raise_not_found("장바구니 아이템을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
-
-    db.delete(item)
-    db.commit()
     return ApiSuccess(message="장바구니 아이템 삭제 성공", payload={"deleted": True})
 
 
@@ -160,11 +130,9 @@ def 장바구니_아이템_삭제(
     response_model=ApiSuccess[dict],
     summary="장바구니 비우기",
 )
-def 장바구니_비우기(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def 장바구니_비우기(
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async),
 ):
-    # 사용자 장바구니 전체 삭제
-    db.query(CartItem).filter(CartItem.user_id == current_user.id).delete()
-    db.commit()
-    return ApiSuccess(message="장바구니 비우기 성공", payload={"cleared": True})
\ No newline at end of file
+    await get_cart_store().clear(db, current_user.id)
+    return ApiSuccess(message="장바구니 비우기 성공", payload={"cleared": True})
@@ -6,12 +6,15 @@ Favorites(찜) API
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user          # 로그인 사용자 주입
-from app.core.errors import raise_conflict         # 중복 찜 방지용(409)
+from app.core.errors import raise_conflict, raise_not_found  # 중복 찜(409) / 없는 도서(404)
 from app.core.pagenation import paginate           # 공통 페이지네이션
 from app.core.query_utils import apply_sort        # sort 화이트리스트 처리
+from app.db.errors import DUPLICATE_ENTRY, NO_REFERENCED_ROW, mysql_errno
 from app.db.session import get_db                  # DB 세션
 from app.models.favorite import Favorite           # 찜 테이블
 from app.models.user import User
@@ -48,17 +51,18 @@ def 찜_추가(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    exists = (
-        db.query(Favorite)
-        .filter(Favorite.user_id == current_user.id, Favorite.book_id == bookId)
-        .first()
-    )
-    if exists:
-        raise_conflict("이미 찜한 도서입니다.", "DUPLICATE_RESOURCE")    # 중복 찜 막기
-
-    fav = Favorite(user_id=current_user.id, book_id=bookId)             # 찜 생성
-    db.add(fav)
-    db.commit()
+    # INSERT 한 번: 중복은 uq_fav_user_book, 없는 도서는 FK 로 판별(조회 없이, 동시 요청도 안전)
+    try:
+        db.execute(insert(Favorite).values(user_id=current_user.id, book_id=bookId))
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        errno = mysql_errno(exc)
+        if errno == DUPLICATE_ENTRY:
+            raise_conflict("이미 찜한 도서입니다.", "DUPLICATE_RESOURCE")    # 중복 찜 막기
+        if errno == NO_REFERENCED_ROW:
+            raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+        raise
     return ApiSuccess(message="찜 추가 성공", payload={"bookId": bookId})
 
 
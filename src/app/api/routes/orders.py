@@ -1,26 +1,36 @@
 """
 Orders API (과제)
-주문 생성, 내 주문 조회, 내 주문 상세, 내 주문 아이템, ADMIN 상태 변경
+주문 생성, 장바구니 체크아웃, 내 주문 조회, 내 주문 상세, 내 주문 아이템, ADMIN 상태 변경(단건/일괄)
 """
 
 from __future__ import annotations
 
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
-
-from app.api.deps import get_current_user, require_roles   # 로그인/권한 체크
-from app.core.errors import raise_bad_request, raise_not_found
-from app.core.pagenation import paginate                   # 공통 페이지네이션
-from app.core.query_utils import apply_sort, apply_exact_filter
-from app.db.session import get_db                           # DB 세션
-from app.models.book import Book
+from sqlalchemy import insert, literal, select, union_all
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.deps import get_current_user_async, require_roles  # 로그인/권한 체크
+from app.core.cart_store import get_cart_store              # 장바구니 저장소(db/redis)
+from app.core.errors import raise_bad_request, raise_conflict, raise_not_found
+from app.core.outbox import add_event                      # 주문 이벤트(outbox)
+from app.core.order_status import TRANSITIONS, transition_orders  # 주문 상태 전이
+from app.core.order_archive import get_archived_order, load_archived_orders  # 오래된 주문(아카이브) fallback
+from app.core.pagenation import encode_cursor, keyset_paginate, paginate  # 공통 페이지네이션(offset / keyset)
+from app.core.query_utils import apply_datetime_range, apply_exact_filter
+from app.core.stock import StockReservation, reserve_stock  # 재고 일괄 차감
+from app.db.retry import retry_on_deadlock
+from app.db.session import DbSession, get_db, get_db_async, get_read_db_async, run_db  # DB 세션(읽기는 replica)
 from app.models.order import Order, OrderItem               # 주문/주문아이템 모델
+from app.models.order_archive import ArchivedOrder
 from app.models.user import User
 from app.schemas.order import (
     OrderCreate,
     OrderResponse,
     OrderItemResponse,
     OrderStatusUpdate,
+    OrderBulkStatusUpdate,
 )
 from app.schemas.response import ApiSuccess                 # 공통 성공 응답
 from app.schemas.openapi_examples import COMMON_ERROR_RESPONSES
@@ -28,144 +38,364 @@ from app.schemas.openapi_examples import COMMON_ERROR_RESPONSES
 router = APIRouter(prefix="/orders", tags=["Orders"], responses=COMMON_ERROR_RESPONSES)
 
 
-@router.post("", response_model=ApiSuccess[OrderResponse], summary="주문 생성")
-def 주문_생성(
-    body: OrderCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),         # 로그인 필요
-):
-    total = 0
-    items: list[OrderItem] = []
-
-    for it in body.items:
-        book = db.query(Book).filter(Book.id == it.bookId).first()
-        if not book:
-            raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
-        if book.stock < it.quantity:
-            raise_bad_request("재고가 부족합니다.", "UNPROCESSABLE_ENTITY")
-
-        book.stock -= it.quantity                            # 주문 생성 시 재고 선차감
-
-        unit_price = int(book.price or 0)                    # 주문 당시 가격 스냅샷
-        total += unit_price * it.quantity
-        items.append(
-            OrderItem(book_id=book.id, quantity=it.quantity, unit_price=unit_price)  # item은 나중에 order_id 연결
+def _item_response(x: OrderItem) -> OrderItemResponse:
+    return OrderItemResponse(
+        id=x.id,
+        orderId=x.order_id,
+        bookId=x.book_id,
+        quantity=x.quantity,
+        price=x.unit_price,
+    )
+
+
+def _insert_order(db: Session, user_id: int, lines: list[tuple[int, int]]) -> tuple[Order, StockReservation]:
+    # 재고 차감 + 주문/주문아이템 insert(커밋은 _commit_order)
+    reservation = reserve_stock(db, lines)                   # 도서 일괄 조회 + 조건부 재고 차감
+    prices = reservation.prices
+    total = sum(prices[book_id] * quantity for book_id, quantity in lines)  # 주문 당시 가격 스냅샷
+
+    try:
+        order = Order(
+            user_id=user_id,
+            status="CREATED",
+            total_price=total,
+            stock_reservation_id=reservation.token,
+        )  # 주문 헤더 생성
+        db.add(order)
+        db.flush()                                       # order.id 확보용
+
+        db.execute(                                      # 주문 아이템 bulk insert
+            insert(OrderItem),
+            [
+                {"order_id": order.id, "book_id": book_id, "quantity": quantity, "unit_price": prices[book_id]}
+                for book_id, quantity in lines
+            ],
+        )
+        add_event(                                       # 같은 트랜잭션에 이벤트 기록(outbox)
+            db, "order", order.id, "order.created",
+            {
+                "orderId": order.id,
+                "userId": user_id,
+                "totalPrice": total,
+                "items": [{"bookId": book_id, "quantity": quantity} for book_id, quantity in lines],
+            },
         )
+    except BaseException:
+        reservation.release()                            # hot stock(Redis) 차감분 복구
+        raise
+    return order, reservation
 
-    order = Order(user_id=current_user.id, status="CREATED", total_price=total)  # 주문 헤더 생성
-    db.add(order)
-    db.flush()                                           # order.id 확보용
 
-    for oi in items:
-        oi.order_id = order.id                            # order_id 연결
-        db.add(oi)
+def _commit_order(db: Session, reservation: StockReservation) -> None:
+    try:
+        db.commit()
+    except BaseException:
+        reservation.release()
+        raise
+    reservation.confirm()
 
-    db.commit()
-    db.refresh(order)
 
+def _order_response(db: Session, order: Order) -> OrderResponse:
     # 응답에 items 포함하려고 주문아이템 다시 조회(응답 DTO 구성용)
-    order_items = db.query(OrderItem).filter(OrderItem.order_id == order.id).all()
-    payload = OrderResponse(
+    order_items = db.query(OrderItem).filter(OrderItem.order_id == order.id).order_by(OrderItem.id).all()
+    return OrderResponse(
         id=order.id,
         userId=order.user_id,
         status=order.status,
         totalPrice=order.total_price,
-        items=[
-            OrderItemResponse(
-                id=x.id,
-                orderId=x.order_id,
-                bookId=x.book_id,
-                quantity=x.quantity,
-                price=x.unit_price,
-            )
-            for x in order_items
-        ],
+        items=[_item_response(x) for x in order_items],
     )
+
+
+def _create_order(db: Session, user_id: int, body: OrderCreate) -> OrderResponse:
+    order, reservation = _insert_order(db, user_id, [(it.bookId, it.quantity) for it in body.items])
+    _commit_order(db, reservation)
+    return _order_response(db, order)
+
+
+@router.post("", response_model=ApiSuccess[OrderResponse], summary="주문 생성")
+async def 주문_생성(
+    body: OrderCreate,
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async),   # 로그인 필요
+):
+    payload = await run_db(db, retry_on_deadlock, _create_order, current_user.id, body)  # 데드락이면 트랜잭션 재시도
+    return ApiSuccess(message="주문 생성 성공", payload=payload)
+
+
+def _place_checkout(db: Session, user_id: int, lines: list[tuple[int, int]]) -> OrderResponse:
+    # 장바구니에서 꺼낸 lines 로 주문(db 모드: 장바구니 삭제와 같은 트랜잭션)
+    if not lines:
+        db.rollback()
+        raise_bad_request("장바구니가 비어 있습니다.", "BAD_REQUEST")
+    order, reservation = _insert_order(db, user_id, lines)
+    _commit_order(db, reservation)                       # 재고 차감/주문 생성/장바구니 삭제 한 트랜잭션
+    return _order_response(db, order)
+
+
+@router.post("/checkout", response_model=ApiSuccess[OrderResponse], summary="장바구니 주문(체크아웃)")
+async def 장바구니_주문(
+    db: DbSession = Depends(get_db_async),
+    current_user: User = Depends(get_current_user_async),   # 로그인 필요
+):
+    # db: 행 잠금 후 삭제 / redis: 해시 원자적으로 꺼냄, 주문 실패하면 장바구니 그대로
+    payload = await get_cart_store().checkout(db, current_user.id, _place_checkout)
     return ApiSuccess(message="주문 생성 성공", payload=payload)
 
 
+def _order_list_response(o: Order, include_items: bool) -> OrderResponse:
+    return OrderResponse(
+        id=o.id,
+        userId=o.user_id,
+        status=o.status,
+        totalPrice=o.total_price,
+        items=[_item_response(x) for x in o.items] if include_items else None,  # 기본은 items 생략
+    )
+
+
+def _archived_response(o: ArchivedOrder, archived: dict[int, dict], include_items: bool) -> OrderResponse:
+    return OrderResponse(
+        id=o.id,
+        userId=o.user_id,
+        status=o.status,
+        totalPrice=o.total_price,
+        items=archived.get(o.id, {}).get("items", []) if include_items else None,
+    )
+
+
+_ORDER_SORTS = ("created_at", "total_price", "status")       # Order / ArchivedOrder 공통 정렬 컬럼
+
+
+def _mixed_list_response(db: Session, user_id: int, rows: list, include_items: bool) -> list[OrderResponse]:
+    # hot(Order) / 아카이브(ArchivedOrder) 가 섞인 페이지 → 응답(아카이브 items 는 필요한 월 묶음만 읽음)
+    archived = load_archived_orders(
+        db, user_id, [o for o in rows if isinstance(o, ArchivedOrder)]
+    ) if include_items else {}
+    return [
+        _archived_response(o, archived, include_items) if isinstance(o, ArchivedOrder)
+        else _order_list_response(o, include_items)
+        for o in rows
+    ]
+
+
+def _archive_window(db: Session, q, aq, field: str, descending: bool, page: int, size: int) -> list:
+    # 양쪽에서 (정렬키, id) 만 인덱스 순서로 (page+1)*size 개씩 → UNION ALL 에서 해당 페이지 id 만 고른 뒤 본문은 IN 으로
+    limit = (page + 1) * size
+
+    def window(query, model, archived: int):
+        key, pk = getattr(model, field), model.id
+        return (
+            query.with_entities(key.label("k"), pk.label("id"), literal(archived).label("archived"))
+            .order_by(*((key.desc(), pk.desc()) if descending else (key.asc(), pk.asc())))
+            .limit(limit)
+            .subquery()
+        )
+
+    hot, cold = window(q, Order, 0), window(aq, ArchivedOrder, 1)
+    merged = union_all(
+        select(hot.c.k, hot.c.id, hot.c.archived), select(cold.c.k, cold.c.id, cold.c.archived)
+    ).subquery()
+    picked = db.execute(
+        select(merged.c.id, merged.c.archived)
+        .order_by(*((merged.c.k.desc(), merged.c.id.desc()) if descending else (merged.c.k.asc(), merged.c.id.asc())))
+        .offset(page * size)
+        .limit(size)
+    ).all()
+    return [(order_id, bool(archived)) for order_id, archived in picked]
+
+
+def _list_orders(
+    db: Session,
+    user_id: int,
+    page: int,
+    size: int,
+    sort: str,
+    status: str | None,
+    include_items: bool,
+    cursor: str | None,
+) -> dict:
+    q = db.query(Order).filter(Order.user_id == user_id)          # 사용자 기준 필터
+    q = apply_exact_filter(q, Order, "status", status)            # status 필터
+
+    # 아카이브된 오래된 주문도 같은 조건으로(ix_archived_orders_user_created), 없으면(대부분) 이후 아카이브 쿼리 생략
+    aq = db.query(ArchivedOrder).filter(ArchivedOrder.user_id == user_id)
+    aq = apply_exact_filter(aq, ArchivedOrder, "status", status)
+    has_archived = aq.with_entities(ArchivedOrder.id).limit(1).first() is not None  # 인덱스 한 행만 확인
+
+    loaded_q = q.options(selectinload(Order.items)) if include_items else q  # 페이지 주문들의 아이템을 IN 쿼리 한 번으로
+
+    if cursor:
+        # keyset: (created_at, id) DESC, 양쪽 모두 인덱스 range 로 size+1 개씩만 읽고 합침(sort/page 무시)
+        page_dict = keyset_paginate(
+            loaded_q, [("created_at", Order.created_at), ("id", Order.id)], size=size, cursor=cursor
+        )
+        if not has_archived:
+            page_dict["content"] = [_order_list_response(o, include_items) for o in page_dict["content"]]
+            return page_dict
+        archived_page = keyset_paginate(
+            aq, [("created_at", ArchivedOrder.created_at), ("id", ArchivedOrder.id)], size=size, cursor=cursor
+        )
+        rows = sorted(
+            page_dict["content"] + archived_page["content"], key=lambda o: (o.created_at, o.id), reverse=True
+        )
+        has_next = len(rows) > page_dict["size"] or page_dict["hasNext"] or archived_page["hasNext"]
+        rows = rows[:page_dict["size"]]
+        page_dict["hasNext"] = has_next
+        page_dict["nextCursor"] = encode_cursor([rows[-1].created_at, rows[-1].id]) if has_next else None
+        page_dict["content"] = _mixed_list_response(db, user_id, rows, include_items)
+        return page_dict
+
+    # offset: 허용 필드만, 동률은 id 로 고정(아카이브와 합칠 때 / nextCursor 와 같은 순서)
+    field, _, direction = (sort or "created_at,DESC").partition(",")
+    if field not in _ORDER_SORTS:
+        field, direction = "created_at", "DESC"
+    descending = direction.strip().upper() != "ASC"
+
+    if not has_archived:
+        page_dict = paginate(
+            loaded_q.order_by(getattr(Order, field).desc() if descending else getattr(Order, field).asc())
+            .order_by(Order.id.desc() if descending else Order.id.asc()),
+            page=page,
+            size=size,
+            sort=sort,
+        )
+        rows = page_dict["content"]
+    else:
+        picked = _archive_window(db, q, aq, field, descending, page, size)
+        hot_ids = [order_id for order_id, archived in picked if not archived]
+        cold_ids = [order_id for order_id, archived in picked if archived]
+        by_key = {(False, o.id): o for o in (loaded_q.filter(Order.id.in_(hot_ids)).all() if hot_ids else [])}
+        by_key.update(
+            {(True, o.id): o for o in (aq.filter(ArchivedOrder.id.in_(cold_ids)).all() if cold_ids else [])}
+        )
+        rows = [by_key[(archived, order_id)] for order_id, archived in picked if (archived, order_id) in by_key]
+        total = q.count() + aq.count()
+        page_dict = {
+            "content": rows,
+            "page": page,
+            "size": size,
+            "totalElements": total,
+            "totalPages": (total + size - 1) // size,
+            "sort": sort or "",
+        }
+
+    if field == "created_at" and descending:
+        # 기본 정렬이면 cursor 없이 받은 첫 페이지에도 nextCursor → 다음부터 keyset 으로 이어서
+        has_next = (page + 1) * size < page_dict["totalElements"] and bool(rows)
+        page_dict["hasNext"] = has_next
+        page_dict["nextCursor"] = encode_cursor([rows[-1].created_at, rows[-1].id]) if has_next else None
+    page_dict["content"] = _mixed_list_response(db, user_id, rows, include_items)
+    return page_dict
+
+
 @router.get("", response_model=ApiSuccess[dict], summary="내 주문 목록 조회")
-def 내_주문_목록(
+async def 내_주문_목록(
     page: int = Query(0, ge=0),
     size: int = Query(20, ge=1, le=100),
     sort: str = Query("created_at,DESC"),
     status: str | None = Query(None, description="상태 필터(예: CREATED)"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),         # 내 주문만 조회
+    includeItems: bool = Query(False, description="true면 주문별 items 포함"),
+    cursor: str | None = Query(None, description="커서 페이지네이션(없으면 첫 페이지, 이후 nextCursor)"),
+    db: DbSession = Depends(get_read_db_async),
+    current_user: User = Depends(get_current_user_async),   # 내 주문만 조회
 ):
-    q = db.query(Order).filter(Order.user_id == current_user.id)  # 사용자 기준 필터
-    q = apply_exact_filter(q, Order, "status", status)            # status 필터
-    q = apply_sort(                                               # 정렬: 허용 필드만
-        q,
-        sort,
-        allowed={
-            "created_at": Order.created_at,
-            "total_price": Order.total_price,
-            "status": Order.status,
-        },
-        default="created_at,DESC",
+    page_dict = await run_db(
+        db, _list_orders, current_user.id, page, size, sort, status, includeItems, cursor
     )
-    page_dict = paginate(q, page=page, size=size, sort=sort)      # page/size 적용
-    page_dict["content"] = [
-        OrderResponse(id=o.id, userId=o.user_id, status=o.status, totalPrice=o.total_price, items=None)  # 목록은 items 생략
-        for o in page_dict["content"]
-    ]
     return ApiSuccess(message="내 주문 목록 조회 성공", payload=page_dict)
 
 
-@router.get("/{orderId}", response_model=ApiSuccess[OrderResponse], summary="내 주문 상세 조회")
-def 내_주문_상세(
-    orderId: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+def _list_order_items(
+    db: Session,
+    user_id: int,
+    size: int,
+    cursor: str | None,
+    book_id: int | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+) -> dict:
+    # 컬럼만 조회(ORM 객체 생성 없음), (order_id, id) DESC keyset
+    q = (
+        db.query(
+            OrderItem.id.label("id"),
+            OrderItem.order_id.label("orderId"),
+            OrderItem.book_id.label("bookId"),
+            OrderItem.quantity.label("quantity"),
+            OrderItem.unit_price.label("price"),
+        )
+        .join(Order, OrderItem.order_id == Order.id)          # Order.user_id 조건 걸려고 join
+        .filter(Order.user_id == user_id)
+    )
+    q = apply_exact_filter(q, OrderItem, "book_id", book_id)  # 도서 필터
+    q = apply_datetime_range(q, Order, "created_at", date_from, date_to)  # 주문일 범위
+
+    page_dict = keyset_paginate(
+        q, [("orderId", OrderItem.order_id), ("id", OrderItem.id)], size=size, cursor=cursor
+    )
+    page_dict["content"] = [dict(row._mapping) for row in page_dict["content"]]
+    return page_dict
+
+
+# /{orderId} 보다 먼저 등록해야 "items" 가 orderId 로 매칭되지 않음
+@router.get("/items", response_model=ApiSuccess[dict], summary="내 주문 아이템 조회(커서 페이지네이션)")
+async def 내_주문_아이템_전체(
+    size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="다음 페이지 커서(이전 응답의 nextCursor)"),
+    bookId: int | None = Query(None, ge=1, description="도서 필터"),
+    dateFrom: datetime | None = Query(None, description="주문일 시작(ISO 8601)"),
+    dateTo: datetime | None = Query(None, description="주문일 끝(ISO 8601)"),
+    db: DbSession = Depends(get_read_db_async),
+    current_user: User = Depends(get_current_user_async),
 ):
+    payload = await run_db(
+        db, _list_order_items, current_user.id, size, cursor, bookId, dateFrom, dateTo
+    )
+    return ApiSuccess(message="내 주문 아이템 조회 성공", payload=payload)
+
+
+def _get_order(db: Session, user_id: int, order_id: int) -> OrderResponse | None:
     order = (
         db.query(Order)
-        .options(joinedload(Order.items))                       # N+1 방지(아이템 같이 로딩)
-        .filter(Order.id == orderId, Order.user_id == current_user.id)  # 내 주문만 접근
+        .options(selectinload(Order.items))                     # 아이템은 IN 쿼리로(JOIN 으로 주문 컬럼 중복 안 되게)
+        .filter(Order.id == order_id, Order.user_id == user_id)  # 내 주문만 접근
         .first()
     )
     if not order:
-        raise_not_found("주문을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+        archived = get_archived_order(db, user_id, order_id)    # 오래된 주문은 아카이브에서
+        return OrderResponse(**archived) if archived else None
 
-    items = [
-        OrderItemResponse(
-            id=x.id,
-            orderId=x.order_id,
-            bookId=x.book_id,
-            quantity=x.quantity,
-            price=x.unit_price,
-        )
-        for x in order.items
-    ]
-    return ApiSuccess(
-        message="내 주문 상세 조회 성공",
-        payload=OrderResponse(
-            id=order.id,
-            userId=order.user_id,
-            status=order.status,
-            totalPrice=order.total_price,
-            items=items,
-        ),
+    return OrderResponse(
+        id=order.id,
+        userId=order.user_id,
+        status=order.status,
+        totalPrice=order.total_price,
+        items=[_item_response(x) for x in order.items],
     )
 
 
-@router.get("/items", response_model=ApiSuccess[list[dict]], summary="내 주문 아이템 전체 조회")
-def 내_주문_아이템_전체(
+@router.get("/{orderId}", response_model=ApiSuccess[OrderResponse], summary="내 주문 상세 조회")
+async def 내_주문_상세(
+    orderId: int,
+    db: DbSession = Depends(get_read_db_async),
+    current_user: User = Depends(get_current_user_async),
+):
+    order = await run_db(db, _get_order, current_user.id, orderId)
+    if not order:
+        raise_not_found("주문을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+    return ApiSuccess(message="내 주문 상세 조회 성공", payload=order)
+
+
+@router.patch("/status", response_model=ApiSuccess[dict], summary="(ADMIN) 주문 상태 일괄 변경")
+def 주문_상태_일괄_변경(
+    body: OrderBulkStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    _admin: User = Depends(require_roles("ROLE_ADMIN")),      # 관리자만 변경 가능
 ):
-    items = (
-        db.query(OrderItem)
-        .join(Order, OrderItem.order_id == Order.id)          # Order.user_id 조건 걸려고 join
-        .filter(Order.user_id == current_user.id)
-        .all()
+    moved, skipped = transition_orders(db, body.orderIds, body.toStatus, body.fromStatus)
+    return ApiSuccess(
+        message="주문 상태 일괄 변경 성공",
+        payload={"status": body.toStatus, "updated": len(moved), "skippedIds": skipped},
     )
-    payload = [
-        {"id": x.id, "orderId": x.order_id, "bookId": x.book_id, "quantity": x.quantity, "price": x.unit_price}
-        for x in items
-    ]
-    return ApiSuccess(message="내 주문 아이템 조회 성공", payload=payload)
 
 
 @router.patch("/{orderId}/status", response_model=ApiSuccess[dict], summary="(ADMIN) 주문 상태 변경")
@@ -175,10 +405,14 @@ def 주문_상태_변경(
     db: Session = Depends(get_db),
     _admin: User = Depends(require_roles("ROLE_ADMIN")),      # 관리자만 변경 가능
 ):
-    order = db.query(Order).filter(Order.id == orderId).first()
-    if not order:
-        raise_not_found("주문을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
-
-    order.status = body.status                                 # 상태만 변경
-    db.commit()
-    return ApiSuccess(message="주문 상태 변경 성공", payload={"orderId": order.id, "status": order.status})
\ No newline at end of file
+    moved, _ = transition_orders(db, [orderId], body.status)  # 전이표에 맞을 때만 조건부 UPDATE
+    if not moved:
+        current = db.query(Order.status).filter(Order.id == orderId).scalar()
+        if current is None:
+            raise_not_found("주문을 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+        raise_conflict(
+            "현재 상태에서 변경할 수 없는 상태입니다.",
+            "STATE_CONFLICT",
+            details={"currentStatus": current, "allowed": sorted(TRANSITIONS.get(current, set()))},
+        )
+    return ApiSuccess(message="주문 상태 변경 성공", payload={"orderId": orderId, "status": body.status})
@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user          # 로그인 사용자 주입
 from app.core.errors import raise_forbidden, raise_not_found
-from app.db.session import get_db                  # DB 세션
+from app.db.session import get_db, get_read_db     # DB 세션(읽기는 replica)
 from app.models.book import Book
 from app.models.review import Review               # 리뷰 모델
 from app.models.user import User
@@ -28,7 +28,7 @@ router = APIRouter(responses=COMMON_ERROR_RESPONSES)  # /api prefix는 main에
 )
 def 도서_리뷰_목록_조회(
     bookId: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     book = db.query(Book).filter(Book.id == bookId).first()  # 존재 확인
     if not book:
@@ -76,7 +76,7 @@ def 도서_리뷰_작성(
     summary="내 리뷰 조회",
 )
 def 내_리뷰_조회(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     reviews = (
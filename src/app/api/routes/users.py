@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_current_user          # 로그인 사용자 주입
 from app.core.errors import raise_conflict         # 이메일 중복 처리
 from app.core.security import get_password_hash    # 비밀번호 해시
+from app.core.session_generation import bump_generation  # 탈퇴 시 발급된 토큰 전부 무효화
 from app.db.session import get_db                  # DB 세션
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
@@ -69,6 +70,7 @@ def 소프트삭제(
 ):
     current_user.is_active = False                          # 계정 비활성화
     db.commit()
+    bump_generation(current_user.id)                        # refresh 재발급은 users 를 안 읽으므로 세대로 막음
     return ApiSuccess(message="소프트 삭제 성공", payload={"deleted": True})
 
 
@@ -77,6 +79,8 @@ def 영구삭제(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    user_id = current_user.id
     db.delete(current_user)                                 # DB row 완전 삭제
     db.commit()
+    bump_generation(user_id)
     return ApiSuccess(message="영구 삭제 성공", payload={"deleted": True})
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+도서 스냅샷 캐시(Redis)
+- book:snap:{id} → JSON(title, price, stock), TTL BOOK_CACHE_TTL_SECONDS
+- get_snapshots(): MGET 한 번(async 클라이언트), 없는 도서만 DB IN 쿼리 한 번(run_db)으로 읽어서 채움
+- 도서 수정/삭제 시 invalidate()(routes/books), 주문으로 줄어든 재고는 TTL 만큼 늦게 반영
+  → 장바구니 표시용 값, 재고 최종 확인은 체크아웃(core/stock)
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.redis_client import get_async_redis, get_redis
+from app.db.session import DbSession, run_db
+from app.models.book import Book
+
+
+def _key(book_id: int) -> str:
+    return f"book:snap:{book_id}"
+
+
+def _load(db: Session, book_ids: list[int]) -> list[tuple[int, str, int, int]]:
+    return [
+        tuple(row)
+        for row in db.execute(
+            select(Book.id, Book.title, Book.price, Book.stock).where(Book.id.in_(book_ids))  # 필요한 컬럼만
+        ).all()
+    ]
+
+
+async def get_snapshots(db: DbSession, book_ids: list[int]) -> dict[int, dict[str, Any]]:
+    """book_id → {"title", "price", "stock"}, 없는 도서는 결과에서 빠짐"""
+    if not book_ids:
+        return {}
+    r = get_async_redis()
+    snapshots = {
+        book_id: json.loads(raw)
+        for book_id, raw in zip(book_ids, await r.mget([_key(book_id) for book_id in book_ids]))
+        if raw
+    }
+    missing = [book_id for book_id in book_ids if book_id not in snapshots]
+    metrics.inc("book_cache.hits", len(snapshots))
+    if not missing:
+        return snapshots
+
+    metrics.inc("book_cache.misses", len(missing))
+    rows = await run_db(db, _load, missing)
+    ttl = get_settings().book_cache_ttl_seconds
+    pipe = r.pipeline(transaction=False)
+    for book_id, title, price, stock in rows:
+        snapshots[book_id] = {"title": title, "price": int(price or 0), "stock": int(stock or 0)}
+        pipe.set(_key(book_id), json.dumps(snapshots[book_id], ensure_ascii=False), ex=ttl)
+    await pipe.execute()
+    return snapshots
+
+
+def invalidate(book_id: int) -> None:
+    # 도서 수정/삭제(sync 핸들러, threadpool)에서 호출
+    get_redis().delete(_key(book_id))
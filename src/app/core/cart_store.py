@@ -0,0 +1,463 @@
+"""
+장바구니 저장소
+db    : cart_items 테이블(기존 방식)
+redis : cart:{user_id} HASH(book_id → 수량, TTL), 담기/수정/삭제가 Redis 명령 한 번(async 클라이언트)
+        MySQL 에는 체크아웃 때 주문(order_items)으로만 기록, 아이템 id 는 bookId
+settings.cart_store 로 선택
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, TypeVar
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import book_cache
+from app.core.config import get_settings
+from app.core.errors import raise_not_found
+from app.core.redis_client import get_async_redis
+from app.db.errors import NO_REFERENCED_ROW, mysql_errno
+from app.db.retry import retry_on_deadlock
+from app.db.session import DbSession, run_db
+from app.models.book import Book
+from app.models.cart_item import CartItem
+from app.schemas.cart import (
+    MAX_QUANTITY,
+    CartBatchItem,
+    CartDetailResponse,
+    CartItemDetailResponse,
+    CartItemResponse,
+)
+
+SET = "set"
+INCREMENT = "increment"
+REMOVE = "remove"
+
+T = TypeVar("T")
+
+
+def merge_batch(items: Iterable[CartBatchItem]) -> dict[int, tuple[str, int]]:
+    """일괄 변경 요청 → bookId 별 최종 (동작, 수량), 같은 bookId 는 요청 순서대로 합침(수량은 MAX_QUANTITY 까지)"""
+    merged: dict[int, tuple[str, int]] = {}
+    for item in items:
+        op, quantity = item.op, item.quantity
+        if op == SET and quantity == 0:
+            op = REMOVE                                  # 수량 0 으로 지정 = 삭제
+        if op == INCREMENT:
+            if quantity == 0:
+                continue
+            prev_op, prev_quantity = merged.get(item.bookId, (INCREMENT, 0))
+            # set 뒤 increment → 합친 수량으로 set, remove 뒤 increment → 그 수량으로 set
+            op, quantity = (INCREMENT, prev_quantity + quantity) if prev_op == INCREMENT else (
+                SET, (prev_quantity if prev_op == SET else 0) + quantity
+            )
+        merged[item.bookId] = (op, 0 if op == REMOVE else min(quantity, MAX_QUANTITY))
+    return merged
+
+
+def _detail_response(user_id: int, rows: Iterable[tuple[int, int, int, str, int, int]]) -> CartDetailResponse:
+    # (아이템 id, book_id, 수량, 제목, 가격, 재고) → 아이템별 소계/구매 가능 여부 + 합계
+    items = [
+        CartItemDetailResponse(
+            id=item_id,
+            userId=user_id,
+            bookId=book_id,
+            quantity=quantity,
+            title=title,
+            price=int(price or 0),
+            stock=int(stock or 0),
+            available=int(stock or 0) >= quantity,
+            subtotal=int(price or 0) * quantity,
+        )
+        for item_id, book_id, quantity, title, price, stock in rows
+    ]
+    return CartDetailResponse(
+        items=items,
+        totalQuantity=sum(x.quantity for x in items),
+        totalPrice=sum(x.subtotal for x in items),
+        allAvailable=all(x.available for x in items),
+    )
+
+
+def _book_exists(db: Session, book_id: int) -> bool:
+    return db.query(Book.id).filter(Book.id == book_id).first() is not None
+
+
+def _check_books(db: Session, book_ids: list[int]) -> None:
+    # 도서 존재 확인 IN 쿼리 한 번, 없는 도서가 있으면 404(bookIds)
+    if not book_ids:
+        return
+    found = set(db.execute(select(Book.id).where(Book.id.in_(book_ids))).scalars())
+    missing = [book_id for book_id in book_ids if book_id not in found]
+    if missing:
+        raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND", details={"bookIds": missing})
+
+
+class CartStore(ABC):
+    """
+    장바구니 CRUD + 체크아웃 인터페이스(db 는 요청 세션, sync/async 공용)
+    async 메서드: db 모드는 run_db 로 DB 작업, redis 모드는 async Redis 클라이언트(이벤트 루프 안 막음)
+    """
+
+    @abstractmethod
+    async def list(self, db: DbSession, user_id: int) -> list[CartItemResponse]:
+        ...
+
+    @abstractmethod
+    async def detail(self, db: DbSession, user_id: int) -> CartDetailResponse:
+        """도서 제목/가격/재고 + 소계/합계 포함 장바구니"""
+
+    @abstractmethod
+    async def add(self, db: DbSession, user_id: int, book_id: int, quantity: int) -> CartItemResponse | None:
+        """도서가 없으면 None"""
+
+    @abstractmethod
+    async def update(self, db: DbSession, user_id: int, item_id: int, quantity: int) -> CartItemResponse | None:
+        ...
+
+    @abstractmethod
+    async def delete(self, db: DbSession, user_id: int, item_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def clear(self, db: DbSession, user_id: int) -> None:
+        ...
+
+    @abstractmethod
+    async def apply_batch(
+        self, db: DbSession, user_id: int, changes: dict[int, tuple[str, int]]
+    ) -> list[CartItemResponse]:
+        """merge_batch() 결과를 한 번에 적용하고 변경 후 장바구니 반환(도서가 없으면 404, 아무것도 적용 안 함)"""
+
+    @abstractmethod
+    async def checkout(self, db: DbSession, user_id: int, place: Callable[[Session, int, list[tuple[int, int]]], T]) -> T:
+        """
+        장바구니 (book_id, 수량) 을 꺼내 place(session, user_id, lines) 로 주문(데드락이면 재시도)
+        place 가 실패하면 장바구니는 그대로
+        """
+
+
+class DbCartStore(CartStore):
+    """cart_items 테이블 기준, 각 메서드는 sync 세션 코드(_xxx)를 run_db 로 실행"""
+
+    @staticmethod
+    def _to_response(item: CartItem) -> CartItemResponse:  # ORM(snake_case) → 응답 DTO(camelCase)
+        return CartItemResponse(
+            id=item.id,
+            userId=item.user_id,
+            bookId=item.book_id,
+            quantity=item.quantity,
+        )
+
+    async def list(self, db, user_id):
+        return await run_db(db, self._list, user_id)
+
+    async def detail(self, db, user_id):
+        return await run_db(db, self._detail, user_id)
+
+    async def add(self, db, user_id, book_id, quantity):
+        return await run_db(db, self._add, user_id, book_id, quantity)
+
+    async def update(self, db, user_id, item_id, quantity):
+        return await run_db(db, self._update, user_id, item_id, quantity)
+
+    async def delete(self, db, user_id, item_id):
+        return await run_db(db, self._delete, user_id, item_id)
+
+    async def clear(self, db, user_id):
+        await run_db(db, self._clear, user_id)
+
+    async def apply_batch(self, db, user_id, changes):
+        return await run_db(db, self._apply_batch, user_id, changes)
+
+    async def checkout(self, db, user_id, place):
+        return await run_db(db, retry_on_deadlock, self._checkout, user_id, place)
+
+    def _list(self, db, user_id):
+        items = (
+            db.query(CartItem)
+            .filter(CartItem.user_id == user_id)    # 사용자 기준 필터
+            .order_by(CartItem.id.desc())
+            .all()
+        )
+        return [self._to_response(x) for x in items]
+
+    def _detail(self, db, user_id):
+        # cart_items JOIN books 한 번, 필요한 컬럼만(ORM 객체 생성 없음)
+        rows = db.execute(
+            select(CartItem.id, CartItem.book_id, CartItem.quantity, Book.title, Book.price, Book.stock)
+            .join(Book, Book.id == CartItem.book_id)
+            .where(CartItem.user_id == user_id)
+            .order_by(CartItem.id.desc())
+        ).all()
+        return _detail_response(user_id, rows)
+
+    def _add(self, db, user_id, book_id, quantity):
+        # INSERT ... ON DUPLICATE KEY UPDATE 한 문장: 도서 존재는 FK, 동시 담기는 uq_cart_user_book 으로 처리
+        # 누적 수량은 문장 안에서 MAX_QUANTITY 로 제한, 결과 수량은 잠긴 행 PK 조회 한 번(기존 행이면 DB 만 앎)
+        stmt = mysql_insert(CartItem).values(user_id=user_id, book_id=book_id, quantity=min(quantity, MAX_QUANTITY))
+        stmt = stmt.on_duplicate_key_update(
+            id=func.last_insert_id(CartItem.id),     # 기존 행이어도 lastrowid 로 id 받기
+            quantity=func.least(CartItem.quantity + stmt.inserted.quantity, MAX_QUANTITY),  # 이미 담긴 도서면 수량 누적
+        )
+        try:
+            item_id = db.execute(stmt).lastrowid
+        except IntegrityError as exc:
+            db.rollback()
+            if mysql_errno(exc) == NO_REFERENCED_ROW:
+                return None                          # 없는 도서(FK)
+            raise
+        total = db.execute(select(CartItem.quantity).where(CartItem.id == item_id)).scalar_one()
+        db.commit()
+        return CartItemResponse(id=item_id, userId=user_id, bookId=book_id, quantity=total)
+
+    def _update(self, db, user_id, item_id, quantity):
+        item = (
+            db.query(CartItem)
+            .filter(
+                CartItem.id == item_id,
+                CartItem.user_id == user_id,        # 본인 아이템만 수정 가능
+            )
+            .first()
+        )
+        if not item:
+            return None
+
+        item.quantity = quantity                     # 수량 직접 변경
+        db.commit()
+        db.refresh(item)
+        return self._to_response(item)
+
+    def _delete(self, db, user_id, item_id):
+        deleted = (
+            db.query(CartItem)
+            .filter(
+                CartItem.id == item_id,
+                CartItem.user_id == user_id,        # 본인 아이템만 삭제
+            )
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted > 0
+
+    def _clear(self, db, user_id):
+        db.query(CartItem).filter(CartItem.user_id == user_id).delete(synchronize_session=False)
+        db.commit()
+
+    def _apply_batch(self, db, user_id, changes):
+        # 도서 확인 IN 한 번 + 삭제 DELETE 한 번 + 다중 행 upsert 한 번, 한 트랜잭션
+        _check_books(db, sorted(book_id for book_id, (op, _) in changes.items() if op != REMOVE))
+
+        removes = sorted(book_id for book_id, (op, _) in changes.items() if op == REMOVE)
+        if removes:
+            db.query(CartItem).filter(
+                CartItem.user_id == user_id,
+                CartItem.book_id.in_(removes),
+            ).delete(synchronize_session=False)
+
+        rows = [
+            {"user_id": user_id, "book_id": book_id, "quantity": quantity}
+            for book_id, (op, quantity) in sorted(changes.items())   # book_id 순서로 잠금(데드락 방지)
+            if op != REMOVE
+        ]
+        if rows:
+            stmt = mysql_insert(CartItem).values(rows)
+            sets = [book_id for book_id, (op, _) in changes.items() if op == SET]
+            added = func.least(CartItem.quantity + stmt.inserted.quantity, MAX_QUANTITY)   # 누적도 최대 수량까지
+            stmt = stmt.on_duplicate_key_update(
+                quantity=case((CartItem.book_id.in_(sets), stmt.inserted.quantity), else_=added) if sets else added,
+            )
+            try:
+                db.execute(stmt)
+            except IntegrityError as exc:
+                db.rollback()
+                if mysql_errno(exc) == NO_REFERENCED_ROW:   # 확인 직후 삭제된 도서
+                    raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND")
+                raise
+
+        items = self._list(db, user_id)
+        db.commit()
+        return items
+
+    def _checkout(self, db, user_id, place):
+        # 장바구니 행 잠금(FOR UPDATE) → 동시에 담기/수정/중복 체크아웃 불가, 삭제는 주문과 함께 커밋(실패하면 rollback)
+        lines = [
+            (row.book_id, row.quantity)
+            for row in (
+                db.query(CartItem.book_id, CartItem.quantity)
+                .filter(CartItem.user_id == user_id)
+                .order_by(CartItem.book_id)
+                .with_for_update()
+                .all()
+            )
+        ]
+        if lines:
+            db.query(CartItem).filter(CartItem.user_id == user_id).delete(synchronize_session=False)
+        return place(db, user_id, lines)
+
+
+# KEYS[1]=cart:{user_id} KEYS[2]=cart:book:{book_id}  ARGV: book_id, 수량, ttl, 최대 수량
+# 도서 존재 표시가 없으면 -1(DB 확인 후 다시 호출)
+_ADD_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+  return -1
+end
+local quantity = math.min(tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or 0) + tonumber(ARGV[2]), tonumber(ARGV[4]))
+redis.call('HSET', KEYS[1], ARGV[1], quantity)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return quantity
+"""
+
+# 담겨 있는 도서만 수량 변경, 없으면 0
+_UPDATE_LUA = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+  return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return 1
+"""
+
+
+class RedisCartStore(CartStore):
+    """
+    cart:{user_id} → {book_id: 수량}, 마지막 변경부터 CART_REDIS_TTL_SECONDS 동안 유지
+    Redis 는 async 클라이언트, 도서 확인 같은 DB 조회만 run_db
+    """
+
+    def __init__(self) -> None:
+        r = get_async_redis()
+        self._add_script = r.register_script(_ADD_LUA)
+        self._update_script = r.register_script(_UPDATE_LUA)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"cart:{user_id}"
+
+    @staticmethod
+    def _book_key(book_id: int) -> str:
+        return f"cart:book:{book_id}"
+
+    @staticmethod
+    def _to_response(user_id: int, book_id: int, quantity: int) -> CartItemResponse:
+        return CartItemResponse(id=book_id, userId=user_id, bookId=book_id, quantity=quantity)
+
+    def _responses(self, user_id: int, items: dict[str, str]) -> list[CartItemResponse]:
+        return [
+            self._to_response(user_id, int(book_id), int(quantity))
+            for book_id, quantity in sorted(items.items(), key=lambda kv: int(kv[0]), reverse=True)
+        ]
+
+    async def list(self, db, user_id):
+        return self._responses(user_id, await get_async_redis().hgetall(self._key(user_id)))
+
+    async def detail(self, db, user_id):
+        # 장바구니 HGETALL + 도서 스냅샷 MGET(캐시에 없는 도서만 DB IN 쿼리)
+        items = await self.list(db, user_id)
+        books = await book_cache.get_snapshots(db, [x.bookId for x in items])
+        return _detail_response(
+            user_id,
+            [
+                (x.id, x.bookId, x.quantity, books[x.bookId]["title"], books[x.bookId]["price"], books[x.bookId]["stock"])
+                for x in items
+                if x.bookId in books                 # 삭제된 도서는 제외(DB 모드 JOIN 과 동일)
+            ],
+        )
+
+    async def add(self, db, user_id, book_id, quantity):
+        settings = get_settings()
+        keys = [self._key(user_id), self._book_key(book_id)]
+        args = [book_id, quantity, settings.cart_redis_ttl_seconds, MAX_QUANTITY]  # 수량은 스크립트 안에서 MAX_QUANTITY 까지
+        total = int(await self._add_script(keys=keys, args=args))
+        if total < 0:
+            # 처음 보는 도서 → DB 에서 한 번 확인 후 존재 표시(TTL 동안은 DB 안 감)
+            if not await run_db(db, _book_exists, book_id):
+                return None
+            await get_async_redis().set(self._book_key(book_id), "1", ex=settings.cart_book_check_seconds)
+            total = int(await self._add_script(keys=keys, args=args))
+            if total < 0:
+                return None
+        return self._to_response(user_id, book_id, total)
+
+    async def update(self, db, user_id, item_id, quantity):
+        ttl = get_settings().cart_redis_ttl_seconds
+        if not int(await self._update_script(keys=[self._key(user_id)], args=[item_id, quantity, ttl])):
+            return None
+        return self._to_response(user_id, item_id, quantity)
+
+    async def delete(self, db, user_id, item_id):
+        return await get_async_redis().hdel(self._key(user_id), item_id) > 0
+
+    async def clear(self, db, user_id):
+        await get_async_redis().delete(self._key(user_id))
+
+    async def apply_batch(self, db, user_id, changes):
+        settings = get_settings()
+        r = get_async_redis()
+        wanted = sorted(book_id for book_id, (op, _) in changes.items() if op != REMOVE)
+        if wanted:
+            marks = await r.mget([self._book_key(book_id) for book_id in wanted])
+            unknown = [book_id for book_id, mark in zip(wanted, marks) if mark is None]
+            if unknown:
+                await run_db(db, _check_books, unknown)   # 처음 보는 도서만 DB 확인(IN 한 번)
+                pipe = r.pipeline(transaction=False)
+                for book_id in unknown:
+                    pipe.set(self._book_key(book_id), "1", ex=settings.cart_book_check_seconds)
+                await pipe.execute()
+
+        key = self._key(user_id)
+        pipe = r.pipeline(transaction=True)           # MULTI: 변경 + 결과 조회 한 번에
+        for book_id, (op, quantity) in sorted(changes.items()):
+            if op == REMOVE:
+                pipe.hdel(key, book_id)
+            elif op == SET:
+                pipe.hset(key, book_id, quantity)
+            else:
+                pipe.hincrby(key, book_id, quantity)
+        pipe.expire(key, settings.cart_redis_ttl_seconds)
+        pipe.hgetall(key)
+        items = (await pipe.execute())[-1]
+        over = {book_id: MAX_QUANTITY for book_id, quantity in items.items() if int(quantity) > MAX_QUANTITY}
+        if over:
+            await r.hset(key, mapping=over)          # increment 누적이 최대 수량을 넘은 도서만 다시 맞춤
+            items.update(over)
+        return self._responses(user_id, items)
+
+    async def checkout(self, db, user_id, place):
+        # HGETALL + DEL 을 MULTI 로 → 동시에 체크아웃해도 한 요청만 장바구니를 가져감
+        key = self._key(user_id)
+        pipe = get_async_redis().pipeline(transaction=True)
+        pipe.hgetall(key)
+        pipe.delete(key)
+        items, _ = await pipe.execute()
+        lines = sorted((int(book_id), int(quantity)) for book_id, quantity in items.items())
+        try:
+            return await run_db(db, retry_on_deadlock, place, user_id, lines)
+        except BaseException:
+            await self._restore(user_id, lines)      # 주문 실패 → 꺼낸 장바구니 되돌림
+            raise
+
+    async def _restore(self, user_id: int, lines: list[tuple[int, int]]) -> None:
+        if not lines:
+            return
+        pipe = get_async_redis().pipeline(transaction=True)
+        for book_id, quantity in lines:
+            pipe.hincrby(self._key(user_id), book_id, quantity)   # 그 사이 새로 담은 수량과 합침
+        pipe.expire(self._key(user_id), get_settings().cart_redis_ttl_seconds)
+        await pipe.execute()
+
+
+_store: CartStore | None = None
+
+
+def get_cart_store() -> CartStore:
+    # 설정값 기준으로 한 번만 생성해서 재사용
+    global _store
+    if _store is None:
+        mode = get_settings().cart_store.lower()
+        _store = RedisCartStore() if mode == "redis" else DbCartStore()
+    return _store
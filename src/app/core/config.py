@@ -14,6 +14,21 @@ class Settings(BaseSettings):  # 환경변수(.env) 설정을 한 곳에서 관
     db_user: str
     db_password: str
     db_name: str
+    db_mode: str = "sync"             # sync | async (async: hot route 들이 AsyncSession 사용)
+    db_async_driver: str = "asyncmy"  # asyncmy | aiomysql
+
+    # 커넥션 풀
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 10          # 풀 대기 최대 초(넘으면 TimeoutError)
+    db_pool_recycle: int = 1800        # 초, MySQL wait_timeout 보다 짧게
+    db_pool_pre_ping: bool = True      # checkout 마다 ping(False: recycle 로만 관리)
+
+    # 읽기 replica (비어 있으면 전부 primary)
+    db_replica_hosts: str = ""                 # "host1:3306,host2:3306"
+    db_replica_sticky_seconds: int = 5         # 쓰기 후 이 시간 동안은 primary 에서 읽기
+    db_replica_max_lag_seconds: int = 10       # 복제 지연이 이보다 크면 제외
+    db_replica_health_interval_seconds: int = 5
 
     redis_host: str = "localhost"
     redis_port: int = 6379
@@ -24,8 +39,76 @@ class Settings(BaseSettings):  # 환경변수(.env) 설정을 한 곳에서 관
     jwt_access_token_expire_minutes: int = 60
     jwt_refresh_token_expire_days: int = 7
 
+    refresh_token_store: str = "db"  # db | redis (redis: jti 상태는 Redis, MySQL은 감사 로그)
+    cart_store: str = "db"           # db | redis (redis: cart:{user_id} 해시, MySQL 은 체크아웃 때 주문으로만)
+    cart_redis_ttl_seconds: int = 30 * 86400        # 마지막 변경 후 장바구니 유지 기간
+    cart_book_check_seconds: int = 300              # 담기 시 도서 존재 확인 결과 캐시
+    book_cache_ttl_seconds: int = 60                # 장바구니 상세용 도서 스냅샷(book:snap:{id}) 캐시
+
+    # refresh_tokens 만료 행 정리(초 단위 주기, 0이면 비활성)
+    refresh_token_purge_interval_seconds: int = 3600
+    refresh_token_purge_batch_size: int = 1000
+    refresh_token_purge_max_batches: int = 100
+    refresh_token_purge_pause_ms: int = 50
+    refresh_token_partitioning: bool = False  # 월 단위 파티션 마이그레이션 적용 시 True
+
+    # 폐기 refresh token Bloom filter (음성이면 블랙리스트 조회 생략)
+    revocation_bloom_enabled: bool = True
+    revocation_bloom_fp_rate: float = 0.01
+    revocation_bloom_capacity: int = 100_000         # 버킷당 예상 폐기 건수
+    revocation_bloom_max_bytes: int = 4 * 1024 * 1024  # 전체 버킷 메모리 상한
+    revocation_bloom_bucket_seconds: int = 86400
+    revocation_bloom_sync_seconds: int = 5
+
+    # 로그인 시도 제한(계정/IP sliding window + 지수 잠금)
+    login_throttle_enabled: bool = True
+    login_throttle_window_seconds: int = 900
+    login_throttle_max_failures_email: int = 5
+    login_throttle_max_failures_ip: int = 50
+    login_lockout_base_seconds: int = 30
+    login_lockout_max_seconds: int = 3600
+
     cors_origins: str = ""
 
+    debug: bool = False               # True면 X-DB-Queries / X-DB-Time 응답 헤더
+    n_plus_one_threshold: int = 10    # 한 요청에서 같은 쿼리가 이 횟수 넘으면 N+1 경고
+
+    slow_query_log_enabled: bool = True
+    slow_query_threshold_ms: float = 200       # 이 시간 이상 걸린 쿼리만 기록
+    slow_query_sample_rate: float = 1.0        # 임계값 넘은 쿼리 중 기록 비율(0~1)
+    slow_query_max_fingerprints: int = 500     # 집계 테이블 상한(LRU)
+
+    idempotency_enabled: bool = True
+    idempotency_ttl_seconds: int = 86400          # 저장 응답 보관 기간(Redis TTL / DB expires_at)
+    idempotency_pending_seconds: int = 60         # 처리 중 표시 TTL(프로세스가 죽어도 풀리도록)
+    idempotency_wait_seconds: float = 10          # 같은 키 동시 요청이 첫 요청을 기다리는 최대 시간
+    idempotency_purge_interval_seconds: int = 3600
+
+    hot_stock_default_shards: int = 4                  # hot 모드 켤 때 재고를 나눌 Redis 키 수
+    hot_stock_reconcile_seconds: int = 5               # Redis 재고 → books.stock 기록 / 방치 예약 복구 주기
+    hot_stock_reservation_timeout_seconds: int = 120   # 이 시간 지나도 주문이 없으면 예약 복구
+
+    outbox_relay_interval_seconds: float = 1       # outbox → Redis Streams 발행 주기
+    outbox_relay_batch_size: int = 500
+    outbox_relay_max_batches: int = 20
+    outbox_stream_maxlen: int = 100_000            # 스트림 길이 상한(XADD MAXLEN ~)
+    outbox_retention_hours: int = 24               # 발행된 outbox 행 보관 기간
+    outbox_purge_interval_seconds: int = 3600
+
+    job_queue_enabled: bool = False                # true: 감사 로그/purge 를 Redis 큐 + worker(python -m app.worker)로
+    job_worker_concurrency: int = 4
+    job_max_retries: int = 3
+    job_retry_backoff_seconds: float = 2           # 재시도 대기: backoff * 2^(시도-1), 최대 max
+    job_retry_backoff_max_seconds: float = 300
+    job_heartbeat_seconds: float = 10              # 실행 중인 작업의 heartbeat 갱신 주기
+    job_timeout_seconds: int = 300                 # heartbeat 가 이보다 오래 없으면 worker 죽은 것으로 보고 재실행
+    job_result_ttl_seconds: int = 86400            # 끝난 작업 상태/결과 보관
+
+    order_archive_after_months: int = 0            # N개월 지난 종료 주문을 아카이브(0: 끔), 조회 fallback 은 항상 동작
+    order_archive_batch_size: int = 500
+    order_archive_max_batches: int = 20
+    order_archive_interval_seconds: int = 3600
+
     class Config:  # .env 파일 로드 세팅
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -51,3 +51,7 @@ def raise_conflict(message: str = "리소스 충돌이 발생했습니다.", cod
 
 def raise_unprocessable(message: str = "처리할 수 없는 요청입니다.", code: Union[ErrorCode, str] = ErrorCode.UNPROCESSABLE_ENTITY, details: Optional[dict] = None) -> None:
     _raise(422, message, code, details)
+
+
+def raise_too_many_requests(message: str = "요청이 너무 많습니다. 잠시 후 다시 시도해주세요.", code: Union[ErrorCode, str] = ErrorCode.TOO_MANY_REQUESTS, details: Optional[dict] = None) -> None:
+    _raise(429, message, code, details)
@@ -0,0 +1,303 @@
+"""
+hot stock(한정판 등 주문이 몰리는 도서) 재고를 Redis 카운터로 관리
+- books.hot_stock = true 인 도서만 대상(관리자가 켜고 끔)
+- 재고는 N개 shard 키(stock:{book_id}:{i})에 나눠 저장, Lua 로 원자적 차감 → InnoDB 행 잠금 경합 없음
+- 차감한 예약은 pending 에 기록, 주문 커밋 후 confirm / 실패 시 release(재고 복구)
+- release / reconciler 는 pending 에서 ZREM 이 1 인 쪽(먼저 가져간 쪽)만 재고 복구 → 두 번 복구 안 함
+- reconciler(주기 작업)
+  1) 오래된 pending 예약: 가져온 뒤 주문(orders.stock_reservation_id)을 잠금 조회로 다시 확인, 없으면 재고 복구
+  2) shard 합계를 books.stock 에 기록(조회/관리용 값)
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.redis_client import get_redis
+from app.db.session import SessionLocal
+from app.models.book import Book
+from app.models.order import Order
+
+PENDING_KEY = "hotstock:pending"                 # ZSET token → 예약 시각
+
+# 남은 재고 중 최대 ARGV[1] 만큼 차감, 차감한 수량 반환(키 없으면 -1 = hot 모드 꺼짐)
+_TAKE_LUA = """
+local v = redis.call('GET', KEYS[1])
+if not v then return -1 end
+local take = math.min(tonumber(v), tonumber(ARGV[1]))
+if take > 0 then redis.call('DECRBY', KEYS[1], take) end
+return take
+"""
+
+# 키가 있을 때만 복구(없으면 -1 → DB 에 복구)
+_PUT_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+return redis.call('INCRBY', KEYS[1], ARGV[1])
+"""
+
+_take_script = None
+_put_script = None
+
+
+def _scripts():
+    global _take_script, _put_script
+    if _take_script is None:
+        r = get_redis()
+        _take_script = r.register_script(_TAKE_LUA)
+        _put_script = r.register_script(_PUT_LUA)
+    return _take_script, _put_script
+
+
+def _shard_key(book_id: int, shard: int) -> str:
+    return f"stock:{book_id}:{shard}"
+
+
+def _shards_key(book_id: int) -> str:
+    return f"stock:{book_id}:shards"
+
+
+def _reservation_key(token: str) -> str:
+    return f"hotstock:res:{token}"
+
+
+@dataclass
+class Reservation:
+    token: str
+    taken: list[tuple[int, int, int]] = field(default_factory=list)   # (book_id, shard, 수량)
+
+
+def _shard_count(book_id: int) -> int:
+    value = get_redis().get(_shards_key(book_id))
+    return int(value) if value else 0
+
+
+def _take(book_id: int, quantity: int, taken: list[tuple[int, int, int]]) -> Optional[bool]:
+    """
+    True: 차감 성공 / False: 재고 부족 / None: hot 모드 아님(DB 경로로)
+    임의 shard 부터 돌면서 필요한 만큼 가져옴(대부분 shard 하나로 끝남)
+    """
+    shards = _shard_count(book_id)
+    if shards <= 0:
+        return None
+    take, _ = _scripts()
+    start = random.randrange(shards)
+    remaining = quantity
+    for i in range(shards):
+        shard = (start + i) % shards
+        got = int(take(keys=[_shard_key(book_id, shard)], args=[remaining]))
+        if got < 0:
+            return None
+        if got:
+            taken.append((book_id, shard, got))
+            remaining -= got
+        if remaining == 0:
+            return True
+    return False
+
+
+def reserve(wanted: dict[int, int]) -> tuple[Reservation, list[int], list[int]]:
+    """
+    hot 도서 재고 차감 → (예약, 재고 부족 book_id, hot 모드가 아니었던 book_id)
+    부족한 도서가 있으면 이미 차감한 것도 전부 되돌림
+    """
+    reservation = Reservation(token=uuid.uuid4().hex)
+    short: list[int] = []
+    cold: list[int] = []
+    for book_id, quantity in wanted.items():
+        partial: list[tuple[int, int, int]] = []
+        ok = _take(book_id, quantity, partial)
+        reservation.taken.extend(partial)
+        if ok is None:
+            cold.append(book_id)
+        elif not ok:
+            short.append(book_id)
+
+    if short or cold:
+        # 부족 → 전부 되돌림 / hot 모드 꺼진 도서 → 가져온 만큼만 되돌리고 DB 경로로
+        keep = [] if short else [t for t in reservation.taken if t[0] not in cold]
+        _put_back([t for t in reservation.taken if t not in keep])
+        reservation.taken = keep
+    if short:
+        metrics.inc("hot_stock.sold_out")
+        return reservation, short, cold
+
+    if reservation.taken:
+        r = get_redis()
+        pipe = r.pipeline()
+        pipe.set(
+            _reservation_key(reservation.token),
+            json.dumps(reservation.taken),
+            ex=get_settings().hot_stock_reservation_timeout_seconds * 10,
+        )
+        pipe.zadd(PENDING_KEY, {reservation.token: time.time()})
+        try:
+            pipe.execute()
+        except Exception:
+            _put_back(reservation.taken)           # 예약 기록 실패 → 차감 취소
+            raise
+        metrics.inc("hot_stock.reserved")
+    return reservation, short, cold
+
+
+def confirm(reservation: Reservation) -> None:
+    # 주문 커밋 완료 → pending 기록 삭제
+    if not reservation.taken:
+        return
+    r = get_redis()
+    r.zrem(PENDING_KEY, reservation.token)
+    r.delete(_reservation_key(reservation.token))
+
+
+def _claim(token: str) -> bool:
+    # pending 에서 예약 가져가기, 동시에 여러 곳이 시도해도 True 는 한 곳만
+    return get_redis().zrem(PENDING_KEY, token) == 1
+
+
+def release(reservation: Reservation) -> None:
+    # 주문 실패 → 차감한 재고 복구(reconciler 가 먼저 가져갔으면 아무것도 안 함)
+    if not reservation.taken:
+        return
+    taken, reservation.taken = reservation.taken, []
+    if not _claim(reservation.token):
+        return
+    _put_back(taken)
+    get_redis().delete(_reservation_key(reservation.token))
+    metrics.inc("hot_stock.released")
+
+
+def _put_back(taken: list[tuple[int, int, int]]) -> None:
+    _, put = _scripts()
+    for book_id, shard, quantity in taken:
+        if int(put(keys=[_shard_key(book_id, shard)], args=[quantity])) < 0:
+            restore_db_stock(book_id, quantity)   # 그 사이 hot 모드 해제 → DB 재고로
+
+
+def restore_db_stock(book_id: int, quantity: int) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(update(Book).where(Book.id == book_id).values(stock=Book.stock + quantity))
+        db.commit()
+    finally:
+        db.close()
+
+
+def restore(book_id: int, quantity: int) -> bool:
+    """주문 취소 등으로 hot 도서 재고 되돌리기, hot 모드가 아니면 False"""
+    shards = _shard_count(book_id)
+    if shards <= 0:
+        return False
+    _, put = _scripts()
+    return int(put(keys=[_shard_key(book_id, random.randrange(shards))], args=[quantity])) >= 0
+
+
+def available(book_id: int) -> Optional[int]:
+    shards = _shard_count(book_id)
+    if shards <= 0:
+        return None
+    values = get_redis().mget([_shard_key(book_id, i) for i in range(shards)])
+    return sum(int(v or 0) for v in values)
+
+
+def enable(db: Session, book_id: int, shards: int) -> int:
+    """DB 재고를 shard 에 나눠 Redis 로 옮기고 hot 모드 켬, 옮긴 재고 반환"""
+    book = db.query(Book).filter(Book.id == book_id).with_for_update().first()  # 진행 중 DB 차감 끝날 때까지 대기
+    if book is None:
+        return -1
+    if book.hot_stock:
+        db.rollback()
+        return available(book_id) or 0
+
+    stock = int(book.stock or 0)
+    r = get_redis()
+    pipe = r.pipeline()
+    for i in range(shards):
+        pipe.set(_shard_key(book_id, i), stock // shards + (1 if i < stock % shards else 0))
+    pipe.set(_shards_key(book_id), shards)
+    pipe.execute()
+
+    book.hot_stock = True
+    db.commit()
+    return stock
+
+
+def disable(db: Session, book_id: int) -> int:
+    """Redis 재고 합계를 DB 로 되돌리고 hot 모드 끔, 최종 재고 반환"""
+    book = db.query(Book).filter(Book.id == book_id).with_for_update().first()
+    if book is None:
+        return -1
+    shards = _shard_count(book_id)
+    if not book.hot_stock or shards <= 0:
+        book.hot_stock = False
+        db.commit()
+        return int(book.stock or 0)
+
+    r = get_redis()
+    r.delete(_shards_key(book_id))                 # 새 예약은 이제 DB 경로(진행 중 복구는 DB 로)
+    keys = [_shard_key(book_id, i) for i in range(shards)]
+    pipe = r.pipeline()
+    for key in keys:
+        pipe.getdel(key)
+    stock = sum(int(v or 0) for v in pipe.execute())
+
+    book.stock = stock
+    book.hot_stock = False
+    db.commit()
+    return stock
+
+
+def reconcile() -> None:
+    """주기 작업: 방치된 예약 복구 + Redis 재고를 books.stock 에 기록"""
+    settings = get_settings()
+    r = get_redis()
+    cutoff = time.time() - settings.hot_stock_reservation_timeout_seconds
+    db = SessionLocal()
+    try:
+        stale = r.zrangebyscore(PENDING_KEY, 0, cutoff, start=0, num=500)
+        if stale:
+            committed = set(
+                db.execute(
+                    select(Order.stock_reservation_id).where(Order.stock_reservation_id.in_(stale))
+                ).scalars()
+            )
+            for token in stale:
+                if token in committed:
+                    r.zrem(PENDING_KEY, token)       # 주문 커밋 후 confirm 전에 죽은 경우
+                    r.delete(_reservation_key(token))
+                    continue
+                if not _claim(token):
+                    continue                         # 다른 프로세스/요청이 먼저 처리
+                # 가져온 뒤 다시 확인: 잠금 조회라 커밋 전인 주문 INSERT(예약 직후 flush)가 있으면 끝날 때까지 기다림
+                ordered = db.execute(
+                    select(Order.id).where(Order.stock_reservation_id == token).with_for_update()
+                ).first()
+                raw = r.get(_reservation_key(token))
+                r.delete(_reservation_key(token))
+                if ordered is None and raw:
+                    _put_back([tuple(t) for t in json.loads(raw)])   # 주문이 안 만들어졌음 → 재고 복구
+                    metrics.inc("hot_stock.orphan_released")
+                db.commit()                          # 잠금 해제
+
+        hot_ids = db.execute(select(Book.id).where(Book.hot_stock.is_(True))).scalars().all()
+        for book_id in hot_ids:
+            stock = available(book_id)
+            if stock is None:
+                continue
+            db.execute(
+                update(Book)
+                .where(Book.id == book_id, Book.hot_stock.is_(True))
+                .values(stock=stock)
+            )
+            metrics.set_gauge(f"hot_stock.book{book_id}", stock)
+        db.commit()
+    finally:
+        db.close()
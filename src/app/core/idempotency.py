@@ -0,0 +1,233 @@
+"""
+Idempotency-Key 처리(POST 재시도 중복 실행 방지)
+- 키 범위: (로그인 사용자, Idempotency-Key 헤더)
+- Redis SET NX 로 "처리 중" 선점 → 같은 키로 동시에 들어온 요청은 첫 요청 결과를 기다렸다가 그대로 받음
+- 완료 응답은 Redis(TTL) + DB idempotency_keys(unique) 에 저장, Redis 에 없으면 DB 에서 복구
+- 같은 키에 다른 요청(method/path/body 다름)이면 422
+- 5xx 응답은 저장하지 않음(재시도 시 다시 실행)
+main 미들웨어에서 사용, 라우터 코드는 수정할 필요 없음
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.errors import ApiException, raise_conflict, raise_unprocessable
+from app.core.redis_client import get_async_redis
+from app.core.security import decode_token
+from app.db.session import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+PENDING = "pending"
+POLL_SECONDS = 0.1
+
+
+@dataclass
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: str
+    content_type: Optional[str] = None
+
+
+def request_hash(method: str, path: str, query: str, body: bytes) -> str:
+    h = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query.encode(), body):
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _redis_key(user_id: int, key: str) -> str:
+    return f"idem:{user_id}:{key}"
+
+
+def _load_from_db(user_id: int, key: str) -> Optional[StoredResponse]:
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(IdempotencyKey)
+            .filter(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.idem_key == key,
+                IdempotencyKey.expires_at > datetime.now(timezone.utc),
+            )
+            .first()
+        )
+        if row is None:
+            return None
+        return StoredResponse(
+            request_hash=row.request_hash,
+            status_code=row.status_code,
+            body=row.response_body,
+            content_type=row.content_type,
+        )
+    finally:
+        db.close()
+
+
+def _save_to_db(user_id: int, key: str, method: str, path: str, stored: StoredResponse) -> None:
+    ttl = get_settings().idempotency_ttl_seconds
+    db = SessionLocal()
+    try:
+        db.add(
+            IdempotencyKey(
+                user_id=user_id,
+                idem_key=key,
+                request_hash=stored.request_hash,
+                method=method,
+                path=path,
+                status_code=stored.status_code,
+                content_type=stored.content_type,
+                response_body=stored.body,
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+            )
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()                              # 이미 저장됨(Redis 유실 후 재실행된 경우 등)
+    finally:
+        db.close()
+
+
+def _check_hash(stored_hash: Optional[str], req_hash: str) -> None:
+    if stored_hash != req_hash:
+        raise_unprocessable(
+            "같은 Idempotency-Key 로 다른 요청을 보낼 수 없습니다.",
+            "UNPROCESSABLE_ENTITY",
+        )
+
+
+def user_scope(request: Request) -> Optional[int]:
+    """access token 의 사용자 id(키 범위), 토큰 없거나 무효면 None → 멱등 처리 안 함(라우터가 401)"""
+    auth = request.headers.get("Authorization", "")
+    token = auth[7:] if auth.lower().startswith("bearer ") else (
+        request.cookies.get("accessToken") or request.cookies.get("access_token")
+    )
+    if not token:
+        return None
+    try:
+        payload = decode_token(token)
+    except ApiException:
+        return None
+    if payload.get("type") != "access" or not str(payload.get("sub") or "").isdigit():
+        return None
+    return int(payload["sub"])
+
+
+async def begin(user_id: int, key: str, req_hash: str) -> Optional[StoredResponse]:
+    """
+    None: 이 요청이 키를 선점 → 실행 후 complete()/abort() 호출
+    StoredResponse: 이미 처리된 요청 → 저장된 응답 재전송
+    """
+    settings = get_settings()
+    r = get_async_redis()
+    rkey = _redis_key(user_id, key)
+    pending = json.dumps({"state": PENDING, "hash": req_hash})
+    deadline = time.monotonic() + settings.idempotency_wait_seconds
+
+    while True:
+        if await r.set(rkey, pending, nx=True, ex=settings.idempotency_pending_seconds):
+            stored = await run_in_threadpool(_load_from_db, user_id, key)  # Redis TTL 지난 재시도
+            if stored is None:
+                return None
+            await r.set(rkey, json.dumps(asdict(stored)), ex=settings.idempotency_ttl_seconds)
+            _check_hash(stored.request_hash, req_hash)
+            metrics.inc("idempotency.replayed")
+            return stored
+
+        raw = await r.get(rkey)
+        if raw is None:
+            continue                               # 그 사이 만료/삭제 → 다시 선점 시도
+        entry = json.loads(raw)
+        if entry.get("state") == PENDING:
+            _check_hash(entry.get("hash"), req_hash)
+            if time.monotonic() >= deadline:
+                metrics.inc("idempotency.wait_timeouts")
+                raise_conflict("같은 Idempotency-Key 요청이 처리 중입니다.", "STATE_CONFLICT")
+            await asyncio.sleep(POLL_SECONDS)      # 첫 요청 끝날 때까지 대기
+            continue
+
+        stored = StoredResponse(**entry)
+        _check_hash(stored.request_hash, req_hash)
+        metrics.inc("idempotency.replayed")
+        return stored
+
+
+async def complete(
+    user_id: int,
+    key: str,
+    method: str,
+    path: str,
+    req_hash: str,
+    status_code: int,
+    body: bytes,
+    content_type: Optional[str],
+) -> None:
+    if status_code >= 500:
+        await abort(user_id, key)
+        return
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        await abort(user_id, key)                  # JSON 이 아닌 응답은 저장 안 함
+        return
+
+    stored = StoredResponse(req_hash, status_code, text, content_type)
+    ttl = get_settings().idempotency_ttl_seconds
+    await get_async_redis().set(_redis_key(user_id, key), json.dumps(asdict(stored)), ex=ttl)
+    try:
+        await run_in_threadpool(_save_to_db, user_id, key, method, path, stored)
+    except Exception as exc:                       # DB 저장 실패해도 응답은 그대로(Redis 에는 있음)
+        print(f"[IDEMPOTENCY] db save failed: {exc!r}")
+    metrics.inc("idempotency.stored")
+
+
+async def abort(user_id: int, key: str) -> None:
+    # 처리 중 표시 해제 → 재시도 시 다시 실행
+    await get_async_redis().delete(_redis_key(user_id, key))
+
+
+def purge_expired_idempotency_keys(batch_size: int = 1000, max_batches: int = 100) -> int:
+    """만료된 idempotency_keys 배치 삭제(스케줄러)"""
+    now = datetime.now(timezone.utc)
+    purged = 0
+    db = SessionLocal()
+    try:
+        for _ in range(max_batches):
+            ids = [
+                row.id
+                for row in db.query(IdempotencyKey.id)
+                .filter(IdempotencyKey.expires_at < now)
+                .order_by(IdempotencyKey.expires_at)
+                .limit(batch_size)
+                .all()
+            ]
+            if not ids:
+                break
+            purged += (
+                db.query(IdempotencyKey)
+                .filter(IdempotencyKey.id.in_(ids))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            if len(ids) < batch_size:
+                break
+    finally:
+        db.close()
+    metrics.inc("idempotency.purged", purged)
+    return purged
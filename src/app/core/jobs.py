@@ -0,0 +1,314 @@
+"""
+Redis 기반 백그라운드 작업 큐
+- @job 으로 등록한 함수는 .delay(...) 로 큐에 넣고 바로 반환(job id), 실행은 worker(python -m app.worker)
+- 큐: jobs:queue:{queue} (LIST) → worker 가 BLMOVE 로 jobs:processing:{queue} 에 옮겨 실행
+  실행 중에는 JOB_HEARTBEAT_SECONDS 마다 heartbeat_at 갱신, heartbeat 가 JOB_TIMEOUT_SECONDS 동안 끊긴 작업만
+  (worker 가 죽은 것으로 보고) 다시 큐로(at-least-once) → 오래 걸리는 작업이 동시에 두 번 돌지 않음
+- 실패 시 지수 백오프로 재시도(jobs:delayed ZSET, 시각이 되면 큐로), 재시도 소진 시 failed
+- 상태/결과: job:{id} HASH(status, attempts, result, error), 끝난 뒤 JOB_RESULT_TTL_SECONDS 동안 보관
+- 주기 작업: schedule() 로 등록, worker 가 여러 개여도 interval 마다 한 번만 enqueue(SET NX)
+인자/결과는 JSON(datetime 은 변환해서 전달)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.redis_client import get_redis
+
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+DELAYED_KEY = "jobs:delayed"                     # ZSET job id → 실행 시각(재시도 대기)
+
+# 실행 시각이 된 재시도 작업을 원래 큐로 이동
+_PROMOTE_LUA = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, id in ipairs(ids) do
+  redis.call('ZREM', KEYS[1], id)
+  local queue = redis.call('HGET', 'job:' .. id, 'queue')
+  if queue then
+    redis.call('HSET', 'job:' .. id, 'status', 'queued')
+    redis.call('LPUSH', 'jobs:queue:' .. queue, id)
+  end
+end
+return #ids
+"""
+
+_promote_script = None
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def queue_key(queue: str) -> str:
+    return f"jobs:queue:{queue}"
+
+
+def processing_key(queue: str) -> str:
+    return f"jobs:processing:{queue}"
+
+
+def _encode(value: Any) -> str:
+    def default(obj):
+        if isinstance(obj, datetime):
+            return {"__datetime__": obj.isoformat()}
+        return str(obj)
+    return json.dumps(value, ensure_ascii=False, default=default)
+
+
+def _decode(raw: Optional[str]) -> Any:
+    def hook(obj):
+        if set(obj) == {"__datetime__"}:
+            return datetime.fromisoformat(obj["__datetime__"])
+        return obj
+    return json.loads(raw, object_hook=hook) if raw else None
+
+
+@dataclass
+class Job:
+    name: str
+    fn: Callable[..., Any]
+    queue: str = "default"
+    retries: Optional[int] = None                # None: 설정값(JOB_MAX_RETRIES)
+
+    def __call__(self, *args, **kwargs):
+        return self.fn(*args, **kwargs)          # 직접 호출은 그대로 실행
+
+    def delay(self, *args, **kwargs) -> str:
+        return enqueue(self.name, args, kwargs, queue=self.queue)
+
+    @property
+    def max_retries(self) -> int:
+        return get_settings().job_max_retries if self.retries is None else self.retries
+
+
+_registry: dict[str, Job] = {}
+
+
+def job(name: str | Callable[..., Any] | None = None, queue: str = "default", retries: Optional[int] = None):
+    """@job / @job("name", queue=..., retries=...) 로 작업 등록"""
+    def register(fn: Callable[..., Any]) -> Job:
+        job_name = name if isinstance(name, str) else f"{fn.__module__}.{fn.__name__}"
+        registered = Job(name=job_name, fn=fn, queue=queue, retries=retries)
+        _registry[job_name] = registered
+        return registered
+
+    if callable(name):
+        return register(name)
+    return register
+
+
+def enqueue(name: str, args: tuple = (), kwargs: dict | None = None, queue: str = "default") -> str:
+    job_id = uuid.uuid4().hex
+    pipe = get_redis().pipeline()
+    pipe.hset(
+        _job_key(job_id),
+        mapping={
+            "name": name,
+            "queue": queue,
+            "args": _encode(list(args)),
+            "kwargs": _encode(kwargs or {}),
+            "status": QUEUED,
+            "attempts": 0,
+            "enqueued_at": time.time(),
+        },
+    )
+    pipe.lpush(queue_key(queue), job_id)
+    pipe.execute()
+    metrics.inc("jobs.enqueued")
+    return job_id
+
+
+def get_status(job_id: str) -> Optional[dict]:
+    data = get_redis().hgetall(_job_key(job_id))
+    if not data:
+        return None
+    return {
+        "jobId": job_id,
+        "name": data.get("name"),
+        "queue": data.get("queue"),
+        "status": data.get("status"),
+        "attempts": int(data.get("attempts") or 0),
+        "result": _decode(data.get("result")),
+        "error": data.get("error"),
+        "enqueuedAt": _timestamp(data.get("enqueued_at")),
+        "startedAt": _timestamp(data.get("started_at")),
+        "finishedAt": _timestamp(data.get("finished_at")),
+    }
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    return float(value) if value else None
+
+
+def queue_stats(queues: list[str]) -> dict:
+    r = get_redis()
+    pipe = r.pipeline(transaction=False)
+    for queue in queues:
+        pipe.llen(queue_key(queue))
+        pipe.llen(processing_key(queue))
+    pipe.zcard(DELAYED_KEY)
+    values = pipe.execute()
+    return {
+        "queues": {
+            queue: {"queued": values[i * 2], "processing": values[i * 2 + 1]}
+            for i, queue in enumerate(queues)
+        },
+        "delayed": values[-1],
+    }
+
+
+def _retry_delay(attempts: int) -> float:
+    settings = get_settings()
+    return min(settings.job_retry_backoff_seconds * 2 ** (attempts - 1), settings.job_retry_backoff_max_seconds)
+
+
+def claim(queue: str, timeout: float) -> Optional[str]:
+    # 큐 → processing 이동(원자적), 없으면 timeout 동안 대기
+    return get_redis().blmove(queue_key(queue), processing_key(queue), timeout, "RIGHT", "LEFT")
+
+
+@contextmanager
+def _heartbeat(key: str) -> Iterator[None]:
+    # 작업이 도는 동안 별도 스레드에서 heartbeat_at 갱신(requeue_stale 기준)
+    stop = threading.Event()
+    interval = get_settings().job_heartbeat_seconds
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            try:
+                get_redis().hset(key, "heartbeat_at", time.time())
+            except Exception:
+                traceback.print_exc()           # Redis 일시 장애 → 다음 주기에 다시
+
+    t = threading.Thread(target=beat, name="job-heartbeat", daemon=True)
+    t.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        t.join()
+
+
+def execute(job_id: str, queue: str) -> None:
+    """claim() 으로 가져온 작업 실행 + 상태 기록"""
+    settings = get_settings()
+    r = get_redis()
+    key = _job_key(job_id)
+    data = r.hgetall(key)
+    if not data:
+        r.lrem(processing_key(queue), 1, job_id)  # 결과 TTL 지나 사라진 작업
+        return
+
+    attempts = int(data.get("attempts") or 0) + 1
+    now = time.time()
+    r.hset(key, mapping={"status": RUNNING, "attempts": attempts, "started_at": now, "heartbeat_at": now})
+    registered = _registry.get(data["name"])
+    started = time.perf_counter()
+    try:
+        if registered is None:
+            raise LookupError(f"등록되지 않은 작업: {data['name']}")
+        with _heartbeat(key):
+            result = registered.fn(*_decode(data.get("args")), **_decode(data.get("kwargs")))
+    except Exception as exc:
+        traceback.print_exc()
+        error = f"{type(exc).__name__}: {exc}"[:1000]
+        pipe = r.pipeline()
+        if registered is not None and attempts <= registered.max_retries:
+            pipe.hset(key, mapping={"status": RETRYING, "error": error})
+            pipe.hdel(key, "started_at", "heartbeat_at")
+            pipe.zadd(DELAYED_KEY, {job_id: time.time() + _retry_delay(attempts)})
+            metrics.inc("jobs.retried")
+        else:
+            pipe.hset(key, mapping={"status": FAILED, "error": error, "finished_at": time.time()})
+            pipe.expire(key, settings.job_result_ttl_seconds)
+            metrics.inc("jobs.failed")
+        pipe.lrem(processing_key(queue), 1, job_id)
+        pipe.execute()
+        return
+
+    pipe = r.pipeline()
+    pipe.hset(key, mapping={"status": SUCCEEDED, "result": _encode(result), "finished_at": time.time()})
+    pipe.hdel(key, "error")
+    pipe.expire(key, settings.job_result_ttl_seconds)
+    pipe.lrem(processing_key(queue), 1, job_id)
+    pipe.execute()
+    metrics.inc("jobs.succeeded")
+    metrics.inc("jobs.run_ms_total", (time.perf_counter() - started) * 1000)
+
+
+def promote_delayed() -> int:
+    global _promote_script
+    if _promote_script is None:
+        _promote_script = get_redis().register_script(_PROMOTE_LUA)
+    return int(_promote_script(keys=[DELAYED_KEY], args=[time.time()]))
+
+
+def requeue_stale(queues: list[str]) -> int:
+    """worker 가 죽어 processing 에 남은 작업(heartbeat 가 JOB_TIMEOUT_SECONDS 동안 없음)을 다시 큐로"""
+    r = get_redis()
+    cutoff = time.time() - get_settings().job_timeout_seconds
+    requeued = 0
+    for queue in queues:
+        for job_id in r.lrange(processing_key(queue), 0, -1):
+            key = _job_key(job_id)
+            heartbeat_at, started_at = r.hmget(key, "heartbeat_at", "started_at")
+            last_seen = heartbeat_at or started_at
+            if last_seen is None:
+                r.hsetnx(key, "started_at", time.time())   # claim 직후 죽은 경우 → 이번부터 시간 잼
+                continue
+            if float(last_seen) > cutoff:
+                continue
+            if r.lrem(processing_key(queue), 1, job_id):
+                pipe = r.pipeline()
+                pipe.hset(key, "status", QUEUED)
+                pipe.hdel(key, "started_at", "heartbeat_at")
+                pipe.lpush(queue_key(queue), job_id)
+                pipe.execute()
+                requeued += 1
+    if requeued:
+        metrics.inc("jobs.requeued", requeued)
+    return requeued
+
+
+@dataclass
+class Schedule:
+    name: str
+    interval_seconds: float
+    job: Job
+
+
+_schedules: dict[str, Schedule] = {}
+
+
+def schedule(name: str, interval_seconds: float, target: Job) -> None:
+    # interval <= 0 이면 비활성(scheduler.register_periodic 과 같은 규칙)
+    if interval_seconds <= 0:
+        return
+    _schedules[name] = Schedule(name=name, interval_seconds=interval_seconds, job=target)
+
+
+def fire_schedules() -> int:
+    """interval 이 지난 주기 작업 enqueue(여러 worker 중 SET NX 성공한 한 곳만)"""
+    r = get_redis()
+    fired = 0
+    for entry in _schedules.values():
+        if r.set(f"jobs:schedule:{entry.name}", "1", nx=True, px=int(entry.interval_seconds * 1000)):
+            entry.job.delay()
+            fired += 1
+    return fired
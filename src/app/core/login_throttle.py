@@ -0,0 +1,111 @@
+"""
+로그인 시도 제한(계정/IP 단위)
+- 실패는 sliding window(ZSET)로 세고, 한도를 넘으면 지수적으로 늘어나는 잠금 설정
+- 잠금 확인은 Lua 한 번(유저 조회/bcrypt 전에 호출) → 공격 트래픽이 CPU를 못 쓰게
+- 성공하면 계정 실패 기록 초기화
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+
+from app.core.config import get_settings
+from app.core.redis_client import get_redis
+
+# KEYS = 잠금 키 목록, 남은 잠금 시간(ms) 중 최댓값 반환(없으면 0)
+_CHECK_LUA = """
+local wait = 0
+for i = 1, #KEYS do
+  local ttl = redis.call('PTTL', KEYS[i])
+  if ttl > wait then wait = ttl end
+end
+return wait
+"""
+
+# KEYS = [fail, lock, strike] * n
+# ARGV = now_ms, member, window_ms, strike_ttl_ms, base_ms, max_ms, limit_1, ..., limit_n
+_FAIL_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[3])
+local strike_ttl = tonumber(ARGV[4])
+local base = tonumber(ARGV[5])
+local max_lock = tonumber(ARGV[6])
+local locked = 0
+for i = 0, (#KEYS / 3) - 1 do
+  local fail, lock, strike = KEYS[i*3+1], KEYS[i*3+2], KEYS[i*3+3]
+  local limit = tonumber(ARGV[7+i])
+  redis.call('ZADD', fail, now, ARGV[2])
+  redis.call('ZREMRANGEBYSCORE', fail, 0, now - window)
+  redis.call('PEXPIRE', fail, window)
+  if redis.call('ZCARD', fail) >= limit then
+    local strikes = redis.call('INCR', strike)
+    redis.call('PEXPIRE', strike, strike_ttl)
+    local ms = math.min(base * (2 ^ (strikes - 1)), max_lock)
+    redis.call('SET', lock, '1', 'PX', math.floor(ms))
+    redis.call('DEL', fail)
+    if ms > locked then locked = ms end
+  end
+end
+return math.floor(locked)
+"""
+
+_check_script = None
+_fail_script = None
+
+
+def _scripts():
+    global _check_script, _fail_script
+    if _check_script is None:
+        r = get_redis()
+        _check_script = r.register_script(_CHECK_LUA)
+        _fail_script = r.register_script(_FAIL_LUA)
+    return _check_script, _fail_script
+
+
+def _keys(kind: str, value: str) -> tuple[str, str, str]:
+    return (f"lt:fail:{kind}:{value}", f"lt:lock:{kind}:{value}", f"lt:strike:{kind}:{value}")
+
+
+def check_login_allowed(email: str, ip: str) -> int:
+    """잠금 상태면 남은 초, 아니면 0"""
+    settings = get_settings()
+    if not settings.login_throttle_enabled:
+        return 0
+
+    check, _ = _scripts()
+    wait_ms = int(check(keys=[_keys("email", email.lower())[1], _keys("ip", ip)[1]]))
+    return (wait_ms + 999) // 1000
+
+
+def record_login_failure(email: str, ip: str) -> int:
+    """실패 기록, 이번 실패로 잠금이 걸리면 잠금 초 반환"""
+    settings = get_settings()
+    if not settings.login_throttle_enabled:
+        return 0
+
+    _, fail = _scripts()
+    keys = [*_keys("email", email.lower()), *_keys("ip", ip)]
+    locked_ms = fail(
+        keys=keys,
+        args=[
+            int(time.time() * 1000),
+            uuid.uuid4().hex,                             # 같은 ms 실패도 각각 카운트
+            settings.login_throttle_window_seconds * 1000,
+            settings.login_lockout_max_seconds * 1000 * 2,  # strike 유지 기간
+            settings.login_lockout_base_seconds * 1000,
+            settings.login_lockout_max_seconds * 1000,
+            settings.login_throttle_max_failures_email,
+            settings.login_throttle_max_failures_ip,
+        ],
+    )
+    return (int(locked_ms) + 999) // 1000
+
+
+def reset_login_failures(email: str) -> None:
+    # 로그인 성공 시 계정 기준 기록만 초기화(IP 기록은 유지)
+    settings = get_settings()
+    if not settings.login_throttle_enabled:
+        return
+    fail_key, _, strike_key = _keys("email", email.lower())
+    get_redis().delete(fail_key, strike_key)
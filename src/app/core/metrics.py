@@ -0,0 +1,44 @@
+"""
+프로세스 내부 지표(counter / gauge)
+외부 모니터링 의존성 없이 /api/admin/metrics 에서 조회
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+_lock = threading.Lock()
+_counters: dict[str, float] = {}
+_gauges: dict[str, float] = {}
+_collectors: dict[str, Callable[[], dict[str, float]]] = {}
+
+
+def inc(name: str, value: float = 1) -> None:  # 누적 카운터 증가
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def set_gauge(name: str, value: float) -> None:  # 현재값 기록
+    with _lock:
+        _gauges[name] = value
+
+
+def register_collector(name: str, fn: Callable[[], dict[str, float]]) -> None:
+    # 조회 시점에 값을 계산하는 gauge 묶음(예: 커넥션 풀 상태)
+    with _lock:
+        _collectors[name] = fn
+
+
+def snapshot() -> dict[str, dict[str, float]]:
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        collectors = list(_collectors.values())
+
+    for fn in collectors:
+        try:
+            gauges.update(fn())
+        except Exception:
+            pass                                  # 지표 수집 실패가 조회를 막지 않도록
+    return {"counters": counters, "gauges": gauges}
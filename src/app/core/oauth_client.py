@@ -0,0 +1,263 @@
+"""
+소셜 로그인(OAuth) 외부 호출
+공용 비동기 HTTP 클라이언트(커넥션 풀 + keep-alive + 짧은 connect/read timeout)
+재시도(지수 backoff + jitter), provider 별 circuit breaker
+provider 추상화: OAuthProvider 상속해서 등록하면 다른 소셜 로그인도 추가 가능
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from app.core import metrics
+
+
+class OAuthError(Exception):
+    """provider 호출 실패(라우터에서 401로 변환)"""
+
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    # 프로세스당 하나만 만들어서 커넥션 풀 재사용
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=1.0, read=3.0, write=3.0, pool=1.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class CircuitBreaker:
+    """
+    연속 실패 threshold 회 이상이면 reset_seconds 동안 호출 차단
+    이후 half-open: 시험 호출 1개만 통과, 결과가 나올 때까지 나머지는 계속 차단
+    (시험 호출이 결과 없이 사라지면 reset_seconds 뒤 다시 1개 허용)
+    """
+
+    def __init__(self, name: str, threshold: int = 5, reset_seconds: float = 30.0) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe_started_at: float | None = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_seconds:
+            return False
+        if self.probe_started_at is not None and now - self.probe_started_at < self.reset_seconds:
+            return False                          # 시험 호출 진행 중
+        self.probe_started_at = now               # half-open: 이 호출만 시험 호출로 허용
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probe_started_at = None
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                metrics.inc(f"oauth.{self.name}.circuit_open")
+            self.opened_at = time.monotonic()
+
+
+async def request_with_retry(
+    method: str,
+    url: str,
+    breaker: CircuitBreaker,
+    retries: int = 2,
+    backoff_seconds: float = 0.2,
+    client: Optional[httpx.AsyncClient] = None,
+    **kwargs,
+) -> httpx.Response:
+    """네트워크 오류/5xx 만 재시도, 4xx는 그대로 반환(breaker 에는 재시도까지 다 실패해야 실패 1번)"""
+    client = client or get_http_client()
+    if not breaker.allow():
+        raise OAuthError(f"{breaker.name} 호출이 일시적으로 차단되었습니다.")
+
+    for attempt in range(retries + 1):
+        try:
+            res = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            res = None
+
+        if res is not None and res.status_code < 500:
+            breaker.record_success()
+            return res
+
+        metrics.inc(f"oauth.{breaker.name}.failures")
+        if attempt < retries:
+            # full jitter: 0 ~ base * 2^attempt
+            await asyncio.sleep(random.uniform(0, backoff_seconds * (2 ** attempt)))
+
+    breaker.record_failure()
+    raise OAuthError(f"{breaker.name} 호출 실패")
+
+
+def json_body(res: httpx.Response, message: str) -> dict:
+    # 200 인데 JSON 이 아니거나 객체가 아닌 응답도 provider 오류로(500 으로 새지 않게)
+    try:
+        body = res.json()
+    except ValueError:
+        raise OAuthError(message) from None
+    if not isinstance(body, dict):
+        raise OAuthError(message)
+    return body
+
+
+@dataclass
+class OAuthProfile:
+    provider: str
+    provider_id: str
+    email: Optional[str]
+    name: str
+
+
+class OAuthProvider(ABC):
+    """소셜 로그인 provider 인터페이스(메서드를 빠뜨리면 생성 시점에 TypeError)"""
+
+    name: str = ""
+
+    def __init__(self) -> None:
+        self.breaker = CircuitBreaker(self.name.lower())
+
+    @abstractmethod
+    def is_configured(self) -> bool:
+        ...
+
+    @abstractmethod
+    def authorize_url(self, state: str) -> str:
+        ...
+
+    @abstractmethod
+    async def exchange_code(self, code: str, state: str) -> str:
+        """code -> provider access token"""
+
+    @abstractmethod
+    async def fetch_profile(self, access_token: str) -> OAuthProfile:
+        ...
+
+
+class NaverProvider(OAuthProvider):
+    name = "NAVER"
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+        auth_url: str = "https://nid.naver.com/oauth2.0/authorize",
+        token_url: str = "https://nid.naver.com/oauth2.0/token",
+        profile_url: str = "https://openapi.naver.com/v1/nid/me",
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        super().__init__()
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.auth_url = auth_url
+        self.token_url = token_url
+        self.profile_url = profile_url
+        self.client = client
+
+    def is_configured(self) -> bool:
+        return bool(self.client_id and self.client_secret and self.redirect_uri)
+
+    def authorize_url(self, state: str) -> str:
+        query = urlencode(
+            {
+                "response_type": "code",
+                "client_id": self.client_id,
+                "redirect_uri": self.redirect_uri,
+                "state": state,
+            }
+        )
+        return f"{self.auth_url}?{query}"
+
+    async def exchange_code(self, code: str, state: str) -> str:
+        res = await request_with_retry(
+            "GET",
+            self.token_url,
+            self.breaker,
+            client=self.client,
+            params={
+                "grant_type": "authorization_code",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": code,
+                "state": state,
+            },
+        )
+        if res.status_code != 200:
+            raise OAuthError("네이버 토큰 발급 실패")
+
+        access_token = json_body(res, "네이버 토큰 발급 실패").get("access_token")
+        if not access_token:
+            raise OAuthError("네이버 토큰 발급 실패")
+        return access_token
+
+    async def fetch_profile(self, access_token: str) -> OAuthProfile:
+        res = await request_with_retry(
+            "GET",
+            self.profile_url,
+            self.breaker,
+            client=self.client,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        if res.status_code != 200:
+            raise OAuthError("네이버 프로필 조회 실패")
+
+        info = json_body(res, "네이버 프로필 조회 실패").get("response") or {}
+        provider_id = info.get("id")              # 네이버 고유 ID (핵심)
+        if not provider_id:
+            raise OAuthError("네이버 프로필 id가 없습니다.")
+
+        return OAuthProfile(
+            provider=self.name,
+            provider_id=str(provider_id),
+            email=info.get("email"),              # 없을 수 있음
+            name=info.get("name") or info.get("nickname") or "NAVER_USER",
+        )
+
+
+_providers: dict[str, OAuthProvider] = {}
+
+
+def get_provider(name: str) -> OAuthProvider:
+    # provider 는 env 기준으로 한 번만 생성(breaker 상태 유지)
+    key = name.upper()
+    if key not in _providers:
+        if key == "NAVER":
+            _providers[key] = NaverProvider(
+                client_id=os.getenv("NAVER_CLIENT_ID", ""),
+                client_secret=os.getenv("NAVER_CLIENT_SECRET", ""),
+                redirect_uri=os.getenv("NAVER_REDIRECT_URI", ""),  # 예: http://113.198.66.68:10099/api/auth/naver/callback
+            )
+        else:
+            raise OAuthError(f"지원하지 않는 provider: {name}")
+    return _providers[key]
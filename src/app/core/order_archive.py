@@ -0,0 +1,159 @@
+"""
+주문 콜드 아카이브
+- archive_orders()(주기 작업): ORDER_ARCHIVE_AFTER_MONTHS 보다 오래된 종료 상태(DELIVERED/CANCELLED) 주문을
+  배치 단위로 order_archives(사용자-월 압축 JSON) + archived_orders(헤더)로 옮기고 orders/order_items 에서 삭제
+- 읽기: 내 주문 목록/상세가 hot 테이블에 없으면 여기서 조회(routes/orders)
+배치마다 commit → 잠금 짧게, 여러 프로세스가 돌아도 SKIP LOCKED 로 같은 주문을 중복 처리하지 않음
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.order_status import TERMINAL_STATUSES
+from app.db.session import SessionLocal
+from app.models.order import Order, OrderItem
+from app.models.order_archive import ArchivedOrder, OrderArchive
+
+
+def period_of(created_at: datetime) -> str:
+    return created_at.strftime("%Y-%m")
+
+
+def _months_ago(now: datetime, months: int) -> datetime:
+    month_index = now.year * 12 + (now.month - 1) - months
+    return now.replace(year=month_index // 12, month=month_index % 12 + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _pack(orders: list[dict[str, Any]]) -> bytes:
+    return zlib.compress(json.dumps(orders, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+def _unpack(payload: bytes) -> list[dict[str, Any]]:
+    return json.loads(zlib.decompress(payload))
+
+
+def _order_dict(order: Order) -> dict[str, Any]:
+    return {
+        "id": order.id,
+        "userId": order.user_id,
+        "status": order.status,
+        "totalPrice": order.total_price,
+        "createdAt": order.created_at.isoformat(),
+        "items": [
+            {"id": x.id, "orderId": x.order_id, "bookId": x.book_id, "quantity": x.quantity, "price": x.unit_price}
+            for x in order.items
+        ],
+    }
+
+
+def _append(db: Session, user_id: int, period: str, orders: list[dict[str, Any]]) -> None:
+    row = db.execute(
+        select(OrderArchive)
+        .where(OrderArchive.user_id == user_id, OrderArchive.period == period)
+        .with_for_update()
+    ).scalar_one_or_none()
+    if row is None:
+        db.add(OrderArchive(user_id=user_id, period=period, order_count=len(orders), payload=_pack(orders)))
+        return
+    merged = _unpack(row.payload) + orders           # 같은 달 주문이 늦게 종료된 경우 기존 묶음에 추가
+    row.payload = _pack(merged)
+    row.order_count = len(merged)
+
+
+def archive_orders() -> int:
+    """오래된 종료 주문 아카이브, 옮긴 주문 수 반환"""
+    settings = get_settings()
+    if settings.order_archive_after_months <= 0:
+        return 0
+    cutoff = _months_ago(datetime.now(timezone.utc), settings.order_archive_after_months)
+    archived = 0
+    db = SessionLocal()
+    try:
+        for _ in range(settings.order_archive_max_batches):
+            orders = db.execute(
+                select(Order)
+                .options(selectinload(Order.items))
+                .where(Order.status.in_(TERMINAL_STATUSES), Order.created_at < cutoff)
+                .order_by(Order.id)
+                .limit(settings.order_archive_batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not orders:
+                db.rollback()
+                break
+
+            groups: dict[tuple[int, str], list[dict[str, Any]]] = defaultdict(list)
+            for order in orders:
+                groups[(order.user_id, period_of(order.created_at))].append(_order_dict(order))
+            for (user_id, period), group in sorted(groups.items()):   # 같은 순서로 잠금(데드락 방지)
+                _append(db, user_id, period, group)
+
+            db.execute(
+                insert(ArchivedOrder),
+                [
+                    {
+                        "id": o.id,
+                        "user_id": o.user_id,
+                        "status": o.status,
+                        "total_price": o.total_price,
+                        "period": period_of(o.created_at),
+                        "created_at": o.created_at,
+                    }
+                    for o in orders
+                ],
+            )
+            ids = [o.id for o in orders]
+            db.execute(delete(OrderItem).where(OrderItem.order_id.in_(ids)).execution_options(synchronize_session=False))
+            db.execute(delete(Order).where(Order.id.in_(ids)).execution_options(synchronize_session=False))
+            db.commit()
+            db.expunge_all()
+
+            archived += len(orders)
+            if len(orders) < settings.order_archive_batch_size:
+                break
+    finally:
+        db.close()
+
+    if archived:
+        metrics.inc("orders.archived", archived)
+    return archived
+
+
+def load_archived_orders(db: Session, user_id: int, rows: list[ArchivedOrder]) -> dict[int, dict[str, Any]]:
+    """아카이브 헤더 → 주문(items 포함), 필요한 사용자-월 묶음만 한 번에 읽음"""
+    if not rows:
+        return {}
+    wanted = {row.id for row in rows}
+    archives = db.execute(
+        select(OrderArchive.payload).where(
+            OrderArchive.user_id == user_id,
+            OrderArchive.period.in_({row.period for row in rows}),
+        )
+    ).scalars().all()
+    return {
+        order["id"]: order
+        for payload in archives
+        for order in _unpack(payload)
+        if order["id"] in wanted
+    }
+
+
+def get_archived_order(db: Session, user_id: int, order_id: int) -> Optional[dict[str, Any]]:
+    row = (
+        db.query(ArchivedOrder)
+        .filter(ArchivedOrder.id == order_id, ArchivedOrder.user_id == user_id)  # 내 주문만
+        .first()
+    )
+    if row is None:
+        return None
+    return load_archived_orders(db, user_id, [row]).get(order_id)
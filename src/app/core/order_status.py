@@ -0,0 +1,107 @@
+"""
+주문 상태 전이
+CREATED → PAID → SHIPPED → DELIVERED, 배송 전(CREATED/PAID)에는 CANCELLED 가능
+- 전이는 조건부 UPDATE(WHERE status IN 허용 이전 상태)로만 → 동시에 바꿔도 잘못된 전이 불가
+- 여러 주문을 한 번에: 잠금 SELECT + UPDATE ... WHERE id IN (...) 묶음 단위
+- 취소된 주문의 재고는 도서별 합계로 한 번에 복구
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.outbox import add_events
+from app.core.stock import restore_hot_stock, restore_stock
+from app.models.order import Order, OrderItem
+
+CREATED = "CREATED"
+PAID = "PAID"
+SHIPPED = "SHIPPED"
+DELIVERED = "DELIVERED"
+CANCELLED = "CANCELLED"
+
+STATUSES = (CREATED, PAID, SHIPPED, DELIVERED, CANCELLED)
+
+TRANSITIONS: dict[str, set[str]] = {
+    CREATED: {PAID, CANCELLED},
+    PAID: {SHIPPED, CANCELLED},
+    SHIPPED: {DELIVERED},
+    DELIVERED: set(),
+    CANCELLED: set(),
+}
+TERMINAL_STATUSES = tuple(s for s in STATUSES if not TRANSITIONS[s])   # 더 바뀌지 않는 상태(아카이브 대상)
+
+CHUNK_SIZE = 1000                                   # UPDATE 한 번에 넣을 id 수(IN 목록/잠금 범위 제한)
+
+
+def sources_for(target: str) -> set[str]:
+    """target 으로 갈 수 있는 이전 상태 목록"""
+    return {src for src, targets in TRANSITIONS.items() if target in targets}
+
+
+def transition_orders(
+    db: Session,
+    order_ids: list[int],
+    target: str,
+    from_status: str | None = None,
+) -> tuple[list[int], list[int]]:
+    """
+    주문 상태 일괄 변경 → (변경된 id, 건너뛴 id)
+    건너뜀: 없는 주문 / 현재 상태에서 target 으로 갈 수 없는 주문 / from_status 와 다른 주문
+    묶음(CHUNK_SIZE)마다 커밋
+    """
+    sources = sources_for(target)
+    if from_status is not None:
+        sources &= {from_status}
+
+    unique_ids = sorted(set(order_ids))
+    moved: list[int] = []
+    if not sources:
+        return moved, unique_ids
+
+    for start in range(0, len(unique_ids), CHUNK_SIZE):
+        chunk = unique_ids[start:start + CHUNK_SIZE]
+        # 바꿀 수 있는 주문만 잠금(PK 순서) → 그 사이 다른 요청이 상태를 바꾸지 못함
+        ids = db.execute(
+            select(Order.id)
+            .where(Order.id.in_(chunk), Order.status.in_(sources))
+            .order_by(Order.id)
+            .with_for_update()
+        ).scalars().all()
+        if not ids:
+            db.rollback()
+            continue
+
+        db.execute(
+            update(Order)
+            .where(Order.id.in_(ids), Order.status.in_(sources))   # 조건부 UPDATE(전이 규칙)
+            .values(status=target)
+            .execution_options(synchronize_session=False)
+        )
+        add_events(db, "order", "order.status_changed", [(i, {"orderId": i, "status": target}) for i in ids])
+
+        hot_lines: dict[int, int] = {}
+        if target == CANCELLED:
+            hot_lines = restore_stock(db, _ordered_quantities(db, ids))
+        db.commit()
+        restore_hot_stock(hot_lines)                   # Redis 재고는 커밋 후 복구
+
+        moved.extend(ids)
+
+    metrics.inc(f"orders.status.{target.lower()}", len(moved))
+    moved_set = set(moved)
+    return moved, [order_id for order_id in unique_ids if order_id not in moved_set]
+
+
+def _ordered_quantities(db: Session, order_ids: list[int]) -> list[tuple[int, int]]:
+    # 주문들의 도서별 수량 합계(GROUP BY 한 번)
+    return [
+        (book_id, int(quantity))
+        for book_id, quantity in db.execute(
+            select(OrderItem.book_id, func.sum(OrderItem.quantity))
+            .where(OrderItem.order_id.in_(order_ids))
+            .group_by(OrderItem.book_id)
+        ).all()
+    ]
@@ -0,0 +1,180 @@
+"""
+Transactional outbox + Redis Streams
+- add_event(): 변경과 같은 세션/트랜잭션에 outbox_events 행 추가(커밋은 호출한 쪽)
+- relay_outbox(): 미발행 행을 배치로 읽어 XADD → published_at 기록(주기 작업)
+  XADD 후 커밋 전에 죽으면 다시 발행됨(at-least-once) → 소비자는 eventId 로 중복 제거
+- consume(): consumer group 으로 읽고 처리 후 XACK, 오래 ACK 안 된 메시지는 XAUTOCLAIM 으로 재처리
+스트림: events:order, events:book
+"""
+
+from __future__ import annotations
+
+import json
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from redis.exceptions import ResponseError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.redis_client import get_redis
+from app.db.session import SessionLocal
+from app.models.outbox_event import OutboxEvent
+
+STREAM_PREFIX = "events:"
+
+
+def stream_name(aggregate_type: str) -> str:
+    return f"{STREAM_PREFIX}{aggregate_type}"
+
+
+def add_event(db: Session, aggregate_type: str, aggregate_id: int, event_type: str, payload: dict[str, Any]) -> None:
+    db.add(
+        OutboxEvent(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+        )
+    )
+
+
+def add_events(db: Session, aggregate_type: str, event_type: str, rows: list[tuple[int, dict[str, Any]]]) -> None:
+    # 일괄 변경용(bulk insert 한 번)
+    if not rows:
+        return
+    db.execute(
+        insert(OutboxEvent),
+        [
+            {"aggregate_type": aggregate_type, "aggregate_id": aggregate_id, "event_type": event_type, "payload": payload}
+            for aggregate_id, payload in rows
+        ],
+    )
+
+
+def relay_outbox() -> int:
+    """미발행 이벤트 발행, 발행한 개수 반환"""
+    settings = get_settings()
+    r = get_redis()
+    published = 0
+    db = SessionLocal()
+    try:
+        for _ in range(settings.outbox_relay_max_batches):
+            events = db.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.published_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(settings.outbox_relay_batch_size)
+                .with_for_update(skip_locked=True)       # relay 가 여러 프로세스여도 같은 행 중복 발행 안 함
+            ).scalars().all()
+            if not events:
+                db.rollback()
+                break
+
+            pipe = r.pipeline(transaction=False)
+            for event in events:
+                pipe.xadd(
+                    stream_name(event.aggregate_type),
+                    {
+                        "eventId": event.id,
+                        "type": event.event_type,
+                        "aggregateId": event.aggregate_id,
+                        "payload": json.dumps(event.payload, ensure_ascii=False, default=str),
+                        "createdAt": event.created_at.isoformat() if event.created_at else "",
+                    },
+                    maxlen=settings.outbox_stream_maxlen,
+                    approximate=True,
+                )
+            pipe.execute()
+
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_([e.id for e in events]))
+                .values(published_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            published += len(events)
+            if len(events) < settings.outbox_relay_batch_size:
+                break
+    finally:
+        db.close()
+
+    if published:
+        metrics.inc("outbox.published", published)
+    return published
+
+
+def purge_published_outbox() -> int:
+    # 발행 후 보관 기간 지난 행 삭제
+    settings = get_settings()
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.outbox_retention_hours)
+    db = SessionLocal()
+    try:
+        ids = db.execute(
+            select(OutboxEvent.id)
+            .where(OutboxEvent.published_at.is_not(None), OutboxEvent.published_at < cutoff)
+            .order_by(OutboxEvent.id)
+            .limit(10000)
+        ).scalars().all()
+        if ids:
+            db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+            db.commit()
+        return len(ids)
+    finally:
+        db.close()
+
+
+def ensure_group(stream: str, group: str) -> None:
+    try:
+        get_redis().xgroup_create(stream, group, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):             # 이미 있으면 그대로 사용(offset 유지)
+            raise
+
+
+def consume(
+    stream: str,
+    group: str,
+    consumer: str,
+    handler: Callable[[dict[str, Any]], None],
+    count: int = 100,
+    block_ms: int = 1000,
+    claim_idle_ms: int = 60_000,
+) -> int:
+    """
+    한 번 읽어서 처리, 처리한 개수 반환(worker 루프에서 반복 호출)
+    handler 가 예외를 내면 ACK 안 함 → claim_idle_ms 뒤 다른 consumer 가 다시 가져감
+    """
+    r = get_redis()
+    ensure_group(stream, group)
+
+    # 죽은 consumer 가 들고 있던 메시지 회수
+    _, claimed, *_ = r.xautoclaim(stream, group, consumer, min_idle_time=claim_idle_ms, count=count)
+    messages = list(claimed)
+    if not messages:
+        for _, entries in r.xreadgroup(group, consumer, {stream: ">"}, count=count, block=block_ms) or []:
+            messages.extend(entries)
+
+    handled = 0
+    for message_id, fields in messages:
+        if not fields:
+            r.xack(stream, group, message_id)       # 트리밍으로 본문이 사라진 메시지
+            continue
+        event = {**fields, "payload": json.loads(fields.get("payload") or "{}")}
+        try:
+            handler(event)
+        except Exception:
+            metrics.inc(f"outbox.{group}.errors")
+            traceback.print_exc()
+            continue
+        r.xack(stream, group, message_id)
+        handled += 1
+
+    if handled:
+        metrics.inc(f"outbox.{group}.handled", handled)
+    return handled
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import base64
+import json
+from datetime import datetime
 from typing import Any, Optional
+
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Query
 
+from app.core.errors import raise_bad_request
+
 
 def paginate(  # 공통 페이지네이션 처리
     query: Query,
@@ -29,4 +36,58 @@ def paginate(  # 공통 페이지네이션 처리
         "totalElements": total,
         "totalPages": total_pages,
         "sort": sort or "",                  # 요청된 정렬 정보(표시용)
-    }
\ No newline at end of file
+    }
+
+def encode_cursor(values: list[Any]) -> str:  # 마지막 행의 정렬 키 → 불투명 문자열
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list[Any]) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(v) if col.type.python_type is datetime else col.type.python_type(v)
+            for v, col in zip(values, columns)
+        ]
+    except (ValueError, TypeError, NotImplementedError):
+        raise_bad_request("잘못된 cursor 입니다.", "INVALID_QUERY_PARAM")
+
+
+def keyset_paginate(  # 커서(keyset) 페이지네이션: OFFSET 없이 마지막 행 다음부터
+    query: Query,
+    keys: list[tuple[str, Any]],
+    size: int = 20,
+    cursor: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    keys: [("created_at", Order.created_at), ("id", Order.id)] 처럼 (결과 행 속성명, 컬럼), 모두 DESC 정렬
+    마지막 키는 유일해야 함(보통 PK), 인덱스도 같은 순서로 있어야 효과
+    """
+    if size <= 0:
+        size = 20
+    if size > 100:
+        size = 100
+
+    columns = [col for _, col in keys]
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        # (k1, k2, ...) < (v1, v2, ...) 를 OR/AND 로 풀어씀(인덱스 range 스캔)
+        conditions = []
+        for i, col in enumerate(columns):
+            conditions.append(and_(*[c == v for c, v in zip(columns[:i], values[:i])], col < values[i]))
+        query = query.filter(or_(*conditions))
+
+    rows = query.order_by(*[col.desc() for col in columns]).limit(size + 1).all()
+    has_next = len(rows) > size
+    rows = rows[:size]
+    next_cursor = encode_cursor([getattr(rows[-1], name) for name, _ in keys]) if has_next else None
+
+    return {
+        "content": rows,
+        "size": size,
+        "hasNext": has_next,
+        "nextCursor": next_cursor,                 # 다음 페이지 요청 시 cursor 로 전달
+    }
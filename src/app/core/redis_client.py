@@ -6,6 +6,7 @@ Redis 연결
 from __future__ import annotations
 
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 from app.core.config import get_settings
 
 _redis: Redis | None = None
@@ -22,4 +23,38 @@ def get_redis() -> Redis:
             db=settings.redis_db,
             decode_responses=True,  # 문자열로 바로 받기
         )
-    return _redis
\ No newline at end of file
+    return _redis
+
+
+_raw_redis: Redis | None = None
+
+
+def get_raw_redis() -> Redis:
+    # bitmap 같은 바이너리 값 조회용(decode 안 함)
+    global _raw_redis
+    if _raw_redis is None:
+        settings = get_settings()
+        _raw_redis = Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            decode_responses=False,
+        )
+    return _raw_redis
+
+
+_async_redis: AsyncRedis | None = None
+
+
+def get_async_redis() -> AsyncRedis:
+    # async 핸들러에서 이벤트 루프를 막지 않도록 쓰는 클라이언트
+    global _async_redis
+    if _async_redis is None:
+        settings = get_settings()
+        _async_redis = AsyncRedis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+    return _async_redis
@@ -0,0 +1,150 @@
+"""
+폐기된 refresh token(jti) Bloom filter
+시간 버킷별 bitmap을 Redis(bf:rt:{bucket})에 두고 각 프로세스가 메모리에 미러링
+- 음성(없음): 네트워크 호출 없이 통과
+- 양성(있을 수 있음): bl:rt:{jti} 블랙리스트를 그대로 확인
+미러가 늦게 동기화돼서 놓치는 경우도 token store(rotate)가 최종 판정하므로 안전
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+import time
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.redis_client import get_redis, get_raw_redis
+
+
+class RevocationFilter:
+    def __init__(
+        self,
+        capacity: int,
+        fp_rate: float,
+        max_bytes: int,
+        bucket_seconds: int,
+        lifetime_seconds: int,
+    ) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = math.ceil(lifetime_seconds / bucket_seconds) + 1
+        self.ttl_seconds = lifetime_seconds + bucket_seconds
+
+        # m = -n ln p / (ln 2)^2, 메모리 예산(버킷 전체 합) 안으로 제한
+        bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        budget_bits = max(8, (max_bytes // self.num_buckets) * 8)
+        self.num_bits = max(8, min(bits, budget_bits))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+
+        self._mirrors: dict[int, bytearray] = {}
+        self._synced = False
+        self._lock = threading.Lock()
+
+    def _bucket(self, now: float | None = None) -> int:
+        return int((now or time.time()) // self.bucket_seconds)
+
+    def _live_buckets(self) -> list[int]:
+        current = self._bucket()
+        return [current - i for i in range(self.num_buckets)]
+
+    @staticmethod
+    def _key(bucket: int) -> str:
+        return f"bf:rt:{bucket}"
+
+    def _positions(self, jti: str) -> list[int]:
+        # double hashing: h1 + i*h2
+        digest = hashlib.blake2b(jti.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    @staticmethod
+    def _get_bit(bits: bytearray, pos: int) -> bool:
+        byte = pos >> 3
+        if byte >= len(bits):
+            return False
+        return bool(bits[byte] & (0x80 >> (pos & 7)))  # Redis SETBIT 비트 순서(MSB 우선)
+
+    @staticmethod
+    def _set_bit(bits: bytearray, pos: int) -> None:
+        bits[pos >> 3] |= 0x80 >> (pos & 7)
+
+    def add(self, jti: str) -> None:
+        bucket = self._bucket()
+        positions = self._positions(jti)
+
+        pipe = get_redis().pipeline(transaction=False)
+        for pos in positions:
+            pipe.setbit(self._key(bucket), pos, 1)
+        pipe.expire(self._key(bucket), self.ttl_seconds)
+        pipe.execute()
+
+        with self._lock:
+            bits = self._mirrors.setdefault(bucket, bytearray(self.num_bits // 8 + 1))
+            for pos in positions:
+                self._set_bit(bits, pos)
+
+    def might_contain(self, jti: str) -> bool:
+        if not self._synced:
+            self.sync()                           # 첫 조회 전에 한 번은 Redis와 맞춤
+
+        positions = self._positions(jti)
+        with self._lock:
+            for bucket in self._live_buckets():
+                bits = self._mirrors.get(bucket)
+                if bits is not None and all(self._get_bit(bits, p) for p in positions):
+                    metrics.inc("revocation_filter.positive")
+                    return True
+        metrics.inc("revocation_filter.negative")
+        return False
+
+    def sync(self) -> None:
+        # Redis bitmap -> 로컬 미러(로컬에서 추가한 비트는 OR로 유지)
+        buckets = self._live_buckets()
+        pipe = get_raw_redis().pipeline(transaction=False)
+        for bucket in buckets:
+            pipe.get(self._key(bucket))
+        raws = pipe.execute()
+
+        size = self.num_bits // 8 + 1
+        with self._lock:
+            mirrors: dict[int, bytearray] = {}
+            for bucket, raw in zip(buckets, raws):
+                bits = bytearray(size)
+                if raw:
+                    bits[: min(size, len(raw))] = raw[:size]
+                local = self._mirrors.get(bucket)
+                if local is not None:
+                    for i, b in enumerate(local):
+                        bits[i] |= b
+                mirrors[bucket] = bits
+            self._mirrors = mirrors               # 만료된 버킷은 여기서 빠짐
+            self._synced = True
+        metrics.set_gauge("revocation_filter.mirror_bytes", size * len(buckets))
+
+
+_filter: RevocationFilter | None = None
+
+
+def get_revocation_filter() -> RevocationFilter | None:
+    # 비활성화면 None (호출한 쪽은 블랙리스트를 바로 확인)
+    global _filter
+    settings = get_settings()
+    if not settings.revocation_bloom_enabled:
+        return None
+    if _filter is None:
+        _filter = RevocationFilter(
+            capacity=settings.revocation_bloom_capacity,
+            fp_rate=settings.revocation_bloom_fp_rate,
+            max_bytes=settings.revocation_bloom_max_bytes,
+            bucket_seconds=settings.revocation_bloom_bucket_seconds,
+            lifetime_seconds=settings.jwt_refresh_token_expire_days * 24 * 3600,
+        )
+    return _filter
+
+
+def sync_revocation_filter() -> None:  # 스케줄러용
+    f = get_revocation_filter()
+    if f is not None:
+        f.sync()
@@ -0,0 +1,57 @@
+"""
+주기 작업 스케줄러
+데몬 스레드에서 등록된 작업을 interval 마다 실행(purge 등)
+앱 startup 에서 start_scheduler() 호출
+"""
+
+from __future__ import annotations
+
+import threading
+import traceback
+from dataclasses import dataclass
+from typing import Callable
+
+from app.core import metrics
+
+
+@dataclass
+class PeriodicTask:
+    name: str
+    interval_seconds: float
+    fn: Callable[[], object]
+
+
+_tasks: dict[str, PeriodicTask] = {}
+_threads: dict[str, threading.Thread] = {}
+_stop = threading.Event()
+
+
+def register_periodic(name: str, interval_seconds: float, fn: Callable[[], object]) -> None:
+    # interval <= 0 이면 비활성
+    if interval_seconds <= 0:
+        return
+    _tasks[name] = PeriodicTask(name=name, interval_seconds=interval_seconds, fn=fn)
+
+
+def _loop(task: PeriodicTask) -> None:
+    while not _stop.wait(task.interval_seconds):
+        try:
+            task.fn()
+            metrics.inc(f"scheduler.{task.name}.runs")
+        except Exception:
+            metrics.inc(f"scheduler.{task.name}.errors")
+            traceback.print_exc()
+
+
+def start_scheduler() -> None:
+    _stop.clear()
+    for name, task in _tasks.items():
+        if name in _threads and _threads[name].is_alive():
+            continue
+        t = threading.Thread(target=_loop, args=(task,), name=f"periodic-{name}", daemon=True)
+        t.start()
+        _threads[name] = t
+
+
+def stop_scheduler() -> None:
+    _stop.set()
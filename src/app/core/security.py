@@ -26,7 +26,7 @@ def get_password_hash(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
-def create_access_token(subject: str, role: str | None = None) -> str:
+def create_access_token(subject: str, role: str | None = None, gen: int = 0) -> str:
 
     #subject: user_id 또는 email (user_id를 문자열로)
 
@@ -38,6 +38,7 @@ def create_access_token(subject: str, role: str | None = None) -> str:
         "sub": subject,
         "type": "access",
         "role": role, # RBAC 편의를 위해 role도 access 토큰에 포함(최종 권한 판단은 DB의 user.role 기준으로도 가능함)
+        "gen": gen,   # 사용자 토큰 세대(전체 로그아웃 시 증가)
         "iat": int(now.timestamp()),
         "exp": int(exp.timestamp()),
     }
@@ -68,9 +69,10 @@ def decode_access_token(token: str) -> dict:
             detail="INVALID_OR_EXPIRED_TOKEN",
         )
 
-def create_refresh_token(subject: str, jti: str) -> str:
+def create_refresh_token(subject: str, jti: str, gen: int = 0, role: str | None = None) -> str:
     """
     refresh 토큰은 토큰 고유값(jti) 넣어서 DB랑 매칭
+    role 도 넣어 두면 재발급 때 users 조회 없이 access 발급
     """
     settings = get_settings()
     now = datetime.now(timezone.utc)
@@ -80,6 +82,8 @@ def create_refresh_token(subject: str, jti: str) -> str:
         "sub": subject,
         "type": "refresh",
         "jti": jti,
+        "gen": gen,
+        "role": role,
         "iat": int(now.timestamp()),
         "exp": int(exp.timestamp()),
     }
@@ -0,0 +1,33 @@
+"""
+사용자별 토큰 세대(generation) 카운터
+토큰 발급 시 현재 세대를 gen claim 으로 넣고, 검증 시 Redis 값과 비교
+전체 로그아웃 = INCR 한 번(O(1))으로 그 전에 발급된 access/refresh 전부 무효화
+"""
+
+from __future__ import annotations
+
+from app.core.redis_client import get_async_redis, get_redis
+
+
+def generation_key(user_id: int | str) -> str:  # redis refresh 회전 스크립트도 같은 키를 읽음
+    return f"tokgen:{user_id}"
+
+
+def get_generation(user_id: int | str) -> int:
+    value = get_redis().get(generation_key(user_id))
+    return int(value) if value else 0
+
+
+def bump_generation(user_id: int | str) -> int:  # 전체 세션 폐기
+    return int(get_redis().incr(generation_key(user_id)))
+
+
+def is_current_generation(payload: dict, user_id: int | str) -> bool:
+    # gen claim 이 없는 예전 토큰은 0세대로 취급
+    return int(payload.get("gen") or 0) == get_generation(user_id)
+
+
+async def is_current_generation_async(payload: dict, user_id: int | str) -> bool:
+    # async 핸들러용(이벤트 루프 안 막음)
+    value = await get_async_redis().get(generation_key(user_id))
+    return int(payload.get("gen") or 0) == (int(value) if value else 0)
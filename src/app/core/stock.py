@@ -0,0 +1,139 @@
+"""
+재고 차감(주문 생성/체크아웃 공용)
+- 주문 대상 도서를 IN 쿼리 한 번으로 조회(가격 스냅샷)
+- 조건부 UPDATE 한 번으로 차감: stock >= 수량인 행만 감소 → 검사와 차감 사이 lost update 없음
+- 잠금은 해당 도서 행에만, PK 순서로 걸림(주문끼리 잠금 순서가 같아서 데드락 최소화)
+- hot stock 도서(books.hot_stock)는 DB 행 대신 Redis 카운터에서 차감(core/hot_stock)
+재고가 부족하면 롤백 후 400
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from app.core import hot_stock
+from app.core.errors import raise_bad_request, raise_not_found
+from app.models.book import Book
+
+
+def merge_lines(lines: Iterable[tuple[int, int]]) -> dict[int, int]:
+    # 같은 도서가 여러 줄이면 수량 합산, book_id 오름차순
+    merged: Counter = Counter()
+    for book_id, quantity in lines:
+        merged[book_id] += quantity
+    return dict(sorted(merged.items()))
+
+
+@dataclass
+class StockReservation:
+    prices: dict[int, int]                                  # book_id → 주문 당시 단가
+    hot: hot_stock.Reservation = field(default_factory=lambda: hot_stock.Reservation(token=""))
+
+    @property
+    def token(self) -> str | None:
+        # hot 재고를 차감한 주문만 예약 토큰 기록(orders.stock_reservation_id)
+        return self.hot.token if self.hot.taken else None
+
+    def confirm(self) -> None:                              # 커밋 성공 후
+        hot_stock.confirm(self.hot)
+
+    def release(self) -> None:                              # 커밋 실패 시(DB 쪽은 rollback 으로 복구)
+        hot_stock.release(self.hot)
+
+
+def reserve_stock(db: Session, lines: Iterable[tuple[int, int]]) -> StockReservation:
+    """
+    (book_id, 수량) 목록만큼 재고 차감
+    커밋은 호출한 쪽 트랜잭션에서, 커밋 후 confirm() / 실패 시 release()
+    """
+    wanted = merge_lines(lines)
+    if not wanted:
+        return StockReservation(prices={})
+
+    rows = db.execute(
+        select(Book.id, Book.price, Book.hot_stock).where(Book.id.in_(wanted.keys()))
+    ).all()
+    prices = {book_id: int(price or 0) for book_id, price, _ in rows}
+    missing = [book_id for book_id in wanted if book_id not in prices]
+    if missing:
+        raise_not_found("도서를 찾을 수 없습니다.", "RESOURCE_NOT_FOUND", details={"bookIds": missing})
+
+    hot_wanted = {book_id: wanted[book_id] for book_id, _, hot in rows if hot}
+    reservation = StockReservation(prices=prices)
+    if hot_wanted:
+        reservation.hot, short, cold = hot_stock.reserve(hot_wanted)
+        if short:
+            raise_bad_request("재고가 부족합니다.", "UNPROCESSABLE_ENTITY", details={"bookIds": short})
+        for book_id in cold:
+            hot_wanted.pop(book_id)                         # 그 사이 hot 모드 해제 → DB 에서 차감
+
+    cold_wanted = {book_id: q for book_id, q in wanted.items() if book_id not in hot_wanted}
+    if not cold_wanted:
+        return reservation
+
+    quantity = case(cold_wanted, value=Book.id)             # CASE id WHEN 1 THEN 2 ... END
+    try:
+        result = db.execute(
+            update(Book)
+            .where(
+                Book.id.in_(cold_wanted.keys()),
+                Book.stock >= quantity,
+                Book.hot_stock.is_(False),                  # 그 사이 hot 모드로 바뀐 도서는 차감 안 함
+            )
+            .values(stock=Book.stock - quantity)
+            .execution_options(synchronize_session=False)
+        )
+    except Exception:
+        reservation.release()                              # 데드락/잠금 대기 초과 → 재시도 전에 hot 재고 되돌림
+        raise
+    if result.rowcount != len(cold_wanted):
+        db.rollback()                                      # 일부만 차감된 상태 되돌림
+        reservation.release()
+        raise_bad_request(
+            "재고가 부족합니다.",
+            "UNPROCESSABLE_ENTITY",
+            details={"bookIds": _short_books(db, cold_wanted)},
+        )
+
+    return reservation
+
+
+def _short_books(db: Session, wanted: dict[int, int]) -> list[int]:
+    rows = db.execute(select(Book.id, Book.stock).where(Book.id.in_(wanted.keys()))).all()
+    return [book_id for book_id, stock in rows if stock < wanted[book_id]]
+
+
+def restore_stock(db: Session, lines: Iterable[tuple[int, int]]) -> dict[int, int]:
+    """
+    주문 취소 등으로 재고 되돌리기(DB 는 UPDATE 한 번, 커밋은 호출한 쪽)
+    hot stock 도서 분량은 반환 → 커밋 후 restore_hot_stock() 으로 Redis 에 복구
+    """
+    wanted = merge_lines(lines)
+    if not wanted:
+        return {}
+
+    hot_ids = set(
+        db.execute(
+            select(Book.id).where(Book.id.in_(wanted.keys()), Book.hot_stock.is_(True))
+        ).scalars()
+    )
+    cold = {book_id: q for book_id, q in wanted.items() if book_id not in hot_ids}
+    if cold:
+        db.execute(
+            update(Book)
+            .where(Book.id.in_(cold.keys()))
+            .values(stock=Book.stock + case(cold, value=Book.id))
+            .execution_options(synchronize_session=False)
+        )
+    return {book_id: q for book_id, q in wanted.items() if book_id in hot_ids}
+
+
+def restore_hot_stock(lines: dict[int, int]) -> None:
+    for book_id, quantity in lines.items():
+        if not hot_stock.restore(book_id, quantity):
+            hot_stock.restore_db_stock(book_id, quantity)    # 그 사이 hot 모드 해제 → DB 로
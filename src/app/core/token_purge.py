@@ -0,0 +1,129 @@
+"""
+refresh_tokens 정리 작업
+만료된 행을 expires_at 인덱스 기준으로 작은 배치 단위 삭제(배치마다 commit → 락 짧게)
+파티셔닝(선택) 사용 시 만료된 월 파티션은 DROP PARTITION 으로 즉시 제거
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.refresh_token import RefreshToken
+
+
+def purge_expired_refresh_tokens(
+    db: Session,
+    batch_size: int = 1000,
+    max_batches: int = 100,
+    pause_seconds: float = 0.0,
+) -> int:
+    """만료된 refresh token 삭제, 삭제한 행 수 반환"""
+    now = datetime.now(timezone.utc)
+    purged = 0
+
+    for _ in range(max_batches):
+        ids = [
+            row.id
+            for row in (
+                db.query(RefreshToken.id)
+                .filter(RefreshToken.expires_at < now)   # ix_refresh_tokens_expires_at
+                .order_by(RefreshToken.expires_at)
+                .limit(batch_size)
+                .all()
+            )
+        ]
+        if not ids:
+            break
+
+        deleted = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.id.in_(ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()                                      # 배치마다 커밋해서 락 유지 시간 최소화
+
+        purged += deleted
+        metrics.inc("refresh_tokens.purged", deleted)
+        metrics.inc("refresh_tokens.purge_batches")
+
+        if len(ids) < batch_size:
+            break
+        if pause_seconds > 0:
+            time.sleep(pause_seconds)                    # 복제 지연/IO 부하 완화
+
+    return purged
+
+
+def _month_start(year: int, month: int) -> datetime:
+    return datetime(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+
+def maintain_refresh_token_partitions(db: Session, months_ahead: int = 3) -> int:
+    """(파티셔닝 사용 시) 만료된 월 파티션 DROP + 앞으로 쓸 월 파티션 추가, 삭제한 파티션 수 반환"""
+    rows = db.execute(
+        text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'refresh_tokens' "
+            "AND PARTITION_NAME IS NOT NULL"
+        )
+    ).all()
+    if not rows:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    current = now.strftime("p%Y%m")
+    dropped = 0
+
+    # pYYYYMM 은 해당 월에 만료되는 토큰 → 지난 달 이전 파티션은 전부 만료
+    for name, _desc in rows:
+        if name.startswith("p") and name[1:].isdigit() and name < current:
+            db.execute(text(f"ALTER TABLE refresh_tokens DROP PARTITION {name}"))
+            dropped += 1
+            metrics.inc("refresh_tokens.partitions_dropped")
+
+    existing = {name for name, _ in rows}
+    for i in range(months_ahead + 1):
+        start = _month_start(now.year, now.month + i)
+        name = start.strftime("p%Y%m")
+        if name in existing:
+            continue
+        upper = _month_start(start.year, start.month + 1).strftime("%Y-%m-%d")
+        db.execute(
+            text(
+                "ALTER TABLE refresh_tokens REORGANIZE PARTITION pmax INTO ("
+                f"PARTITION {name} VALUES LESS THAN ('{upper}'), "
+                "PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+            )
+        )
+
+    return dropped
+
+
+def run_refresh_token_purge() -> int:
+    # 스케줄러/관리자 API 진입점
+    settings = get_settings()
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        if settings.refresh_token_partitioning:
+            maintain_refresh_token_partitions(db)
+        purged = purge_expired_refresh_tokens(
+            db,
+            batch_size=settings.refresh_token_purge_batch_size,
+            max_batches=settings.refresh_token_purge_max_batches,
+            pause_seconds=settings.refresh_token_purge_pause_ms / 1000,
+        )
+    finally:
+        db.close()
+
+    metrics.set_gauge("refresh_tokens.last_purge_rows", purged)
+    metrics.set_gauge("refresh_tokens.last_purge_ms", (time.perf_counter() - started) * 1000)
+    metrics.set_gauge("refresh_tokens.last_purge_at", time.time())
+    return purged
@@ -0,0 +1,365 @@
+"""
+Refresh token 저장소
+db    : refresh_tokens 테이블이 기준(기존 방식)
+redis : jti 상태를 Redis에 두고(TTL = 토큰 만료) 회전은 Lua 한 번으로 처리(토큰 세대 / 로그아웃 블랙리스트 확인 포함)
+        MySQL refresh_tokens 는 비동기 감사 로그로만 남김(JOB_QUEUE_ENABLED 면 worker 작업으로)
+        폐기/회전한 jti 는 삭제 대신 "revoked" 표시(TTL 유지) → rt:{jti} 가 아예 없으면 redis 모드 전에
+        발급된 토큰이므로 refresh_tokens 행으로 한 번 확인(전환 직후에도 재로그인 필요 없음)
+        세션 목록은 rt:user:{user_id} HASH(jti → "id:발급시각:만료시각")
+전체 로그아웃(revoke_all)의 refresh_tokens 일괄 UPDATE 는 요청 밖(응답 후 / worker)에서 실행
+settings.refresh_token_store 로 선택
+"""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.jobs import job
+from app.core.redis_client import get_redis
+from app.core.revocation_filter import get_revocation_filter
+from app.core.session_generation import generation_key, get_generation
+from app.db.session import SessionLocal
+from app.models.refresh_token import RefreshToken
+
+
+def _ttl_seconds(expires_at: datetime) -> int:  # 만료시각 -> Redis TTL(초)
+    ttl = int((expires_at - datetime.now(timezone.utc)).total_seconds())
+    return max(ttl, 1)
+
+
+@dataclass
+class SessionInfo:
+    id: int
+    jti: str
+    created_at: datetime
+    expires_at: datetime
+
+
+def _defer(background: Optional[BackgroundTasks], fn, *args) -> None:
+    # DB 기록을 요청 경로 밖에서: 작업 큐(재시도 포함) > 응답 후 BackgroundTasks > 바로 실행
+    if get_settings().job_queue_enabled:
+        fn.delay(*args)
+    elif background is not None:
+        background.add_task(fn, *args)
+    else:
+        fn(*args)
+
+
+class RefreshTokenStore(ABC):
+    """refresh token(jti) 발급/회전/폐기 인터페이스(메서드를 빠뜨리면 생성 시점에 TypeError)"""
+
+    @abstractmethod
+    def issue(
+        self,
+        db: Session,
+        user_id: int,
+        jti: str,
+        expires_at: datetime,
+        background: Optional[BackgroundTasks] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def rotate(
+        self,
+        db: Session,
+        user_id: int,
+        old_jti: str,
+        new_jti: str,
+        expires_at: datetime,
+        gen: int,
+        background: Optional[BackgroundTasks] = None,
+    ) -> bool:
+        """old_jti 가 유효하면(gen 이 현재 토큰 세대 + 로그아웃 안 됨) 폐기 후 new_jti 저장, 아니면 False"""
+
+    @abstractmethod
+    def revoke(
+        self,
+        db: Session,
+        jti: str,
+        background: Optional[BackgroundTasks] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def revoke_all(
+        self,
+        db: Session,
+        user_id: int,
+        background: Optional[BackgroundTasks] = None,
+    ) -> None:
+        """사용자 refresh 전부 폐기(전체 로그아웃, 토큰 세대 증가와 함께 사용)"""
+
+    @abstractmethod
+    def sessions(self, db: Session, user_id: int) -> list[SessionInfo]:
+        """만료/폐기 안 된 세션, 최근 발급 순"""
+
+
+class DbRefreshTokenStore(RefreshTokenStore):
+    """refresh_tokens 테이블 기준(호출한 쪽에서 commit)"""
+
+    def issue(self, db, user_id, jti, expires_at, background=None):
+        db.add(
+            RefreshToken(
+                user_id=user_id,
+                jti=jti,
+                expires_at=expires_at,
+                is_revoked=False,
+            )
+        )
+
+    def rotate(self, db, user_id, old_jti, new_jti, expires_at, gen, background=None):
+        if gen != get_generation(user_id) or _blacklisted(old_jti):
+            return False
+        token_row = db.query(RefreshToken).filter(RefreshToken.jti == old_jti).first()
+        if not token_row or token_row.is_revoked:
+            return False
+
+        token_row.is_revoked = True                 # 기존 refresh 재사용 방지
+        token_row.revoked_at = datetime.now(timezone.utc)
+        self.issue(db, user_id, new_jti, expires_at)
+        return True
+
+    def revoke(self, db, jti, background=None):
+        token_row = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
+        if token_row:
+            token_row.is_revoked = True
+            token_row.revoked_at = datetime.now(timezone.utc)
+
+    def revoke_all(self, db, user_id, background=None):
+        # 토큰 세대 증가로 이미 무효 → 행 정리는 요청 밖에서(이후 새로 로그인한 세션은 건드리지 않음)
+        _defer(background, _revoke_user_rows, user_id, datetime.now(timezone.utc))
+
+    def sessions(self, db, user_id):
+        rows = (
+            db.query(RefreshToken.id, RefreshToken.jti, RefreshToken.created_at, RefreshToken.expires_at)
+            .filter(                                    # ix_refresh_tokens_user_active
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked.is_(False),
+                RefreshToken.expires_at > datetime.now(timezone.utc),
+            )
+            .order_by(RefreshToken.created_at.desc())
+            .all()
+        )
+        return [SessionInfo(id=row.id, jti=row.jti, created_at=row.created_at, expires_at=row.expires_at) for row in rows]
+
+
+def _blacklisted(jti: str) -> bool:
+    # 로그아웃 블랙리스트(bl:rt:{jti}), Bloom 음성이면 Redis 조회 생략
+    bloom = get_revocation_filter()
+    if bloom is not None and not bloom.might_contain(jti):
+        return False
+    return get_redis().get(f"bl:rt:{jti}") == "1"
+
+
+REVOKED = "revoked"
+
+SEQ_KEY = "rt:seq"                               # 세션 목록 id
+
+# 새 jti 저장 + 세션 목록 추가
+# KEYS[1]=rt:{jti} KEYS[2]=rt:user:{user_id} KEYS[3]=rt:seq ARGV[1]=user_id ARGV[2]=ttl ARGV[3]=jti ARGV[4]=발급시각
+_ISSUE_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+local id = redis.call('INCR', KEYS[3])
+redis.call('HSET', KEYS[2], ARGV[3], id .. ':' .. ARGV[4] .. ':' .. (tonumber(ARGV[4]) + tonumber(ARGV[2])))
+if redis.call('TTL', KEYS[2]) < tonumber(ARGV[2]) then
+  redis.call('EXPIRE', KEYS[2], tonumber(ARGV[2]))
+end
+return id
+"""
+
+# KEYS[1]=rt:{old} KEYS[2]=rt:{new} KEYS[3]=rt:user:{user_id} KEYS[4]=rt:seq KEYS[5]=tokgen:{user_id} KEYS[6]=bl:rt:{old}
+# ARGV[1]=user_id ARGV[2]=ttl ARGV[3]=old jti ARGV[4]=new jti ARGV[5]=발급시각 ARGV[6]=토큰의 gen
+# 1: 회전 / 0: 이전 세대, 로그아웃, 폐기됐거나 다른 사용자 / -1: 키 없음(redis 모드 전 발급 → DB 확인)
+_ROTATE_LUA = """
+if tonumber(redis.call('GET', KEYS[5]) or 0) ~= tonumber(ARGV[6]) or redis.call('EXISTS', KEYS[6]) == 1 then
+  return 0
+end
+local v = redis.call('GET', KEYS[1])
+if not v then
+  return -1
+end
+if v ~= ARGV[1] then
+  return 0
+end
+redis.call('SET', KEYS[1], 'revoked', 'KEEPTTL')
+redis.call('HDEL', KEYS[3], ARGV[3])
+redis.call('SET', KEYS[2], ARGV[1], 'EX', tonumber(ARGV[2]))
+local id = redis.call('INCR', KEYS[4])
+redis.call('HSET', KEYS[3], ARGV[4], id .. ':' .. ARGV[5] .. ':' .. (tonumber(ARGV[5]) + tonumber(ARGV[2])))
+redis.call('EXPIRE', KEYS[3], tonumber(ARGV[2]))
+return 1
+"""
+
+# KEYS[1]=rt:{jti} ARGV[1]=jti, 있을 때만 폐기 표시(TTL 유지) + 그 사용자 세션 목록에서 제거
+_REVOKE_LUA = """
+local v = redis.call('GET', KEYS[1])
+if not v or v == 'revoked' then
+  return 0
+end
+redis.call('SET', KEYS[1], 'revoked', 'KEEPTTL')
+redis.call('HDEL', 'rt:user:' .. v, ARGV[1])
+return 1
+"""
+
+# KEYS[1]=rt:user:{user_id} ARGV[1]=user_id, 목록의 jti 전부 폐기 표시 후 목록 삭제
+_REVOKE_ALL_LUA = """
+local jtis = redis.call('HKEYS', KEYS[1])
+for _, jti in ipairs(jtis) do
+  local key = 'rt:' .. jti
+  if redis.call('GET', key) == ARGV[1] then
+    redis.call('SET', key, 'revoked', 'KEEPTTL')
+  end
+end
+redis.call('DEL', KEYS[1])
+return #jtis
+"""
+
+
+def _revoke_legacy_row(db: Session, user_id: int, jti: str) -> bool:
+    # redis 모드 전에 발급된 refresh: 조건부 UPDATE 한 번(동시에 회전해도 한 요청만 성공)
+    return db.query(RefreshToken).filter(
+        RefreshToken.jti == jti,
+        RefreshToken.user_id == user_id,
+        RefreshToken.is_revoked.is_(False),
+        RefreshToken.expires_at > datetime.now(timezone.utc),
+    ).update(
+        {RefreshToken.is_revoked: True, RefreshToken.revoked_at: datetime.now(timezone.utc)},
+        synchronize_session=False,
+    ) == 1
+
+
+@job("refresh_token.audit_issue")
+def _audit_issue(user_id: int, jti: str, expires_at: datetime) -> None:  # 감사 로그 기록(요청 경로 밖)
+    db = SessionLocal()
+    try:
+        db.add(RefreshToken(user_id=user_id, jti=jti, expires_at=expires_at, is_revoked=False))
+        db.commit()
+    finally:
+        db.close()
+
+
+@job("refresh_token.revoke_user")
+def _revoke_user_rows(user_id: int, before: datetime) -> int:
+    # 전체 로그아웃 시점(before) 이전에 발급된 활성 행 일괄 폐기(UPDATE 한 번)
+    db = SessionLocal()
+    try:
+        revoked = db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.is_revoked.is_(False),
+            RefreshToken.created_at <= before,
+        ).update(
+            {RefreshToken.is_revoked: True, RefreshToken.revoked_at: datetime.now(timezone.utc)},
+            synchronize_session=False,
+        )
+        db.commit()
+        return revoked
+    finally:
+        db.close()
+
+
+@job("refresh_token.audit_revoke")
+def _audit_revoke(jti: str) -> None:
+    db = SessionLocal()
+    try:
+        db.query(RefreshToken).filter(RefreshToken.jti == jti).update(
+            {RefreshToken.is_revoked: True, RefreshToken.revoked_at: datetime.now(timezone.utc)},
+            synchronize_session=False,
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+class RedisRefreshTokenStore(RefreshTokenStore):
+    """rt:{jti} -> user_id (TTL = 토큰 만료) + rt:user:{user_id} 세션 목록, MySQL은 감사 로그"""
+
+    def __init__(self) -> None:
+        r = get_redis()
+        self._issue = r.register_script(_ISSUE_LUA)
+        self._rotate = r.register_script(_ROTATE_LUA)
+        self._revoke = r.register_script(_REVOKE_LUA)
+        self._revoke_all = r.register_script(_REVOKE_ALL_LUA)
+
+    @staticmethod
+    def _key(jti: str) -> str:
+        return f"rt:{jti}"
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"rt:user:{user_id}"
+
+    def issue(self, db, user_id, jti, expires_at, background=None):
+        self._issue(
+            keys=[self._key(jti), self._user_key(user_id), SEQ_KEY],
+            args=[str(user_id), _ttl_seconds(expires_at), jti, int(time.time())],
+        )
+        _defer(background, _audit_issue, user_id, jti, expires_at)
+
+    def rotate(self, db, user_id, old_jti, new_jti, expires_at, gen, background=None):
+        result = int(self._rotate(
+            keys=[
+                self._key(old_jti),
+                self._key(new_jti),
+                self._user_key(user_id),
+                SEQ_KEY,
+                generation_key(user_id),
+                f"bl:rt:{old_jti}",
+            ],
+            args=[str(user_id), _ttl_seconds(expires_at), old_jti, new_jti, int(time.time()), gen],
+        ))
+        if result < 0:
+            # 전환 전 토큰: DB 행을 폐기하고 새 토큰부터 Redis 에(commit 은 호출한 쪽)
+            if not _revoke_legacy_row(db, user_id, old_jti):
+                return False
+            self.issue(db, user_id, new_jti, expires_at, background)
+            return True
+        if not result:
+            return False
+        _defer(background, _audit_revoke, old_jti)
+        _defer(background, _audit_issue, user_id, new_jti, expires_at)
+        return True
+
+    def revoke(self, db, jti, background=None):
+        self._revoke(keys=[self._key(jti)], args=[jti])
+        _defer(background, _audit_revoke, jti)      # 전환 전 토큰은 DB 행 폐기
+
+    def revoke_all(self, db, user_id, background=None):
+        self._revoke_all(keys=[self._user_key(user_id)], args=[str(user_id)])
+        _defer(background, _revoke_user_rows, user_id, datetime.now(timezone.utc))   # 감사 로그 / 전환 전 행
+
+    def sessions(self, db, user_id):
+        now = int(time.time())
+        result = []
+        for jti, meta in get_redis().hgetall(self._user_key(user_id)).items():
+            session_id, created, expires = (int(x) for x in meta.split(":"))
+            if expires > now:                          # 만료된 항목은 목록 TTL 과 함께 사라짐
+                result.append(
+                    SessionInfo(
+                        id=session_id,
+                        jti=jti,
+                        created_at=datetime.fromtimestamp(created, timezone.utc),
+                        expires_at=datetime.fromtimestamp(expires, timezone.utc),
+                    )
+                )
+        return sorted(result, key=lambda x: x.id, reverse=True)
+
+
+_store: RefreshTokenStore | None = None
+
+
+def get_refresh_token_store() -> RefreshTokenStore:
+    # 설정값 기준으로 한 번만 생성해서 재사용
+    global _store
+    if _store is None:
+        mode = get_settings().refresh_token_store.lower()
+        _store = RedisRefreshTokenStore() if mode == "redis" else DbRefreshTokenStore()
+    return _store
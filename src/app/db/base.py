@@ -9,4 +9,7 @@ from app.models.book import Book
 from app.models.order import Order
 from app.models.favorite import Favorite
 from app.models.review import Review
-from app.models.cart_item import CartItem  # noqa: F401
\ No newline at end of file
+from app.models.cart_item import CartItem
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401
+from app.models.outbox_event import OutboxEvent  # noqa: F401
+from app.models.order_archive import ArchivedOrder, OrderArchive  # noqa: F401
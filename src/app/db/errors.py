@@ -0,0 +1,18 @@
+"""
+MySQL 에러 코드 해석(DBAPI 예외의 args[0])
+IntegrityError / OperationalError 를 코드로 구분해서 409/404 등 기존 에러 코드로 변환할 때 사용
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.exc import DBAPIError
+
+DUPLICATE_ENTRY = 1062                            # ER_DUP_ENTRY(unique 충돌)
+NO_REFERENCED_ROW = 1452                          # ER_NO_REFERENCED_ROW_2(FK 대상 없음)
+LOCK_WAIT_TIMEOUT = 1205                          # ER_LOCK_WAIT_TIMEOUT
+DEADLOCK = 1213                                   # ER_LOCK_DEADLOCK
+
+
+def mysql_errno(exc: DBAPIError) -> int | None:
+    args = getattr(exc.orig, "args", None) or (None,)
+    return args[0] if isinstance(args[0], int) else None
@@ -0,0 +1,77 @@
+"""
+DB 커넥션 풀 계측
+- checkout 대기 시간(풀이 가득 차서 기다린 시간) / timeout 횟수
+- in-use / idle / overflow gauge (metrics.snapshot 조회 시점 계산)
+- overflow 연결 사용 이벤트
+"""
+
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core import metrics
+
+SLOW_CHECKOUT_MS = 100
+
+
+class _WaitTimingMixin:
+    """_do_get(풀에서 커넥션 꺼내기) 시간을 재서 대기 시간으로 기록"""
+
+    metrics_prefix = "db.pool"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.inc(f"{self.metrics_prefix}.timeouts")
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - start) * 1000
+            metrics.inc(f"{self.metrics_prefix}.checkouts")
+            metrics.inc(f"{self.metrics_prefix}.checkout_wait_ms_total", waited_ms)
+            if waited_ms >= SLOW_CHECKOUT_MS:
+                metrics.inc(f"{self.metrics_prefix}.checkout_slow")
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(pool: Pool, prefix: str) -> None:
+    """풀 이벤트 리스너 + gauge collector 등록"""
+    if isinstance(pool, _WaitTimingMixin):
+        pool.metrics_prefix = prefix
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_conn, conn_record):
+        metrics.inc(f"{prefix}.connects")
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            metrics.inc(f"{prefix}.overflow_checkouts")   # pool_size 초과분 사용 중
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_conn, conn_record, exception):
+        metrics.inc(f"{prefix}.invalidated")
+
+    def _collect() -> dict[str, float]:
+        if not isinstance(pool, QueuePool):
+            return {}
+        return {
+            f"{prefix}.size": pool.size(),
+            f"{prefix}.in_use": pool.checkedout(),
+            f"{prefix}.idle": pool.checkedin(),
+            f"{prefix}.overflow": max(pool.overflow(), 0),
+        }
+
+    metrics.register_collector(prefix, _collect)
@@ -0,0 +1,90 @@
+"""
+요청 단위 SQL 쿼리 계측
+- before/after_cursor_execute 로 요청당 쿼리 수 / DB 시간 집계(contextvar)
+- 같은 형태의 쿼리가 한 요청에서 N번 넘게 실행되면 N+1 의심 로그
+- 임계값 넘은 쿼리는 slow_query 에 fingerprint 단위로 기록
+- 디버그 모드에서는 X-DB-Queries / X-DB-Time 응답 헤더로 노출(main 미들웨어)
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db import slow_query
+
+
+@dataclass
+class RequestQueryStats:
+    path: str = ""
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    warned: set = field(default_factory=set)
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+_WS = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?|:\w+)(?:\s*,\s*(?:%s|\?|:\w+))*\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    # 공백 정리 + IN (?, ?, ...) 길이 차이 무시
+    shape = _WS.sub(" ", statement).strip()
+    return _IN_LIST.sub("(?)", shape)
+
+
+def start_request(path: str) -> Token:
+    return _current.set(RequestQueryStats(path=path))
+
+
+def end_request(token: Token) -> Optional[RequestQueryStats]:
+    stats = _current.get()
+    _current.reset(token)
+    return stats
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+
+    metrics.inc("db.queries")
+    metrics.inc("db.query_ms_total", elapsed_ms)
+
+    stats = _current.get()
+    slow_query.record(statement, elapsed_ms, cursor.rowcount, stats.path if stats else None)
+    if stats is None:
+        return                                     # 요청 밖(스케줄러 등)
+
+    stats.count += 1
+    stats.total_ms += elapsed_ms
+
+    threshold = get_settings().n_plus_one_threshold
+    shape = statement_shape(statement)
+    stats.shapes[shape] += 1
+    if stats.shapes[shape] > threshold and shape not in stats.warned:
+        stats.warned.add(shape)
+        metrics.inc("db.n_plus_one_suspects")
+        print(f"[N+1] {stats.path} same statement > {threshold}x: {shape[:200]}")
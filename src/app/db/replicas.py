@@ -0,0 +1,168 @@
+"""
+읽기 전용 replica 라우팅
+- DB_REPLICA_HOSTS="host1:3306,host2:3306" 설정 시 읽기 엔드포인트를 replica 로 분산(round-robin)
+- 주기 health check: 연결 실패 / 복제 지연(Seconds_Behind_Source) 초과 replica 는 제외
+- 쓰기 직후 N초는 primary 에서 읽기(쿠키 기반 sticky, 프로세스 간 상태 공유 불필요)
+replica 가 없거나 전부 unhealthy 면 primary 로 읽음
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
+
+STICKY_COOKIE = "db_primary_until"
+
+
+@dataclass
+class Replica:
+    index: int
+    host: str
+    port: int
+    engine: Engine
+    healthy: bool = True
+    lag_seconds: Optional[float] = None
+    _async_engine: Optional[AsyncEngine] = field(default=None, repr=False)
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        if self._async_engine is None:
+            settings = get_settings()
+            self._async_engine = create_async_engine(
+                _url(settings.db_async_driver, self.host, self.port),
+                poolclass=InstrumentedAsyncQueuePool,
+                **_replica_pool_kwargs(),
+            )
+            instrument_pool(self._async_engine.sync_engine.pool, f"db.replica{self.index}.async_pool")
+        return self._async_engine
+
+
+def _url(driver: str, host: str, port: int) -> str:
+    settings = get_settings()
+    return (
+        f"mysql+{driver}://{settings.db_user}:{settings.db_password}"
+        f"@{host}:{port}/{settings.db_name}"
+    )
+
+
+def _replica_pool_kwargs() -> dict:
+    settings = get_settings()
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+class ReplicaSet:
+    def __init__(self, hosts: list[tuple[str, int]]) -> None:
+        self.replicas: list[Replica] = []
+        for i, (host, port) in enumerate(hosts):
+            engine = create_engine(
+                _url("pymysql", host, port),
+                poolclass=InstrumentedQueuePool,
+                **_replica_pool_kwargs(),
+            )
+            instrument_pool(engine.pool, f"db.replica{i}.pool")
+            self.replicas.append(Replica(index=i, host=host, port=port, engine=engine))
+        self._rr = itertools.count()
+        self._lock = threading.Lock()
+
+    def pick(self) -> Optional[Replica]:
+        # healthy replica 만 round-robin
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            n = next(self._rr)
+        return healthy[n % len(healthy)]
+
+    def check_health(self) -> None:
+        max_lag = get_settings().db_replica_max_lag_seconds
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    replica.lag_seconds = _replication_lag(conn)
+                replica.healthy = replica.lag_seconds is None or replica.lag_seconds <= max_lag
+            except Exception:
+                replica.healthy = False
+                replica.lag_seconds = None
+            metrics.set_gauge(f"db.replica{replica.index}.healthy", 1 if replica.healthy else 0)
+            if replica.lag_seconds is not None:
+                metrics.set_gauge(f"db.replica{replica.index}.lag_seconds", replica.lag_seconds)
+
+
+def _replication_lag(conn) -> Optional[float]:
+    # MySQL 8.0.22+: SHOW REPLICA STATUS / 이전 버전: SHOW SLAVE STATUS
+    for sql, col in (
+        ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+        ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+    ):
+        try:
+            row = conn.execute(text(sql)).mappings().first()
+        except Exception:
+            continue
+        if row is None:
+            return None                           # 복제 설정이 없는 서버(지연 없음으로 취급)
+        lag = row.get(col)
+        return float(lag) if lag is not None else float("inf")  # NULL = 복제 중단
+    return None
+
+
+_replica_set: ReplicaSet | None = None
+
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    global _replica_set
+    hosts_value = get_settings().db_replica_hosts.strip()
+    if not hosts_value:
+        return None
+    if _replica_set is None:
+        hosts = []
+        for item in hosts_value.split(","):
+            host, _, port = item.strip().partition(":")
+            if host:
+                hosts.append((host, int(port or 3306)))
+        _replica_set = ReplicaSet(hosts)
+    return _replica_set
+
+
+def check_replicas() -> None:  # 스케줄러용
+    replica_set = get_replica_set()
+    if replica_set is not None:
+        replica_set.check_health()
+
+
+def is_sticky(request: Request) -> bool:
+    # 최근에 쓰기를 한 클라이언트면 primary 에서 읽기(복제 지연으로 방금 쓴 데이터 안 보이는 문제 방지)
+    value = request.cookies.get(STICKY_COOKIE)
+    try:
+        return value is not None and float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def mark_write(response: Response) -> None:
+    seconds = get_settings().db_replica_sticky_seconds
+    response.set_cookie(
+        key=STICKY_COOKIE,
+        value=str(int(time.time()) + seconds),
+        max_age=seconds,
+        httponly=True,
+        samesite="lax",
+    )
@@ -0,0 +1,38 @@
+"""
+트랜잭션 재시도
+InnoDB 데드락(1213) / 락 대기 타임아웃(1205)은 트랜잭션 전체를 롤백하고 다시 실행하면 대부분 성공
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, TypeVar
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.db.errors import DEADLOCK, LOCK_WAIT_TIMEOUT, mysql_errno
+
+T = TypeVar("T")
+
+RETRYABLE_MYSQL_ERRORS = {DEADLOCK, LOCK_WAIT_TIMEOUT}
+
+
+def is_retryable(exc: OperationalError) -> bool:
+    return mysql_errno(exc) in RETRYABLE_MYSQL_ERRORS
+
+
+def retry_on_deadlock(db: Session, fn: Callable[..., T], *args, attempts: int = 3) -> T:
+    """fn(db, *args) 를 실행, 데드락이면 롤백 후 짧은 backoff 뒤 재실행(fn 은 처음부터 다시 실행 가능해야 함)"""
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(db, *args)
+        except OperationalError as exc:
+            db.rollback()
+            if not is_retryable(exc) or attempt == attempts:
+                raise
+            metrics.inc("db.deadlock_retries")
+            time.sleep(random.uniform(0.01, 0.05) * attempt)  # 동시에 재시도해서 또 충돌하지 않게
+    raise AssertionError("unreachable")
@@ -2,11 +2,16 @@
 SQLAlchemy DB 세션 설정
 """
 
-from typing import Generator
+from typing import AsyncGenerator, Callable, Generator, TypeVar, Union
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
 from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
+from app.db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
+from app.db.replicas import get_replica_set, is_sticky
 
 settings = get_settings()
 
@@ -15,8 +20,21 @@ DATABASE_URL = (
     f"@{settings.db_host}:{settings.db_port}/{settings.db_name}"
 )
 
+
+def pool_kwargs() -> dict:
+    # 커넥션 풀 설정(Settings 에서 조정)
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,      # MySQL wait_timeout 전에 재연결
+        "pool_pre_ping": settings.db_pool_pre_ping,    # False면 recycle 만으로 끊긴 연결 정리
+    }
+
+
 # DB 엔진 설정
-engine = create_engine(DATABASE_URL, pool_pre_ping=True) #DB 연결 끊겼는지 미리 체크하기
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_kwargs())
+instrument_pool(engine.pool, "db.pool")
 
 #세션 팩토리
 SessionLocal = sessionmaker(
@@ -34,4 +52,103 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _pick_replica(request: Request):
+    # 쓰기 직후(sticky)거나 replica 가 없으면 None → primary
+    replica_set = get_replica_set()
+    if replica_set is None or is_sticky(request):
+        return None
+    return replica_set.pick()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    읽기 전용 엔드포인트용 세션 의존성(replica 로 라우팅)
+    """
+    replica = _pick_replica(request)
+    db = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# async 모드(DB_MODE=async): aiomysql/asyncmy 드라이버로 AsyncSession 사용
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+DbSession = Union[Session, AsyncSession]
+T = TypeVar("T")
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            f"mysql+{settings.db_async_driver}://{settings.db_user}:{settings.db_password}"
+            f"@{settings.db_host}:{settings.db_port}/{settings.db_name}",
+            poolclass=InstrumentedAsyncQueuePool,
+            **pool_kwargs(),
+        )
+        instrument_pool(_async_engine.sync_engine.pool, "db.async_pool")
+        _async_session_factory = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False,                # 커밋 후 속성 접근 시 lazy load(IO) 방지
+        )
+    return _async_engine
+
+
+def is_async_mode() -> bool:
+    return settings.db_mode.lower() == "async"
+
+
+async def get_db_async() -> AsyncGenerator[DbSession, None]:
+    """
+    async 핸들러용 DB 세션 의존성
+    async 모드면 AsyncSession, sync 모드면 기존 Session(닫기는 threadpool 에서)
+    쿼리는 run_db() 로 실행
+    """
+    if is_async_mode():
+        get_async_engine()
+        async with _async_session_factory() as db:
+            yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def get_read_db_async(request: Request) -> AsyncGenerator[DbSession, None]:
+    """
+    async 핸들러용 읽기 전용 세션 의존성(replica 로 라우팅)
+    """
+    replica = _pick_replica(request)
+    if is_async_mode():
+        get_async_engine()
+        bind = replica.async_engine if replica else _async_engine
+        async with _async_session_factory(bind=bind) as db:
+            yield db
+        return
+
+    db = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    fn(session, *args) 를 이벤트 루프를 막지 않고 실행
+    AsyncSession: run_sync(드라이버 IO는 async), Session: threadpool
+    fn 안에서는 평소처럼 sync ORM 코드 사용, 반환값은 DTO/원시값으로(세션 밖 lazy load 방지)
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -0,0 +1,131 @@
+"""
+슬로우 쿼리 기록(프로세스 내부)
+- SQL fingerprint: 리터럴/바인드 파라미터를 ? 로 치환 → LIKE '%kw%' 같은 변형을 한 묶음으로
+- fingerprint 별 count / p50 / p95 / max / 반환 row 수 집계
+- 메모리 상한: fingerprint 개수(LRU) / fingerprint 당 샘플 개수 모두 제한
+- 임계값(ms), 샘플링 비율은 설정값(SLOW_QUERY_*)
+performance_schema 권한 없이 어떤 쿼리/엔드포인트가 MySQL 부하를 만드는지 확인용
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+
+from app.core import metrics
+from app.core.config import get_settings
+
+MAX_SAMPLES = 256                                  # fingerprint 당 백분위 계산용 최근 샘플 수
+MAX_ENDPOINTS = 20                                 # fingerprint 당 기록할 엔드포인트 수
+
+_COMMENT = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.I)
+_WS = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    sql = _COMMENT.sub(" ", statement)
+    sql = _STRING.sub("?", sql)                    # 'abc', '%kw%' → ?
+    sql = _PARAM.sub("?", sql)                     # %s, %(name)s, :name → ?
+    sql = _NUMBER.sub("?", sql)
+    sql = _WS.sub(" ", sql).strip()
+    sql = _IN_LIST.sub("(?)", sql)                 # IN (?, ?, ?) 길이 무시
+    sql = _VALUES_LIST.sub(r"\1", sql)             # 다중 VALUES 행 개수 무시
+    return sql
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows_total: int = 0
+    samples: deque = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+    endpoints: Counter = field(default_factory=Counter)
+
+    def add(self, elapsed_ms: float, rows: int, path: str | None) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows_total += max(rows, 0)
+        self.samples.append(elapsed_ms)
+        if path and (path in self.endpoints or len(self.endpoints) < MAX_ENDPOINTS):
+            self.endpoints[path] += 1
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "totalMs": round(self.total_ms, 1),
+            "avgMs": round(self.total_ms / self.count, 1),
+            "p50Ms": round(_percentile(ordered, 50), 1),
+            "p95Ms": round(_percentile(ordered, 95), 1),
+            "maxMs": round(self.max_ms, 1),
+            "rowsTotal": self.rows_total,
+            "rowsAvg": round(self.rows_total / self.count, 1),
+            "endpoints": dict(self.endpoints.most_common(5)),
+        }
+
+
+def _percentile(ordered: list[float], pct: int) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+
+def record(statement: str, elapsed_ms: float, rows: int, path: str | None = None) -> None:
+    """after_cursor_execute 에서 호출(query_stats)"""
+    settings = get_settings()
+    if not settings.slow_query_log_enabled or elapsed_ms < settings.slow_query_threshold_ms:
+        return
+    if settings.slow_query_sample_rate < 1 and random.random() >= settings.slow_query_sample_rate:
+        return
+
+    fp = fingerprint(statement)
+    with _lock:
+        entry = _entries.get(fp)
+        if entry is None:
+            entry = _entries[fp] = _Entry(fingerprint=fp)
+            while len(_entries) > settings.slow_query_max_fingerprints:
+                _entries.popitem(last=False)       # 가장 오래 안 나온 fingerprint 제거
+        else:
+            _entries.move_to_end(fp)
+        entry.add(elapsed_ms, rows, path)
+
+    metrics.inc("db.slow_queries")
+    print(f"[SLOW] {elapsed_ms:.1f}ms {path or '-'} {fp[:200]}")
+
+
+_SORT_KEYS = {
+    "total": lambda e: e.total_ms,
+    "count": lambda e: e.count,
+    "max": lambda e: e.max_ms,
+    "p95": lambda e: _percentile(sorted(e.samples), 95),
+    "rows": lambda e: e.rows_total,
+}
+
+
+def top(limit: int = 20, sort: str = "total") -> list[dict]:
+    key = _SORT_KEYS.get(sort, _SORT_KEYS["total"])
+    with _lock:
+        entries = sorted(_entries.values(), key=key, reverse=True)[:limit]
+        return [e.to_dict() for e in entries]
+
+
+def reset() -> None:
+    with _lock:
+        _entries.clear()
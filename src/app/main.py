@@ -12,15 +12,24 @@ from datetime import datetime, timezone
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import HTTPException, RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from slowapi import Limiter
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.concurrency import iterate_in_threadpool
 
 from app.api.routes import auth, users, books, carts, orders, favorites, reviews, admin
+from app.core import hot_stock, idempotency, order_archive, outbox
+from app.core.config import get_settings
 from app.core.error_code import ErrorCode
 from app.core.errors import ApiException
+from app.core.oauth_client import close_http_client
+from app.core.revocation_filter import sync_revocation_filter
+from app.core.scheduler import register_periodic, start_scheduler, stop_scheduler
+from app.core.token_purge import run_refresh_token_purge
+from app.db import query_stats
+from app.db.replicas import check_replicas, mark_write
 from app.schemas.response import now_utc_iso
 
 
@@ -42,6 +51,54 @@ app.state.limiter = limiter
 app.add_middleware(SlowAPIMiddleware)
 
 
+@app.on_event("startup")
+def start_periodic_tasks():
+    # 주기 작업 등록 후 백그라운드 스레드 시작
+    settings = get_settings()
+    if not settings.job_queue_enabled:             # 큐 모드: purge/아카이브/relay/재고 복구는 worker 가 한 번만 실행
+        register_periodic(
+            "refresh_token_purge",
+            settings.refresh_token_purge_interval_seconds,
+            run_refresh_token_purge,
+        )
+        register_periodic(
+            "idempotency_key_purge",
+            settings.idempotency_purge_interval_seconds,
+            idempotency.purge_expired_idempotency_keys,
+        )
+        register_periodic("outbox_purge", settings.outbox_purge_interval_seconds, outbox.purge_published_outbox)
+        register_periodic("order_archive", settings.order_archive_interval_seconds, order_archive.archive_orders)
+        register_periodic(
+            "hot_stock_reconcile",
+            settings.hot_stock_reconcile_seconds,
+            hot_stock.reconcile,
+        )
+        register_periodic("outbox_relay", settings.outbox_relay_interval_seconds, outbox.relay_outbox)
+    if settings.revocation_bloom_enabled:
+        register_periodic(
+            "revocation_filter_sync",
+            settings.revocation_bloom_sync_seconds,
+            sync_revocation_filter,
+        )
+    if settings.db_replica_hosts:
+        register_periodic(
+            "replica_health",
+            settings.db_replica_health_interval_seconds,
+            check_replicas,
+        )
+    start_scheduler()
+
+
+@app.on_event("shutdown")
+def stop_periodic_tasks():
+    stop_scheduler()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await close_http_client()                      # OAuth 공용 HTTP 커넥션 풀 정리
+
+
 def _error_payload(
     request: Request,
     status_code: int,
@@ -73,14 +130,91 @@ async def ratelimit_exception_handler(request: Request, exc: RateLimitExceeded):
     )
 
 
+@app.middleware("http")
+async def idempotency_key(request: Request, call_next):
+    # Idempotency-Key 헤더가 있는 POST: 첫 응답 저장, 재시도는 저장된 응답 재전송(/api/auth 제외)
+    key = request.headers.get(idempotency.HEADER)
+    if (
+        not key
+        or request.method != "POST"
+        or request.url.path.startswith("/api/auth")
+        or not get_settings().idempotency_enabled
+    ):
+        return await call_next(request)
+
+    if len(key) > idempotency.MAX_KEY_LENGTH:
+        return JSONResponse(
+            status_code=400,
+            content=_error_payload(request, 400, ErrorCode.BAD_REQUEST, "Idempotency-Key 가 너무 깁니다."),
+        )
+
+    user_id = idempotency.user_scope(request)
+    if user_id is None:
+        return await call_next(request)
+
+    body = await request.body()
+    req_hash = idempotency.request_hash(request.method, request.url.path, request.url.query, body)
+    try:
+        stored = await idempotency.begin(user_id, key, req_hash)
+    except ApiException as exc:
+        return JSONResponse(
+            status_code=exc.status,
+            content=_error_payload(request, exc.status, exc.code, exc.message, exc.details),
+        )
+    if stored is not None:
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type=stored.content_type,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    try:
+        response = await call_next(request)
+        response_body = b"".join([chunk async for chunk in response.body_iterator])
+    except BaseException:
+        await idempotency.abort(user_id, key)
+        raise
+
+    await idempotency.complete(
+        user_id, key, request.method, request.url.path, req_hash,
+        response.status_code, response_body, response.headers.get("content-type"),
+    )
+    response.body_iterator = iterate_in_threadpool(iter([response_body]))  # 이미 읽은 body 다시 흘려보냄
+    return response
+
+
+@app.middleware("http")
+async def replica_sticky_after_write(request: Request, call_next):
+    # 쓰기 성공 후 N초 동안은 읽기도 primary 로(replica 복제 지연 대비)
+    response = await call_next(request)
+    if (
+        request.method in ("POST", "PUT", "PATCH", "DELETE")
+        and response.status_code < 400
+        and get_settings().db_replica_hosts
+    ):
+        mark_write(response)
+    return response
+
+
 @app.middleware("http")
 async def log_request(request: Request, call_next):
     start = time.perf_counter()
+    token = query_stats.start_request(request.url.path)  # 요청 단위 쿼리 수/DB 시간 집계
+    stats = None
     try:
-        return await call_next(request)
+        response = await call_next(request)
+        stats = query_stats.current_stats()
+        if stats is not None and get_settings().debug:
+            response.headers["X-DB-Queries"] = str(stats.count)
+            response.headers["X-DB-Time"] = f"{stats.total_ms:.1f}ms"
+        return response
     finally:
+        stats = stats or query_stats.current_stats()
+        query_stats.end_request(token)
         elapsed_ms = (time.perf_counter() - start) * 1000
-        print(f"[REQ] {request.method} {request.url.path} ({elapsed_ms:.1f}ms)")
+        queries = f", {stats.count} queries {stats.total_ms:.1f}ms" if stats else ""
+        print(f"[REQ] {request.method} {request.url.path} ({elapsed_ms:.1f}ms{queries})")
 
 
 @app.exception_handler(ApiException)
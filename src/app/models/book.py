@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, false
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -18,6 +18,7 @@ class Book(Base):
 
     price = Column(Integer, nullable=False, default=0)
     stock = Column(Integer, nullable=False, default=0)
+    hot_stock = Column(Boolean, nullable=False, default=False, server_default=false())  # True면 재고는 Redis 카운터(core/hot_stock)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+IdempotencyKey 모델
+Idempotency-Key 헤더로 처리한 POST 응답 보관(Redis TTL 만료/유실 후에도 재시도가 같은 응답 받도록)
+(user_id, idem_key) unique → 같은 키로 두 번 실행 불가
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects import mysql
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "idem_key", name="uq_idempotency_user_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    idem_key = Column(String(255), nullable=False)
+
+    request_hash = Column(String(64), nullable=False)   # method+path+body sha256(같은 키 다른 요청 검출)
+    method = Column(String(10), nullable=False)
+    path = Column(String(255), nullable=False)
+
+    status_code = Column(Integer, nullable=False)
+    content_type = Column(String(100), nullable=True)
+    response_body = Column(Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # 만료 행 정리용
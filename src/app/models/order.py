@@ -3,7 +3,7 @@ rder / OrderItem 모델
 주문 1건은 여러 주문 아이템을 가진다.
 """
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -12,12 +12,21 @@ from app.db.base import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        UniqueConstraint("stock_reservation_id", name="uq_orders_stock_reservation_id"),
+        Index("ix_orders_user_created", "user_id", "created_at", "id"),  # 내 주문 목록 keyset 페이지네이션
+        CheckConstraint(
+            "status IN ('CREATED', 'PAID', 'SHIPPED', 'DELIVERED', 'CANCELLED')",
+            name="ck_orders_status",
+        ),                                                  # 전이 규칙은 core/order_status
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     status = Column(String(30), nullable=False, default="CREATED", index=True)
     total_price = Column(Integer, nullable=False, default=0)
+    stock_reservation_id = Column(String(32), nullable=True)  # hot stock 예약 토큰(reconciler 가 주문 존재 확인)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
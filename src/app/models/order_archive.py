@@ -0,0 +1,43 @@
+"""
+주문 콜드 아카이브 모델
+- ArchivedOrder: 아카이브된 주문 헤더(목록 정렬/필터, 상세 조회 위치 찾기용, 좁은 행)
+- OrderArchive : 사용자-월 단위 주문+아이템 묶음(zlib 압축 JSON)
+orders / order_items 에서 오래된 종료 상태 주문을 옮겨 hot 테이블을 작게 유지(core/order_archive)
+"""
+
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.dialects import mysql
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ArchivedOrder(Base):
+    __tablename__ = "archived_orders"
+    __table_args__ = (
+        Index("ix_archived_orders_user_created", "user_id", "created_at", "id"),  # 내 주문 목록(orders 와 같은 keyset)
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)   # 원래 orders.id
+    user_id = Column(Integer, nullable=False)
+    status = Column(String(30), nullable=False)
+    total_price = Column(Integer, nullable=False, default=0)
+    period = Column(String(7), nullable=False)                     # YYYY-MM → order_archives 묶음
+
+    created_at = Column(DateTime(timezone=True), nullable=False)   # 원래 주문 시각
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class OrderArchive(Base):
+    __tablename__ = "order_archives"
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", name="uq_order_archives_user_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    period = Column(String(7), nullable=False)
+    order_count = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql"), nullable=False)  # zlib(JSON)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
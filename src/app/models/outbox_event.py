@@ -0,0 +1,26 @@
+"""
+OutboxEvent 모델(transactional outbox)
+주문/도서 변경과 같은 트랜잭션에서 이벤트 행을 insert → relay 가 Redis Streams 로 발행
+(DB 커밋과 메시지 발행을 따로 하다 한쪽만 성공하는 문제 없음)
+"""
+
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index("ix_outbox_events_unpublished", "published_at", "id"),  # relay: 미발행 행을 id 순서로
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    aggregate_type = Column(String(30), nullable=False)      # order / book
+    aggregate_id = Column(Integer, nullable=False)
+    event_type = Column(String(50), nullable=False)          # order.created, book.updated ...
+    payload = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=True)
@@ -3,7 +3,7 @@ Refresh Token을 DB에 저장해 로그아웃/재발급 시 revoke 할 수 있
 토큰 문자열 자체는 저장하지 않고(jti만 저장)
 """
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -11,6 +11,10 @@ from app.db.base import Base
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # 사용자별 활성 세션 조회 / 전체 폐기용
+        Index("ix_refresh_tokens_user_active", "user_id", "is_revoked", "expires_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -19,7 +23,7 @@ class RefreshToken(Base):
     # 토큰 자체를 저장하지 않고(유출 위험), jti만 저장해서 “유효 토큰인지” 체크
     jti = Column(String(64), unique=True, nullable=False, index=True)
 
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # 만료 행 정리(purge)용
     revoked_at = Column(DateTime(timezone=True), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
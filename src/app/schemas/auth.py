@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 
 
@@ -24,4 +26,11 @@ class TokenResponse(BaseModel):  # 로그인/재발급 응답용 토큰 묶음
         }
     )
     accessToken: str
-    refreshToken: str
\ No newline at end of file
+    refreshToken: str
+
+
+class SessionResponse(BaseModel):  # 로그인 세션(refresh token) 목록 항목
+    id: int
+    createdAt: datetime
+    expiresAt: datetime
+    current: bool = False  # 요청한 쿠키의 refresh token 여부
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+from typing import List, Literal
+
 from pydantic import BaseModel, Field
 
+MAX_QUANTITY = 999                # 장바구니 도서별 최대 수량(담기 누적도 여기까지)
+
 
 class CartItemCreate(BaseModel):  # 장바구니 담기 요청 DTO
     bookId: int = Field(..., ge=1)
-    quantity: int = Field(default=1, ge=1, le=999)
+    quantity: int = Field(default=1, ge=1, le=MAX_QUANTITY)
 
 
 class CartItemUpdate(BaseModel):  # 장바구니 수량 변경 요청 DTO
-    quantity: int = Field(..., ge=1, le=999)
+    quantity: int = Field(..., ge=1, le=MAX_QUANTITY)
+
+
+class CartBatchItem(BaseModel):  # 장바구니 일괄 변경 아이템(set: 수량 지정 / increment: 누적 / remove: 삭제)
+    bookId: int = Field(..., ge=1)
+    quantity: int = Field(default=1, ge=0, le=MAX_QUANTITY)   # set 0 = 삭제, remove 는 무시
+    op: Literal["set", "increment", "remove"] = "increment"
+
+
+class CartBatchUpdate(BaseModel):  # 장바구니 일괄 변경 요청 DTO(같은 bookId 는 순서대로 합쳐서 적용)
+    items: List[CartBatchItem] = Field(..., min_length=1, max_length=100)
 
 
 class CartItemResponse(BaseModel):  # 장바구니 아이템 응답 DTO
@@ -19,4 +33,22 @@ class CartItemResponse(BaseModel):  # 장바구니 아이템 응답 DTO
     quantity: int
 
     class Config:  # ORM 객체 응답 변환 허용
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CartItemDetailResponse(BaseModel):  # 장바구니 아이템 + 도서 스냅샷(includeBook=true)
+    id: int
+    userId: int
+    bookId: int
+    quantity: int
+    title: str
+    price: int
+    stock: int
+    available: bool                               # 재고 >= 수량(표시용, 최종 확인은 체크아웃)
+    subtotal: int                                 # price * quantity
+
+
+class CartDetailResponse(BaseModel):  # 장바구니 상세 + 합계
+    items: List[CartItemDetailResponse]
+    totalQuantity: int
+    totalPrice: int
+    allAvailable: bool
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -27,8 +27,17 @@ class OrderCreate(BaseModel):  # 주문 생성 요청 DTO
     items: List[OrderItemCreate] = Field(..., min_length=1)
 
 
+OrderStatus = Literal["CREATED", "PAID", "SHIPPED", "DELIVERED", "CANCELLED"]  # core/order_status 전이표와 동일
+
+
 class OrderStatusUpdate(BaseModel):  # 주문 상태 변경 요청 DTO(ADMIN)
-    status: str = Field(..., min_length=1, max_length=30)
+    status: OrderStatus
+
+
+class OrderBulkStatusUpdate(BaseModel):  # 주문 상태 일괄 변경 요청 DTO(ADMIN)
+    orderIds: List[int] = Field(..., min_length=1, max_length=5000)
+    fromStatus: Optional[OrderStatus] = None   # 지정하면 이 상태인 주문만 변경
+    toStatus: OrderStatus
 
 
 class OrderItemResponse(BaseModel):  # 주문 아이템 응답 DTO
@@ -0,0 +1,98 @@
+"""
+백그라운드 작업 worker(JOB_QUEUE_ENABLED=true 일 때 API 와 별도 프로세스로 실행)
+python -m app.worker [--queues default] [--concurrency 4] [--no-schedule]
+- 작업 스레드 N개: 큐에서 꺼내 실행(core.jobs)
+- 관리 스레드 1개: 재시도 대기 작업 이동 / 죽은 worker 작업 회수 / 주기 작업 enqueue
+purge/주문 아카이브/outbox relay/hot stock 복구 같은 전역 주기 작업은 큐 모드에서는 API 프로세스가 아니라 여기서 한 번만 실행
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import threading
+import traceback
+
+from app.core import hot_stock, idempotency, jobs, order_archive, outbox
+from app.core.config import get_settings
+from app.core.token_purge import run_refresh_token_purge
+from app.core import token_store  # noqa: F401  refresh token 감사 로그 작업 등록
+
+MAINTENANCE_SECONDS = 1.0
+
+refresh_token_purge = jobs.job("refresh_token_purge", retries=0)(run_refresh_token_purge)
+idempotency_key_purge = jobs.job("idempotency_key_purge", retries=0)(idempotency.purge_expired_idempotency_keys)
+outbox_purge = jobs.job("outbox_purge", retries=0)(outbox.purge_published_outbox)
+order_archive_job = jobs.job("order_archive", retries=0)(order_archive.archive_orders)
+outbox_relay = jobs.job("outbox_relay", retries=0)(outbox.relay_outbox)
+hot_stock_reconcile = jobs.job("hot_stock_reconcile", retries=0)(hot_stock.reconcile)
+
+
+def register_schedules() -> None:
+    settings = get_settings()
+    jobs.schedule("refresh_token_purge", settings.refresh_token_purge_interval_seconds, refresh_token_purge)
+    jobs.schedule("idempotency_key_purge", settings.idempotency_purge_interval_seconds, idempotency_key_purge)
+    jobs.schedule("outbox_purge", settings.outbox_purge_interval_seconds, outbox_purge)
+    jobs.schedule("order_archive", settings.order_archive_interval_seconds, order_archive_job)
+    jobs.schedule("outbox_relay", settings.outbox_relay_interval_seconds, outbox_relay)
+    jobs.schedule("hot_stock_reconcile", settings.hot_stock_reconcile_seconds, hot_stock_reconcile)
+
+
+def _work_loop(queues: list[str], stop: threading.Event) -> None:
+    timeout = max(MAINTENANCE_SECONDS / len(queues), 0.1)
+    while not stop.is_set():
+        for queue in queues:
+            try:
+                job_id = jobs.claim(queue, timeout)
+                if job_id:
+                    jobs.execute(job_id, queue)
+            except Exception:
+                traceback.print_exc()
+                stop.wait(MAINTENANCE_SECONDS)      # Redis 장애 등 → 잠깐 쉬고 재시도
+
+
+def _maintenance_loop(queues: list[str], stop: threading.Event, with_schedule: bool) -> None:
+    while not stop.wait(MAINTENANCE_SECONDS):
+        try:
+            jobs.promote_delayed()
+            jobs.requeue_stale(queues)
+            if with_schedule:
+                jobs.fire_schedules()
+        except Exception:
+            traceback.print_exc()
+
+
+def run(queues: list[str], concurrency: int, with_schedule: bool = True) -> None:
+    if with_schedule:
+        register_schedules()
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())  # 진행 중 작업은 끝내고 종료
+
+    threads = [
+        threading.Thread(target=_work_loop, args=(queues, stop), name=f"job-worker-{i}")
+        for i in range(concurrency)
+    ]
+    threads.append(
+        threading.Thread(target=_maintenance_loop, args=(queues, stop, with_schedule), name="job-maintenance")
+    )
+    for t in threads:
+        t.start()
+    print(f"[WORKER] queues={queues} concurrency={concurrency} schedule={with_schedule}")
+    for t in threads:
+        t.join()
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m app.worker")
+    parser.add_argument("--queues", default="default", help="쉼표로 구분한 큐 이름")
+    parser.add_argument("--concurrency", type=int, default=settings.job_worker_concurrency)
+    parser.add_argument("--no-schedule", action="store_true", help="주기 작업 enqueue 안 함")
+    args = parser.parse_args()
+    queues = [q.strip() for q in args.queues.split(",") if q.strip()]
+    run(queues, max(args.concurrency, 1), with_schedule=not args.no_schedule)
+
+
+if __name__ == "__main__":
+    main()
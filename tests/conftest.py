@@ -4,6 +4,19 @@ import uuid
 import pytest
 import requests
 
+# 단위 테스트(app 모듈 import)용 필수 설정 기본값, 실제 DB/Redis 에는 연결 안 함
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+    "JWT_SECRET": "test-secret",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+TEST_PASSWORD = "P@ssw0rd!"
+
 def _base_url() -> str:
     return os.getenv("BASE_URL", "http://113.198.66.68:10099").rstrip("/")
 
@@ -39,4 +52,29 @@ def extract_access_token(resp_json: dict) -> str:
     return payload.get("accessToken") or ""
 
 def auth_header(access_token: str) -> dict:
-    return {"Authorization": f"Bearer {access_token}"}
\ No newline at end of file
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+def assert_query_budget(resp, budget: int) -> None:
+    # 서버가 DEBUG=true 일 때만 X-DB-Queries 헤더가 옴 → 없으면 skip
+    value = resp.headers.get("X-DB-Queries")
+    if value is None:
+        pytest.skip("X-DB-Queries 헤더 없음(서버 DEBUG 모드 아님)")
+    assert int(value) <= budget, f"쿼리 {value}개 > 예산 {budget}개 ({resp.request.method} {resp.url})"
+
+@pytest.fixture
+def query_budget():
+    return assert_query_budget
+
+@pytest.fixture
+def logged_in_user(session, base_url, unique_email) -> dict:
+    # 회원가입 + 로그인(session 에 refresh 쿠키), 로그인 응답/토큰/헤더 반환
+    api_post(session, base_url, "/api/users", json={
+        "email": unique_email,
+        "name": "테스트",
+        "password": TEST_PASSWORD
+    })
+    login = api_post(session, base_url, "/api/auth/login", json={"email": unique_email, "password": TEST_PASSWORD})
+    assert login.status_code == 200
+    token = extract_access_token(login.json())
+    return {"email": unique_email, "login": login, "token": token, "headers": auth_header(token)}
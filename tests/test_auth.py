@@ -1,4 +1,4 @@
-# 인증 테스트 8개
+# 인증 테스트 9개
 from tests.conftest import api_post, api_get, extract_access_token, auth_header
 
 def test_signup_200(session, base_url, unique_email):
@@ -96,4 +96,27 @@ def test_bearer_with_quotes_fails_401(session, base_url, unique_email):
     })
     at = extract_access_token(login.json())
     r = api_get(session, base_url, "/api/users/me", headers={"Authorization": f'Bearer "{at}"'})
-    assert r.status_code in (401, 403)
\ No newline at end of file
+    assert r.status_code in (401, 403)
+
+def test_login_locked_after_repeated_failures_429(session, base_url, unique_email):
+    api_post(session, base_url, "/api/users", json={
+        "email": unique_email,
+        "name": "테스트",
+        "password": "P@ssw0rd!"
+    })
+    codes = []
+    for _ in range(6):
+        r = api_post(session, base_url, "/api/auth/login", json={
+            "email": unique_email,
+            "password": "WRONG!!"
+        })
+        codes.append(r.status_code)
+    # 계정 기준 실패 한도(기본 5회) 넘으면 잠금
+    assert 429 in codes
+
+    # 잠금 중에는 올바른 비밀번호도 bcrypt 전에 차단
+    r = api_post(session, base_url, "/api/auth/login", json={
+        "email": unique_email,
+        "password": "P@ssw0rd!"
+    })
+    assert r.status_code == 429
@@ -0,0 +1,34 @@
+# 세션 목록 / 전체 로그아웃 4개
+import requests
+
+from tests.conftest import TEST_PASSWORD, api_post, api_get, auth_header
+
+def test_sessions_requires_auth_401(session, base_url):
+    r = api_get(session, base_url, "/api/auth/sessions")
+    assert r.status_code == 401
+
+def test_sessions_lists_current_session(session, base_url, logged_in_user):
+    r = api_get(session, base_url, "/api/auth/sessions", headers=logged_in_user["headers"])
+    assert r.status_code == 200
+    items = r.json().get("payload") or []
+    assert any(x.get("current") for x in items)
+
+def test_logout_all_revokes_access_token(session, base_url, logged_in_user):
+    at = logged_in_user["token"]
+    r = api_post(session, base_url, "/api/auth/logout-all", headers=auth_header(at))
+    assert r.status_code == 200
+
+    # 이전 세대 access token은 바로 막힘
+    me = api_get(session, base_url, "/api/users/me", headers=auth_header(at))
+    assert me.status_code == 401
+
+def test_logout_all_revokes_other_refresh_tokens(session, base_url, logged_in_user):
+    # 다른 기기(세션)에서도 로그인
+    other = requests.Session()
+    api_post(other, base_url, "/api/auth/login", json={"email": logged_in_user["email"], "password": TEST_PASSWORD})
+
+    api_post(session, base_url, "/api/auth/logout-all", headers=logged_in_user["headers"])
+
+    r = api_post(other, base_url, "/api/auth/reissue")
+    assert r.status_code == 401
+    other.close()
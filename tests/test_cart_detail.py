@@ -0,0 +1,9 @@
+# 장바구니 상세(includeBook) 1개
+from tests.conftest import api_get
+
+def test_cart_detail_empty_totals(session, base_url, logged_in_user):
+    r = api_get(session, base_url, "/api/items?includeBook=true", headers=logged_in_user["headers"])
+    assert r.status_code == 200
+    payload = r.json()["payload"]
+    assert payload["items"] == []
+    assert payload["totalPrice"] == 0
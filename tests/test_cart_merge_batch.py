@@ -0,0 +1,35 @@
+# 장바구니 일괄 변경 merge_batch 테스트 4개 (서버 없음)
+from app.db.base import Base  # noqa: F401  모델 import 순서(app.models ↔ app.db.base)
+from app.core.cart_store import merge_batch
+from app.schemas.cart import MAX_QUANTITY, CartBatchItem
+
+
+def _items(*specs):
+    return [CartBatchItem(bookId=book_id, op=op, quantity=quantity) for book_id, op, quantity in specs]
+
+
+def test_increments_on_same_book_are_summed():
+    merged = merge_batch(_items((1, "increment", 2), (2, "increment", 1), (1, "increment", 3)))
+    assert merged == {1: ("increment", 5), 2: ("increment", 1)}
+
+
+def test_set_and_remove_then_increment_become_set():
+    merged = merge_batch(_items(
+        (1, "set", 4), (1, "increment", 2),           # set 뒤 increment → 합친 수량으로 set
+        (2, "remove", 0), (2, "increment", 3),        # remove 뒤 increment → 그 수량으로 set
+        (3, "increment", 5), (3, "set", 1),           # 마지막 set 이 이김
+    ))
+    assert merged == {1: ("set", 6), 2: ("set", 3), 3: ("set", 1)}
+
+
+def test_set_zero_is_remove_and_increment_zero_is_ignored():
+    merged = merge_batch(_items((1, "set", 0), (2, "increment", 0), (3, "remove", 7)))
+    assert merged == {1: ("remove", 0), 3: ("remove", 0)}
+
+
+def test_merged_quantity_is_capped():
+    merged = merge_batch(_items(
+        (1, "increment", MAX_QUANTITY), (1, "increment", MAX_QUANTITY),
+        (2, "set", MAX_QUANTITY), (2, "increment", 1),
+    ))
+    assert merged == {1: ("increment", MAX_QUANTITY), 2: ("set", MAX_QUANTITY)}
@@ -0,0 +1,93 @@
+# hot stock 예약 복구 테스트 3개 (fakeredis + SQLite, 서버 없음)
+import threading
+import time
+
+import fakeredis
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql.dml import Update
+
+from app.db.base import Base  # 모델 전체 등록(먼저 import)
+from app.core import hot_stock
+from app.core.stock import reserve_stock
+from app.models.book import Book
+from app.models.order import Order
+from app.models.user import User
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    r = fakeredis.FakeRedis(decode_responses=True)
+    engine = create_engine(f"sqlite:///{tmp_path / 'hot.db'}", connect_args={"check_same_thread": False, "timeout": 10})
+    Base.metadata.create_all(engine, tables=[User.__table__, Book.__table__, Order.__table__])
+    monkeypatch.setattr(hot_stock, "get_redis", lambda: r)
+    monkeypatch.setattr(hot_stock, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(hot_stock, "_take_script", None)
+    monkeypatch.setattr(hot_stock, "_put_script", None)
+    r.set(hot_stock._shards_key(1), 1)
+    r.set(hot_stock._shard_key(1, 0), 10)
+    yield r
+    engine.dispose()
+
+
+def _stale_reservation(r, quantity):
+    reservation, short, cold = hot_stock.reserve({1: quantity})
+    assert not short and not cold
+    r.zadd(hot_stock.PENDING_KEY, {reservation.token: time.time() - 3600})   # timeout 지난 예약
+    return reservation
+
+
+def test_concurrent_reconcile_restores_once(env):
+    _stale_reservation(env, 3)
+    assert hot_stock.available(1) == 7
+
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def run():
+        try:
+            barrier.wait()
+            hot_stock.reconcile()
+        except Exception as exc:    # 스레드 예외는 메인에서 확인
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert hot_stock.available(1) == 10
+    assert env.zcard(hot_stock.PENDING_KEY) == 0
+
+
+def test_release_after_reconcile_is_noop(env):
+    reservation = _stale_reservation(env, 4)
+    hot_stock.reconcile()
+    hot_stock.release(reservation)  # 늦게 실패한 요청이 또 복구하면 안 됨
+    assert hot_stock.available(1) == 10
+
+
+def test_cold_update_failure_releases_hot_reservation(env):
+    db = hot_stock.SessionLocal()                       # env 가 SQLite 로 바꿔 둔 세션
+    db.add_all([
+        Book(id=1, title="hot", author="a", price=1000, stock=0, hot_stock=True),
+        Book(id=2, title="cold", author="a", price=1000, stock=5),
+    ])
+    db.commit()
+    execute = db.execute
+
+    def failing_execute(statement, *args, **kwargs):
+        if isinstance(statement, Update):
+            raise OperationalError("UPDATE books", {}, Exception("Deadlock found"))  # 재시도 대상 오류
+        return execute(statement, *args, **kwargs)
+
+    db.execute = failing_execute
+    with pytest.raises(OperationalError):
+        reserve_stock(db, [(1, 3), (2, 1)])
+    assert hot_stock.available(1) == 10                 # 재시도 전에 shard 복구
+    assert env.zcard(hot_stock.PENDING_KEY) == 0
+    db.close()
@@ -0,0 +1,18 @@
+# Idempotency-Key 재시도 처리 2개
+import uuid
+
+from tests.conftest import api_post
+
+def test_same_key_replays_first_response(session, base_url, logged_in_user):
+    headers = {**logged_in_user["headers"], "Idempotency-Key": uuid.uuid4().hex}
+    body = {"items": [{"bookId": 999999999, "quantity": 1}]}
+    first = api_post(session, base_url, "/api/orders", json=body, headers=headers)
+    second = api_post(session, base_url, "/api/orders", json=body, headers=headers)
+    assert second.status_code == first.status_code
+    assert second.headers.get("Idempotent-Replayed") == "true"
+
+def test_same_key_different_body_422(session, base_url, logged_in_user):
+    headers = {**logged_in_user["headers"], "Idempotency-Key": uuid.uuid4().hex}
+    api_post(session, base_url, "/api/orders", json={"items": [{"bookId": 999999999, "quantity": 1}]}, headers=headers)
+    r = api_post(session, base_url, "/api/orders", json={"items": [{"bookId": 999999999, "quantity": 2}]}, headers=headers)
+    assert r.status_code == 422
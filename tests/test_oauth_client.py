@@ -0,0 +1,142 @@
+# OAuth provider 클라이언트 테스트 7개 (로컬 stub 서버 사용, 네이버 호출 없음)
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.core import oauth_client
+from app.core.oauth_client import CircuitBreaker, NaverProvider, OAuthError
+
+
+class _StubNaver(BaseHTTPRequestHandler):
+    # fail_tokens 만큼 /token 에서 500을 돌려준 뒤 정상 응답
+    fail_tokens = 0
+    html_tokens = False                          # True 면 /token 이 200 + HTML
+    calls = 0
+
+    def do_GET(self):
+        cls = type(self)
+        if self.path.startswith("/token"):
+            cls.calls += 1
+            if cls.fail_tokens > 0:
+                cls.fail_tokens -= 1
+                return self._send(500, {"error": "temporary"})
+            if cls.html_tokens:
+                return self._send_raw(200, b"<html>maintenance</html>", "text/html")
+            return self._send(200, {"access_token": "stub-access"})
+        if self.path.startswith("/me"):
+            if self.headers.get("Authorization") != "Bearer stub-access":
+                return self._send(401, {"error": "unauthorized"})
+            return self._send(200, {"response": {"id": "n-1", "email": "stub@naver.com", "name": "스텁"}})
+        return self._send(404, {})
+
+    def _send(self, status, body):
+        self._send_raw(status, json.dumps(body).encode(), "application/json")
+
+    def _send_raw(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _StubNaver.fail_tokens = 0
+    _StubNaver.html_tokens = False
+    _StubNaver.calls = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubNaver)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _provider(base):
+    return NaverProvider(
+        client_id="cid",
+        client_secret="secret",
+        redirect_uri="http://localhost/callback",
+        token_url=f"{base}/token",
+        profile_url=f"{base}/me",
+        client=httpx.AsyncClient(timeout=2.0),
+    )
+
+
+def test_naver_exchange_and_profile(stub_server):
+    p = _provider(stub_server)
+
+    async def run():
+        token = await p.exchange_code("code", "state")
+        return await p.fetch_profile(token)
+
+    profile = asyncio.run(run())
+    assert profile.provider == "NAVER"
+    assert profile.provider_id == "n-1"
+    assert profile.email == "stub@naver.com"
+
+
+def test_naver_retries_on_5xx(stub_server):
+    _StubNaver.fail_tokens = 2
+    p = _provider(stub_server)
+    token = asyncio.run(p.exchange_code("code", "state"))
+    assert token == "stub-access"
+    assert _StubNaver.calls == 3
+
+
+def test_naver_gives_up_after_retries(stub_server):
+    _StubNaver.fail_tokens = 10
+    p = _provider(stub_server)
+    with pytest.raises(OAuthError):
+        asyncio.run(p.exchange_code("code", "state"))
+
+
+def test_exhausted_retries_count_as_one_breaker_failure(stub_server):
+    _StubNaver.fail_tokens = 10
+    p = _provider(stub_server)
+    p.breaker.threshold = 2
+    with pytest.raises(OAuthError):
+        asyncio.run(p.exchange_code("code", "state"))
+    assert _StubNaver.calls == 3                 # 재시도 2번 포함
+    assert p.breaker.failures == 1
+    assert p.breaker.allow()                     # 논리 호출 1번 실패로는 아직 안 열림
+
+
+def test_circuit_breaker_opens_and_blocks():
+    breaker = CircuitBreaker("test", threshold=2, reset_seconds=60)
+    assert breaker.allow()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_naver_non_json_200_is_provider_error(stub_server):
+    _StubNaver.html_tokens = True
+    p = _provider(stub_server)
+    with pytest.raises(OAuthError):
+        asyncio.run(p.exchange_code("code", "state"))
+
+
+def test_circuit_breaker_half_open_allows_single_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(oauth_client.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test", threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    now[0] += 31
+    assert breaker.allow()          # 시험 호출 1개만
+    assert not breaker.allow()      # 결과가 나올 때까지 나머지는 차단
+    breaker.record_failure()        # 시험 실패 → 다시 open
+    assert not breaker.allow()
+    now[0] += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
@@ -0,0 +1,32 @@
+# 주문 상태 전이 표(TRANSITIONS) 테스트 3개 (서버 없음)
+from app.db.base import Base  # noqa: F401  모델 import 순서(app.models ↔ app.db.base)
+from app.core.order_status import (
+    CANCELLED,
+    CREATED,
+    DELIVERED,
+    PAID,
+    SHIPPED,
+    STATUSES,
+    TERMINAL_STATUSES,
+    TRANSITIONS,
+    sources_for,
+)
+
+
+def test_every_status_has_transitions_within_statuses():
+    assert set(TRANSITIONS) == set(STATUSES)
+    assert all(targets <= set(STATUSES) for targets in TRANSITIONS.values())
+    assert all(status not in TRANSITIONS[status] for status in STATUSES)   # 같은 상태로 전이 없음
+
+
+def test_cancel_only_before_shipping_and_terminal_statuses():
+    assert sources_for(CANCELLED) == {CREATED, PAID}
+    assert sources_for(SHIPPED) == {PAID}
+    assert sources_for(DELIVERED) == {SHIPPED}
+    assert sources_for(CREATED) == set()
+    assert set(TERMINAL_STATUSES) == {DELIVERED, CANCELLED}
+
+
+def test_happy_path_reaches_delivered():
+    path = [CREATED, PAID, SHIPPED, DELIVERED]
+    assert all(b in TRANSITIONS[a] for a, b in zip(path, path[1:]))
@@ -0,0 +1,10 @@
+# 장바구니 체크아웃 2개
+from tests.conftest import api_post
+
+def test_checkout_requires_auth_401(session, base_url):
+    r = api_post(session, base_url, "/api/orders/checkout")
+    assert r.status_code == 401
+
+def test_checkout_empty_cart_400(session, base_url, logged_in_user):
+    r = api_post(session, base_url, "/api/orders/checkout", headers=logged_in_user["headers"])
+    assert r.status_code == 400
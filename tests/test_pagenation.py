@@ -0,0 +1,25 @@
+# keyset cursor encode/decode 테스트 2개 (서버 없음)
+from datetime import datetime
+
+import pytest
+
+from app.db.base import Base  # noqa: F401  모델 import 순서(app.models ↔ app.db.base)
+from app.core.errors import ApiException
+from app.core.pagenation import decode_cursor, encode_cursor
+from app.models.order import Order
+
+
+def test_cursor_round_trip_restores_column_types():
+    created = datetime(2026, 3, 5, 12, 30, 1)
+    cursor = encode_cursor([created, 42])
+    assert "=" not in cursor                                   # URL 에 그대로 넣을 수 있게 padding 제거
+    assert decode_cursor(cursor, [Order.created_at, Order.id]) == [created, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", encode_cursor([1]), encode_cursor(["x", "y"]), "e30"])
+def test_bad_cursor_is_400(cursor):
+    with pytest.raises(ApiException) as exc:
+        decode_cursor(cursor, [Order.created_at, Order.id])
+    assert exc.value.status == 400
+    assert exc.value.code == "INVALID_QUERY_PARAM"
+
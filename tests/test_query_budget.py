@@ -0,0 +1,15 @@
+# 엔드포인트별 쿼리 예산(N+1 회귀 방지) 3개
+from tests.conftest import api_get
+
+def test_books_list_query_budget(session, base_url, query_budget):
+    r = api_get(session, base_url, "/api/books?page=1&size=20")
+    assert r.status_code == 200
+    query_budget(r, 3)
+
+def test_login_query_budget(logged_in_user, query_budget):
+    query_budget(logged_in_user["login"], 4)
+
+def test_my_orders_query_budget(session, base_url, logged_in_user, query_budget):
+    r = api_get(session, base_url, "/api/orders", headers=logged_in_user["headers"])
+    assert r.status_code == 200
+    query_budget(r, 4)
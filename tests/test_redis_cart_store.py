@@ -0,0 +1,22 @@
+# Redis 장바구니 담기 수량 상한 테스트 1개 (fakeredis, 서버 없음)
+import asyncio
+
+import fakeredis.aioredis
+
+from app.db.base import Base  # noqa: F401  모델 import 순서(app.models ↔ app.db.base)
+from app.core import cart_store
+from app.core.cart_store import RedisCartStore
+from app.schemas.cart import MAX_QUANTITY
+
+
+def test_add_is_capped_at_max_quantity(monkeypatch):
+    async def run():
+        r = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        monkeypatch.setattr(cart_store, "get_async_redis", lambda: r)
+        await r.set("cart:book:7", "1")                        # 도서 존재 표시 → DB 확인 안 함
+        store = RedisCartStore()
+        first = await store.add(None, 1, 7, MAX_QUANTITY)
+        second = await store.add(None, 1, 7, MAX_QUANTITY)
+        return first.quantity, second.quantity, await r.hget("cart:1", "7")
+
+    assert asyncio.run(run()) == (MAX_QUANTITY, MAX_QUANTITY, str(MAX_QUANTITY))
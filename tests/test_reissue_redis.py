@@ -0,0 +1,68 @@
+# redis refresh 저장소 재발급 테스트 2개 (fakeredis + SQLite + TestClient, 서버 없음)
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.db.base import Base  # 모델 전체 등록(먼저 import)
+from app.core import redis_client, token_store
+from app.core.config import get_settings
+from app.db import session as db_session
+from app.models.user import User  # noqa: F401  refresh_tokens FK 대상
+from tests.conftest import TEST_PASSWORD, assert_query_budget, auth_header, extract_access_token
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis_client, "_redis", fakeredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(redis_client, "_raw_redis", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(redis_client, "_async_redis", fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(db_session, "engine", engine)
+    previous_bind = db_session.SessionLocal.kw.get("bind")
+    db_session.SessionLocal.configure(bind=engine)
+    settings = get_settings()
+    monkeypatch.setattr(settings, "refresh_token_store", "redis")
+    monkeypatch.setattr(settings, "job_queue_enabled", True)       # 감사 로그는 작업 큐로(요청 경로 밖)
+    monkeypatch.setattr(settings, "debug", True)                 # X-DB-Queries 헤더
+    monkeypatch.setattr(token_store, "_store", None)
+
+    from app.main import app
+    yield TestClient(app)                     # with 없이: startup 주기 작업 안 띄움
+    db_session.SessionLocal.configure(bind=previous_bind)
+    engine.dispose()
+
+
+def _login(client, email="reissue@example.com"):
+    client.post("/api/users", json={"email": email, "name": "테스트", "password": TEST_PASSWORD})
+    r = client.post("/api/auth/login", json={"email": email, "password": TEST_PASSWORD})
+    assert r.status_code == 200
+    return extract_access_token(r.json())
+
+
+def test_reissue_runs_no_db_statements(client):
+    _login(client)
+    r = client.post("/api/auth/reissue")
+    assert r.status_code == 200
+    assert_query_budget(r, 0)                 # 세대/블랙리스트/회전 모두 Redis Lua 한 번
+    assert client.post("/api/auth/reissue").status_code == 200   # 새 refresh 로 다시 회전
+
+
+def test_reissue_rejects_old_generation_and_logged_out_tokens(client):
+    token = _login(client)
+    old_cookie = client.cookies.get("refreshToken")
+    assert client.post("/api/auth/logout-all", headers=auth_header(token)).status_code == 200
+    client.cookies.clear()
+    client.cookies.set("refreshToken", old_cookie)
+    assert client.post("/api/auth/reissue").status_code == 401   # 전체 로그아웃 이전 세대
+
+    client.cookies.clear()
+    _login(client)
+    cookie = client.cookies.get("refreshToken")
+    assert client.post("/api/auth/logout").status_code == 200
+    client.cookies.clear()
+    client.cookies.set("refreshToken", cookie)
+    assert client.post("/api/auth/reissue").status_code == 401   # 로그아웃 블랙리스트
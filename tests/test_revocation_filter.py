@@ -0,0 +1,48 @@
+# 폐기 refresh token Bloom filter 테스트 3개 (fakeredis, 서버 없음)
+import fakeredis
+import pytest
+
+from app.core import revocation_filter
+from app.core.revocation_filter import RevocationFilter
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(revocation_filter, "get_redis", lambda: fakeredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(revocation_filter, "get_raw_redis", lambda: fakeredis.FakeRedis(server=server))
+    return server
+
+
+def _filter() -> RevocationFilter:
+    return RevocationFilter(capacity=1000, fp_rate=0.001, max_bytes=64 * 1024, bucket_seconds=3600, lifetime_seconds=7200)
+
+
+def test_added_jti_is_positive_unknown_is_negative(redis_server):
+    f = _filter()
+    f.add("jti-revoked")
+    assert f.might_contain("jti-revoked")
+    assert not any(f.might_contain(f"jti-live-{i}") for i in range(200))
+
+
+def test_sync_picks_up_other_process_bits(redis_server):
+    writer, reader = _filter(), _filter()
+    reader.sync()
+    writer.add("jti-from-other-process")
+    assert not reader.might_contain("jti-from-other-process")   # 동기화 전: 미러에 없음
+    reader.sync()
+    assert reader.might_contain("jti-from-other-process")
+
+
+def test_sync_keeps_local_bits_and_drops_expired_buckets(redis_server, monkeypatch):
+    f = _filter()
+    clock = {"now": 10 * 3600.0}
+    monkeypatch.setattr(revocation_filter.time, "time", lambda: clock["now"])
+    f.add("jti-local")
+    fakeredis.FakeRedis(server=redis_server).flushall()          # Redis 쪽이 비어도 로컬 비트는 OR 로 유지
+    f.sync()
+    assert f.might_contain("jti-local")
+
+    clock["now"] += 3 * 3600                                      # lifetime + bucket 지나면 버킷이 빠짐
+    f.sync()
+    assert not f.might_contain("jti-local")
@@ -0,0 +1,22 @@
+# 슬로우 쿼리 fingerprint 테스트 3개 (서버 없음)
+from app.db.slow_query import fingerprint
+
+
+def test_literals_and_params_collapse_to_placeholders():
+    a = fingerprint("SELECT * FROM books WHERE title LIKE '%java%' AND price > 1000")
+    b = fingerprint("SELECT *  FROM books\n WHERE title LIKE %(title_1)s AND price > %s")
+    assert a == b == "SELECT * FROM books WHERE title LIKE ? AND price > ?"
+
+
+def test_in_list_and_multi_values_length_ignored():
+    assert fingerprint("SELECT id FROM orders WHERE id IN (1, 2, 3)") == fingerprint(
+        "SELECT id FROM orders WHERE id IN (%s)"
+    )
+    assert fingerprint("INSERT INTO t (a) VALUES (1), (2), (3)") == "INSERT INTO t (a) VALUES (?)"
+
+
+def test_identifiers_with_digits_and_comments_kept_apart():
+    fp = fingerprint("/* api */ SELECT b2.id FROM books AS b2 -- trailing\nWHERE b2.id = :id_1")
+    assert "b2.id" in fp
+    assert fp.endswith("WHERE b2.id = ?")
+    assert "api" not in fp and "trailing" not in fp
@@ -0,0 +1,15 @@
+# 찜/장바구니 담기 없는 도서 404 2개
+from tests.conftest import api_post
+
+MISSING_BOOK_ID = 999999999
+
+
+def test_favorite_missing_book_404(session, base_url, logged_in_user):
+    r = api_post(session, base_url, f"/api/favorites/{MISSING_BOOK_ID}", headers=logged_in_user["headers"])
+    assert r.status_code == 404
+
+def test_cart_add_missing_book_404(session, base_url, logged_in_user):
+    r = api_post(
+        session, base_url, "/api/items", json={"bookId": MISSING_BOOK_ID, "quantity": 1}, headers=logged_in_user["headers"]
+    )
+    assert r.status_code == 404